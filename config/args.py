@@ -124,6 +124,71 @@ parser.add_argument('--min_ungraded_students', type=int,
                     default=5, help='没批改的学生数超过这个就爬取,-1表示全改完了也爬')
 parser.add_argument('--max_workers_prepare', type=int,
                     default=6, help='爬作业的最大线程数')
+parser.add_argument('--homework_workers', type=int, default=0,
+                    help='同时处理的作业数，0表示与请求上限相同')
+parser.add_argument('--task_queue_size', type=int, default=0, help='作业任务队列长度，0表示默认值')
+parser.add_argument('--list_page_size', type=int, default=None,
+                    help='作业列表每页条数，不设置则用默认分页')
+parser.add_argument('--capture_timeout', type=int, default=0,
+                    help='等待捕获页面请求的超时毫秒数，0表示默认值')
+parser.add_argument('--direct_answer_fetch', type=bool, default=True,
+                    help='是否按学习到的地址模板直接请求学生答案页，失败时回退到页面跳转')
+parser.add_argument('--incremental_crawl', type=bool, default=True,
+                    help='是否跳过提交时间和状态未变的学生，沿用上次的answer.json')
+parser.add_argument('--crawl_state', type=bool, default=True, help='是否记录爬取进度以便中断后续爬')
+parser.add_argument('--crawl_state_path', type=str, default='', help='爬取进度文件路径，空则用默认位置')
+parser.add_argument('--resume_crawl', type=bool, default=True, help='是否重试上次未完成的作业任务')
+parser.add_argument('--session_cache', type=bool, default=True, help='是否缓存登录会话以免重复扫码')
+parser.add_argument('--session_cache_path', type=str, default='', help='登录会话缓存路径，空则用默认位置')
+parser.add_argument('--session_probe_url', type=str, default='', help='检查登录会话是否有效的地址，空则用默认地址')
+parser.add_argument('--fetch_backend', type=str, default='playwright', choices=['playwright', 'aiohttp'],
+                    help='普通请求使用的后端')
+parser.add_argument('--http_limit_per_host', type=int, default=0,
+                    help='aiohttp后端每个主机的连接数，0表示与请求上限相同')
+parser.add_argument('--adaptive_concurrency', type=bool, default=True,
+                    help='是否根据服务器的限流信号自动调整每个主机的并发数')
+parser.add_argument('--host_concurrency_ceiling', type=int, default=0,
+                    help='每个主机的并发上限，0表示与请求上限相同')
+parser.add_argument('--host_concurrency_initial', type=int, default=0,
+                    help='每个主机的初始并发数，0表示与上限相同')
+parser.add_argument('--fetch_retries', type=int, default=3, help='页面和JSON请求失败后的重试次数')
+parser.add_argument('--download_retries', type=int, default=4, help='图片和附件下载失败后的重试次数')
+parser.add_argument('--navigation_retries', type=int, default=2, help='页面跳转失败后的重试次数')
+parser.add_argument('--retry_base_delay', type=float, default=0.5, help='重试的初始等待秒数')
+parser.add_argument('--retry_max_delay', type=float, default=20.0, help='重试的最长等待秒数')
+parser.add_argument('--response_cache', type=bool, default=False, help='是否把请求结果缓存到磁盘')
+parser.add_argument('--response_cache_dir', type=str, default='', help='请求缓存目录，空则用默认位置')
+parser.add_argument('--response_cache_ttl', type=float, default=30,
+                    help='请求缓存在多少秒内直接使用，0表示每次都重新验证')
+parser.add_argument('--html_parser', type=str, default=None,
+                    help='解析网页使用的BeautifulSoup解析器，auto表示优先用lxml')
+parser.add_argument('--parse_workers', type=int, default=0,
+                    help='解析网页的进程数，0表示爬取时在主进程内解析、reparse时按CPU核数')
+parser.add_argument('--html_archive', type=bool, default=False,
+                    help='是否保存抓取的网页快照，供--mode reparse离线重建answer.json')
+parser.add_argument('--dom_extraction', type=bool, default=False,
+                    help='是否在浏览器内直接提取列表和答案字段，而不是下载网页后解析')
+parser.add_argument('--dom_extraction_verify', type=bool, default=True,
+                    help='是否用每类第一页核对浏览器内提取的结果和耗时')
+parser.add_argument('--prefetch_images', type=bool, default=True, help='是否在爬取时预先下载学生答案中的图片')
+parser.add_argument('--max_image_mb', type=float, default=0, help='单张图片的大小上限(MB)，0表示默认值')
+parser.add_argument('--download_attachments', type=bool, default=True, help='是否下载学生上传的附件')
+parser.add_argument('--max_attachment_mb', type=float, default=0, help='单个附件的大小上限(MB)，0表示默认值')
+parser.add_argument('--headless', type=bool, default=False, help='是否以无头模式运行浏览器')
+parser.add_argument('--lean_browser', type=bool, default=False,
+                    help='是否拦截图片、字体、媒体和第三方请求以减少浏览器流量')
+parser.add_argument('--lean_allowed_hosts', type=list, default=None,
+                    help='精简模式下允许访问的第三方域名列表，空则只允许chaoxing.com')
+parser.add_argument('--report_browser_traffic', type=bool, default=False,
+                    help='是否统计浏览器请求数和流量（精简模式下总是统计）')
+parser.add_argument('--pages_per_context', type=int, default=0,
+                    help='每个浏览器上下文的页面数，0表示默认值')
+parser.add_argument('--context_max_uses', type=int, default=200, help='浏览器上下文使用多少次后重建')
+parser.add_argument('--context_max_heap_mb', type=int, default=512, help='浏览器上下文的JS堆超过多少MB后重建')
+parser.add_argument('--browser_shards', type=int, default=1, help='把作业分给多少个浏览器实例并行爬取')
+parser.add_argument('--shard_processes', type=bool, default=False, help='是否把每个浏览器实例放到单独的进程中')
+parser.add_argument('--browser_task_retries', type=int, default=2,
+                    help='浏览器崩溃后一个作业任务最多重试几次')
 parser.add_argument('--use_qr_code', type=bool,
                     default=True, help='是否使用二维码登录')
 parser.add_argument('--phonenumber', type=str, default=os.getenv('PHONENUMBER', ''), help='登录学校通用的手机号')
@@ -2,10 +2,90 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, Dict, List, Optional
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
 
-from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    Request,
+    Route,
+    async_playwright,
+)
+
+from utils.stats import format_counters
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+LEAN_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+LEAN_VIEWPORT = {"width": 800, "height": 600}
+DEFAULT_ALLOWED_HOSTS = ("chaoxing.com",)
+DEFAULT_PAGES_PER_CONTEXT = 3
+DEFAULT_CONTEXT_MAX_USES = 200
+DEFAULT_CONTEXT_MAX_HEAP_MB = 512
+BLANK_URL = "about:blank"
+
+
+@dataclass
+class TrafficStats:
+    """Browser traffic counters used to measure the lean profile."""
+
+    requests: int = 0
+    blocked: int = 0
+    bytes_received: int = 0
+    navigations: int = 0
+    navigation_seconds: float = 0.0
+
+    def summary(self) -> str:
+        """Return the counters formatted for logging."""
+        average = self.navigation_seconds / self.navigations if self.navigations else 0.0
+        return (
+            f"requests={self.requests}, blocked={self.blocked}, "
+            f"received={self.bytes_received / 1024:.1f} KiB, "
+            f"navigations={self.navigations}, avg_navigation={average:.2f}s"
+        )
+
+
+@dataclass
+class PooledContext:
+    """A warm, cookie-loaded context and the pages it keeps open."""
+
+    context: BrowserContext
+    idle_pages: List[Page] = field(default_factory=list)
+    open_pages: int = 0
+    uses: int = 0
+    heap_bytes: int = 0
+    retiring: bool = False
+    closed: bool = False
+
+    @property
+    def busy_pages(self) -> int:
+        """Return the number of pages currently lent out."""
+        return self.open_pages - len(self.idle_pages)
+
+
+@dataclass
+class PoolStats:
+    """Counters describing how the page pool healed itself."""
+
+    pages_served: int = 0
+    contexts_created: int = 0
+    contexts_recycled: int = 0
+    page_crashes: int = 0
+    browser_restarts: int = 0
+
+    def summary(self) -> str:
+        """Return the counters formatted for logging."""
+        return format_counters(asdict(self))
 
 
 class BrowserManager:
@@ -16,21 +96,50 @@ class BrowserManager:
         headless: bool = True,
         max_contexts: int = 10,
         download_path: Optional[str] = None,
+        lean: bool = False,
+        allowed_hosts: Sequence[str] = DEFAULT_ALLOWED_HOSTS,
+        pages_per_context: int = DEFAULT_PAGES_PER_CONTEXT,
+        context_max_uses: int = DEFAULT_CONTEXT_MAX_USES,
+        context_max_heap_mb: int = DEFAULT_CONTEXT_MAX_HEAP_MB,
+        report_traffic: bool = False,
     ) -> None:
-        self.headless = headless
-        self.max_contexts = max_contexts
+        self.lean = lean
+        self.report_traffic = lean or report_traffic
+        self.headless = True if lean else headless
+        self.max_contexts = max(1, max_contexts)
+        self.pages_per_context = max(1, pages_per_context)
+        self.context_max_uses = context_max_uses
+        self.context_max_heap_bytes = context_max_heap_mb * 1024 * 1024
         self.download_path = download_path
+        self.allowed_hosts = tuple(allowed_hosts)
+        self.traffic = TrafficStats()
+        self.pool_stats = PoolStats()
 
         self._playwright: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
         self._shared_cookies: List[Dict] = []
-        self._context_semaphore = asyncio.Semaphore(max_contexts)
+        self._pool: List[PooledContext] = []
+        self._pool_lock = asyncio.Lock()
+        self._page_slots = asyncio.Semaphore(self.max_contexts * self.pages_per_context)
+        self._disconnected = False
+        self._stopping = False
+
+    @property
+    def disruptions(self) -> int:
+        """Return how many page crashes and browser restarts have happened."""
+        return self.pool_stats.page_crashes + self.pool_stats.browser_restarts
 
     async def start(self) -> None:
         """Start Playwright and launch a browser instance."""
         if self._playwright or self._browser:
             return
+        self._stopping = False
         self._playwright = await async_playwright().start()
+        await self._launch()
+
+    async def _launch(self) -> None:
+        if not self._playwright:
+            raise RuntimeError("Playwright is not started")
         launch_options: Dict[str, object] = {
             "headless": self.headless,
             "args": [
@@ -42,10 +151,36 @@ class BrowserManager:
         if self.download_path:
             launch_options["downloads_path"] = self.download_path
         self._browser = await self._playwright.chromium.launch(**launch_options)
+        self._disconnected = False
+        self._browser.on("disconnected", self._on_disconnected)
         logging.info("Playwright browser started (headless=%s)", self.headless)
 
+    def _on_disconnected(self, _browser: Browser) -> None:
+        if not self._stopping:
+            logging.error("Browser disconnected unexpectedly; it will be relaunched")
+            self._disconnected = True
+
+    async def _ensure_browser(self) -> None:
+        """Relaunch the browser if it crashed, dropping every pooled context."""
+        if not self._disconnected:
+            return
+        for pooled in self._pool:
+            await self._close_pooled(pooled)
+        self._pool = []
+        self._browser = None
+        self.pool_stats.browser_restarts += 1
+        await self._launch()
+
     async def stop(self) -> None:
         """Close browser and stop Playwright."""
+        self._stopping = True
+        if self.traffic.requests:
+            logging.info("Browser traffic: %s", self.traffic.summary())
+        if self.pool_stats.pages_served:
+            logging.info("Browser pool: %s", self.pool_stats.summary())
+        for pooled in self._pool:
+            await self._close_pooled(pooled)
+        self._pool = []
         if self._browser:
             await self._browser.close()
             self._browser = None
@@ -69,41 +204,206 @@ class BrowserManager:
         """Return a copy of the shared cookies."""
         return list(self._shared_cookies)
 
+    async def sync_cookies(self) -> None:
+        """Push the shared cookies into every pooled context, e.g. after re-login."""
+        if not self._shared_cookies:
+            return
+        for pooled in list(self._pool):
+            try:
+                await pooled.context.add_cookies(self._shared_cookies)
+            except Exception as exc:
+                logging.warning("Failed to refresh cookies in pooled context: %s", exc)
+
     @asynccontextmanager
-    async def new_context(self, with_cookies: bool = True) -> AsyncIterator[BrowserContext]:
-        """Create a new context guarded by the semaphore."""
-        if not self._browser:
+    async def page(self) -> AsyncIterator[Page]:
+        """Borrow a pooled page, waiting while every page is in use; it is reset or closed on return."""
+        if not self._browser and not self._disconnected:
             raise RuntimeError("Browser is not started")
-        async with self._context_semaphore:
-            context = await self._create_context()
-            if with_cookies and self._shared_cookies:
-                await context.add_cookies(self._shared_cookies)
+        await self._page_slots.acquire()
+        try:
+            pooled, page = await self._checkout_page()
             try:
-                yield context
+                yield page
             finally:
-                await context.close()
+                await self._checkin_page(pooled, page)
+        finally:
+            self._page_slots.release()
+
+    async def _checkout_page(self) -> Tuple[PooledContext, Page]:
+        """Return a healthy idle page, opening a page or context if the pool has room."""
+        async with self._pool_lock:
+            await self._ensure_browser()
+            target: Optional[PooledContext] = None
+            for pooled in self._pool:
+                if pooled.closed or pooled.retiring:
+                    continue
+                while pooled.idle_pages:
+                    page = pooled.idle_pages.pop()
+                    if not page.is_closed():
+                        pooled.uses += 1
+                        self.pool_stats.pages_served += 1
+                        return pooled, page
+                    pooled.open_pages -= 1
+                if target is None and pooled.open_pages < self.pages_per_context:
+                    target = pooled
+            if target is None:
+                self._pool = [item for item in self._pool if not item.closed]
+                active = [item for item in self._pool if not item.retiring]
+                if len(active) >= self.max_contexts:
+                    raise RuntimeError("Browser page pool exhausted")
+                target = PooledContext(await self._create_context(self.lean))
+                if self._shared_cookies:
+                    await target.context.add_cookies(self._shared_cookies)
+                self._pool.append(target)
+                self.pool_stats.contexts_created += 1
+            target.open_pages += 1
+            target.uses += 1
+            self.pool_stats.pages_served += 1
+        try:
+            page = await target.context.new_page()
+        except Exception:
+            target.open_pages -= 1
+            await self._close_pooled(target)
+            raise
+        page.on("crash", lambda _page: self._on_page_crash(target))
+        return target, page
+
+    def _on_page_crash(self, pooled: PooledContext) -> None:
+        logging.warning("Browser page crashed; recycling its context")
+        self.pool_stats.page_crashes += 1
+        pooled.retiring = True
+
+    async def _checkin_page(self, pooled: PooledContext, page: Page) -> None:
+        """Reset a returned page and put it back, or drop it if it is unhealthy."""
+        healthy = not pooled.closed and not pooled.retiring and not page.is_closed()
+        if healthy and page.url != BLANK_URL:
+            pooled.heap_bytes = await self._sample_heap(page)
+            try:
+                await page.goto(BLANK_URL)
+            except Exception as exc:
+                logging.debug("Dropping page that failed to reset: %s", exc)
+                healthy = False
+        if not pooled.retiring and (
+            (self.context_max_uses and pooled.uses >= self.context_max_uses)
+            or (self.context_max_heap_bytes and pooled.heap_bytes >= self.context_max_heap_bytes)
+        ):
+            logging.info(
+                "Recycling browser context after %s pages (heap %.0f MiB)",
+                pooled.uses,
+                pooled.heap_bytes / (1024 * 1024),
+            )
+            pooled.retiring = True
+            healthy = False
+        if healthy:
+            pooled.idle_pages.append(page)
+            return
 
-    async def _create_context(self) -> BrowserContext:
+        pooled.open_pages -= 1
+        if not page.is_closed():
+            try:
+                await page.close()
+            except Exception:
+                pass
+        if pooled.retiring and pooled.busy_pages <= 0 and not pooled.closed:
+            self.pool_stats.contexts_recycled += 1
+            await self._close_pooled(pooled)
+
+    @staticmethod
+    async def _sample_heap(page: Page) -> int:
+        """Return the renderer's used JS heap in bytes, or 0 if unavailable."""
+        try:
+            used = await page.evaluate(
+                "() => (performance.memory && performance.memory.usedJSHeapSize) || 0"
+            )
+        except Exception:
+            return 0
+        return int(used or 0)
+
+    async def _close_pooled(self, pooled: PooledContext) -> None:
+        if pooled.closed:
+            return
+        pooled.closed = True
+        pooled.idle_pages = []
+        try:
+            await pooled.context.close()
+        except Exception as exc:
+            logging.debug("Failed to close pooled context: %s", exc)
+
+    @asynccontextmanager
+    async def new_context(
+        self,
+        with_cookies: bool = True,
+        lean: Optional[bool] = None,
+    ) -> AsyncIterator[BrowserContext]:
+        """Create a one-off context outside the page pool, for login and the session probe."""
+        if not self._browser and not self._disconnected:
+            raise RuntimeError("Browser is not started")
+        async with self._pool_lock:
+            await self._ensure_browser()
+        context = await self._create_context(self.lean if lean is None else lean)
+        if with_cookies and self._shared_cookies:
+            await context.add_cookies(self._shared_cookies)
+        try:
+            yield context
+        finally:
+            await context.close()
+
+    async def _create_context(self, lean: bool = False) -> BrowserContext:
         """Create a browser context with defaults configured."""
         if not self._browser:
             raise RuntimeError("Browser is not started")
         options: Dict[str, object] = {
-            "viewport": {"width": 1920, "height": 1080},
-            "user_agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
+            "viewport": LEAN_VIEWPORT if lean else {"width": 1920, "height": 1080},
+            "user_agent": DEFAULT_USER_AGENT,
         }
         if self.download_path:
             options["accept_downloads"] = True
         context = await self._browser.new_context(**options)
         context.set_default_timeout(30000)
+        if lean:
+            await context.route("**/*", self._route_lean)
+        if self.report_traffic:
+            context.on("page", self._track_navigation)
+            context.on("requestfinished", self._record_request)
         return context
 
+    async def _route_lean(self, route: Route) -> None:
+        request = route.request
+        host = urlparse(request.url).hostname or ""
+        allowed = any(host == item or host.endswith(f".{item}") for item in self.allowed_hosts)
+        if request.resource_type in LEAN_BLOCKED_RESOURCE_TYPES or not allowed:
+            self.traffic.blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _record_request(self, request: Request) -> None:
+        self.traffic.requests += 1
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        self.traffic.bytes_received += sizes["responseBodySize"] + sizes["responseHeadersSize"]
+
+    def _track_navigation(self, page: Page) -> None:
+        started: Dict[str, float] = {}
+
+        def on_request(request: Request) -> None:
+            if request.is_navigation_request() and request.frame == page.main_frame:
+                started["at"] = time.perf_counter()
+
+        def on_loaded(_page: Page) -> None:
+            start = started.pop("at", None)
+            if start is not None:
+                self.traffic.navigations += 1
+                self.traffic.navigation_seconds += time.perf_counter() - start
+
+        page.on("request", on_request)
+        page.on("domcontentloaded", on_loaded)
+
     async def new_page(self, url: Optional[str] = None) -> Page:
         """Create a standalone page and optionally navigate to a URL."""
-        context = await self._create_context()
+        context = await self._create_context(self.lean)
         if self._shared_cookies:
             await context.add_cookies(self._shared_cookies)
         page = await context.new_page()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import time
+import zlib
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Optional
+
+from utils.image_store import DEFAULT_ARCHIVE_DIR
+
+ARCHIVE_FILE = "pages.jsonl.gz"
+# Course-level list pages.
+LIST_ARCHIVE_PATH = Path(DEFAULT_ARCHIVE_DIR) / "homework_lists.jsonl.gz"
+
+HOMEWORK_LIST = "homework_list"
+MARK_LIST = "mark_list"
+REVIEW = "review"
+
+
+class PageArchive:
+    """Append-only, gzip-compressed JSONL snapshot of fetched pages."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.run = time.strftime("%Y%m%dT%H%M%S")
+        self._handle: Optional[IO[bytes]] = None
+
+    def add(self, kind: str, url: str, html: str, **fields: Any) -> None:
+        """Append one page."""
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = gzip.open(self.path, "ab")
+        record = {"kind": kind, "run": self.run, "url": url, **fields, "html": html}
+        self._handle.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._handle.flush(zlib.Z_SYNC_FLUSH)
+
+    def close(self) -> None:
+        """Finish the current gzip member."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Yield every archived page in write order, ignoring a truncated tail."""
+        if not self.path.exists():
+            return
+        with gzip.open(self.path, "rb") as handle:
+            try:
+                for line in handle:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        logging.warning("Ignoring truncated page archive record")
+            except (EOFError, OSError, zlib.error):
+                logging.warning("Page archive ends early; using the records before the damage")
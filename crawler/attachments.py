@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urljoin, urlparse
+
+from utils.image_store import ContentStore
+from utils.stats import format_counters
+
+from .client import DownloadTooLarge
+
+DEFAULT_MAX_ATTACHMENT_BYTES = 100 * 1024 * 1024
+
+_EXTENSION = re.compile(r"^\.[a-z0-9]{1,10}$")
+
+AttachmentDownload = Callable[[str, str, int], Awaitable[int]]
+
+
+class AttachmentDownloader:
+    """Download student attachments into a shared content-addressed store."""
+
+    def __init__(self, store: ContentStore, max_bytes: int = DEFAULT_MAX_ATTACHMENT_BYTES) -> None:
+        self.store = store
+        self.max_bytes = max_bytes
+        self.stats: Dict[str, int] = {"downloaded": 0, "reused": 0, "skipped": 0, "failed": 0}
+        self._inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+    async def download_all(
+        self,
+        attachments: Dict[str, List[Dict[str, str]]],
+        base_url: str,
+        download: AttachmentDownload,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Download every attachment concurrently; return their records per question key."""
+        items: List[Tuple[str, Dict[str, str]]] = [
+            (key, attachment) for key, group in attachments.items() for attachment in group
+        ]
+        results = await asyncio.gather(
+            *[self._download(attachment, base_url, download) for _, attachment in items],
+            return_exceptions=True,
+        )
+        records: Dict[str, List[Dict[str, Any]]] = {}
+        error: Optional[BaseException] = None
+        for (key, _), result in zip(items, results):
+            if isinstance(result, BaseException):
+                error = error or result
+            else:
+                records.setdefault(key, []).append(result)
+        if error is not None:
+            raise error
+        return records
+
+    async def _download(
+        self,
+        attachment: Dict[str, str],
+        base_url: str,
+        download: AttachmentDownload,
+    ) -> Dict[str, Any]:
+        url = urljoin(base_url, attachment["url"])
+        inflight = self._inflight.get(url)
+        if inflight is not None:
+            record = await asyncio.shield(inflight)
+            self.stats["reused"] += 1
+            return {**record, "name": attachment["name"]}
+
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
+        try:
+            record = await self._store(url, attachment["name"], download)
+            future.set_result(record)
+            return record
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(url, None)
+
+    async def _store(self, url: str, name: str, download: AttachmentDownload) -> Dict[str, Any]:
+        path = self.store.lookup(url)
+        if path is not None:
+            self.stats["reused"] += 1
+            return self._record(name, url, path)
+
+        partial = self.store.partial_path(url)
+        try:
+            await download(url, partial, self.max_bytes)
+        except DownloadTooLarge as exc:
+            self.stats["skipped"] += 1
+            logging.warning("Skipping attachment over %s bytes (%s bytes)", exc.limit, exc.size)
+            return {"name": name, "url": url, "skipped": "too large", "size": exc.size}
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        key, _ = self.store.put_file(partial, self._extension(name, url))
+        self.store.link(url, key)
+        self.stats["downloaded"] += 1
+        return self._record(name, url, self.store.lookup(url) or "")
+
+    @staticmethod
+    def _record(name: str, url: str, path: str) -> Dict[str, Any]:
+        key = os.path.basename(path)
+        return {
+            "name": name,
+            "url": url,
+            "file": path.replace(os.sep, "/"),
+            "size": os.path.getsize(path),
+            "sha256": key.split(".")[0],
+        }
+
+    @staticmethod
+    def _extension(name: str, url: str) -> str:
+        for candidate in (name, unquote(urlparse(url).path)):
+            extension = os.path.splitext(candidate)[1].lower()
+            if _EXTENSION.match(extension):
+                return extension
+        return ""
+
+    def summary(self) -> str:
+        """Return the counters formatted for logging."""
+        return format_counters(self.stats)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import os
 
 from playwright.async_api import Page
 
@@ -10,12 +11,24 @@ from .base import LoginStrategy
 class QRCodeLoginStrategy(LoginStrategy):
     """QR code login strategy."""
 
+    def __init__(self, screenshot_path: str = "qrcode.png") -> None:
+        self.screenshot_path = screenshot_path
+
+    async def _save_qrcode(self, page: Page) -> None:
+        """Save the QR code image so it can be scanned when the browser is headless."""
+        try:
+            await page.locator("#quickCode").screenshot(path=self.screenshot_path)
+            logging.info("QR code saved to %s", os.path.abspath(self.screenshot_path))
+        except Exception as exc:
+            logging.warning("Failed to save QR code screenshot: %s", exc)
+
     async def login(self, page: Page, login_url: str) -> bool:
         """Login by scanning a QR code."""
         try:
             logging.info("Starting QR code login")
             await page.goto(login_url, wait_until="domcontentloaded")
             await page.wait_for_selector("#quickCode", timeout=10000)
+            await self._save_qrcode(page)
             logging.info("QR code is ready; waiting for scan")
             try:
                 await page.wait_for_function(
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from http.cookies import SimpleCookie
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from playwright.async_api import APIRequestContext
+
+from core.browser import DEFAULT_USER_AGENT
+
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+@dataclass
+class FetchResponse:
+    """Backend-independent HTTP response with the body fully read."""
+
+    url: str
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    @property
+    def ok(self) -> bool:
+        """Return True for 2xx responses."""
+        return 200 <= self.status < 300
+
+    def text(self) -> str:
+        """Decode the body using the declared charset, defaulting to UTF-8."""
+        content_type = self.headers.get("content-type", "")
+        charset = "utf-8"
+        for part in content_type.split(";"):
+            key, _, value = part.strip().partition("=")
+            if key.lower() == "charset" and value:
+                charset = value.strip("\"'")
+        try:
+            return self.body.decode(charset, errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        """Parse the body as JSON."""
+        return json.loads(self.text())
+
+
+@dataclass
+class StreamedResponse:
+    """HTTP response whose body is read chunk by chunk from ``chunks``."""
+
+    url: str
+    status: int
+    headers: Dict[str, str]
+    chunks: AsyncIterator[bytes]
+
+    @property
+    def ok(self) -> bool:
+        """Return True for 2xx responses."""
+        return 200 <= self.status < 300
+
+
+async def _single_chunk(body: bytes) -> AsyncIterator[bytes]:
+    yield body
+
+
+class FetchBackend(ABC):
+    """Transport used by ``CrawlerClient`` for plain HTTP GET requests."""
+
+    @abstractmethod
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResponse:
+        """Perform a GET request and return the fully read response."""
+        raise NotImplementedError
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        """Perform a GET request whose body is read while the context is open."""
+        response = await self.get(url, headers=headers)
+        yield StreamedResponse(response.url, response.status, response.headers, _single_chunk(response.body))
+
+    def set_cookies(self, cookies: List[Dict]) -> None:
+        """Replace the cookies sent with requests, if the backend owns them."""
+
+    async def close(self) -> None:
+        """Release pooled resources."""
+
+
+class PlaywrightFetchBackend(FetchBackend):
+    """Fetch through a Playwright ``APIRequestContext`` sharing the browser cookies."""
+
+    def __init__(self, request: APIRequestContext) -> None:
+        self.request = request
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResponse:
+        """Perform a GET request through Playwright."""
+        response = await self.request.get(url, headers=headers)
+        return FetchResponse(
+            url=response.url,
+            status=response.status,
+            headers={key.lower(): value for key, value in response.headers.items()},
+            body=await response.body(),
+        )
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        """Perform a GET request, reading the body only when ``chunks`` is iterated."""
+        response = await self.request.get(url, headers=headers)
+
+        async def chunks() -> AsyncIterator[bytes]:
+            yield await response.body()
+
+        try:
+            yield StreamedResponse(
+                url=response.url,
+                status=response.status,
+                headers={key.lower(): value for key, value in response.headers.items()},
+                chunks=chunks(),
+            )
+        finally:
+            await response.dispose()
+
+
+class AiohttpFetchBackend(FetchBackend):
+    """Browserless backend using a pooled keep-alive ``aiohttp`` session."""
+
+    def __init__(self, cookies: List[Dict], limit_per_host: int = 10, timeout: float = 30.0) -> None:
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self._cookies = list(cookies)
+        self._session: Optional[Any] = None
+
+    def _ensure_session(self) -> Any:
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit_per_host * 4,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=30,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+                headers={"User-Agent": DEFAULT_USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._load_cookies()
+        return self._session
+
+    def _load_cookies(self) -> None:
+        if self._session is None:
+            return
+        self._session.cookie_jar.clear()
+        for cookie in self._cookies:
+            jar_cookie: SimpleCookie = SimpleCookie()
+            jar_cookie[cookie["name"]] = cookie.get("value", "")
+            morsel = jar_cookie[cookie["name"]]
+            morsel["domain"] = cookie.get("domain", "")
+            morsel["path"] = cookie.get("path", "/")
+            self._session.cookie_jar.update_cookies(jar_cookie)
+
+    def set_cookies(self, cookies: List[Dict]) -> None:
+        """Replace the session cookies, e.g. after a fresh login."""
+        self._cookies = list(cookies)
+        self._load_cookies()
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResponse:
+        """Perform a GET request without a browser."""
+        session = self._ensure_session()
+        async with session.get(url, headers=headers) as response:
+            body = await response.read()
+            return FetchResponse(
+                url=str(response.url),
+                status=response.status,
+                headers={key.lower(): value for key, value in response.headers.items()},
+                body=body,
+            )
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        """Perform a GET request and stream its body in small chunks."""
+        import aiohttp
+
+        session = self._ensure_session()
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout)
+        async with session.get(url, headers=headers, timeout=timeout) as response:
+            yield StreamedResponse(
+                url=str(response.url),
+                status=response.status,
+                headers={key.lower(): value for key, value in response.headers.items()},
+                chunks=response.content.iter_chunked(STREAM_CHUNK_BYTES),
+            )
+
+    async def close(self) -> None:
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+def create_fetch_backend(name: str, cookies: List[Dict], limit_per_host: int) -> Optional[FetchBackend]:
+    """Create a shared fetch backend by name; None keeps per-page Playwright fetching."""
+    if not name or name == "playwright":
+        return None
+    if name == "aiohttp":
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            logging.warning("aiohttp is not installed; falling back to Playwright fetching")
+            return None
+        return AiohttpFetchBackend(cookies, limit_per_host=limit_per_host)
+    logging.warning("Unknown fetch backend %s; falling back to Playwright fetching", name)
+    return None
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from utils.stats import format_counters
+
+from .backends import FetchResponse
+
+Fetcher = Callable[[Dict[str, str]], Awaitable[FetchResponse]]
+
+
+class ResponseCache:
+    """HTTP response cache with revalidation and in-flight request coalescing."""
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: float = 30.0) -> None:
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "revalidated": 0, "coalesced": 0}
+        self._inflight: Dict[str, "asyncio.Future[FetchResponse]"] = {}
+        if cache_dir:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+
+    async def get(self, url: str, fetch: Fetcher) -> FetchResponse:
+        """Return a response for url, calling ``fetch(extra_headers)`` only when needed."""
+        inflight = self._inflight.get(url)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        future: "asyncio.Future[FetchResponse]" = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
+        try:
+            response = await self._get_uncoalesced(url, fetch)
+            future.set_result(response)
+            return response
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(url, None)
+
+    def invalidate(self, url: str) -> None:
+        """Drop the stored entry for url."""
+        if not self.cache_dir:
+            return
+        for path in self._paths(url):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def summary(self) -> str:
+        """Return the counters formatted for logging."""
+        return format_counters(self.stats)
+
+    async def _get_uncoalesced(self, url: str, fetch: Fetcher) -> FetchResponse:
+        entry = self._load(url)
+        if entry is None:
+            self.stats["misses"] += 1
+            response = await fetch({})
+            self._store(url, response)
+            return response
+
+        cached, stored_at = entry
+        if time.time() - stored_at < self.ttl:
+            self.stats["hits"] += 1
+            return cached
+
+        validators: Dict[str, str] = {}
+        if cached.headers.get("etag"):
+            validators["If-None-Match"] = cached.headers["etag"]
+        if cached.headers.get("last-modified"):
+            validators["If-Modified-Since"] = cached.headers["last-modified"]
+        response = await fetch(validators)
+        if validators and response.status == 304:
+            self.stats["revalidated"] += 1
+            self._store(url, cached)
+            return cached
+        self.stats["misses"] += 1
+        self._store(url, response)
+        return response
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir or "", key[:2], key)
+        return f"{base}.json", f"{base}.body"
+
+    def _load(self, url: str) -> Optional[Tuple[FetchResponse, float]]:
+        if not self.cache_dir:
+            return None
+        meta_path, body_path = self._paths(url)
+        if not os.path.exists(meta_path) or not os.path.exists(body_path):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+            with open(body_path, "rb") as handle:
+                body = handle.read()
+        except (OSError, ValueError) as exc:
+            logging.debug("Ignoring unreadable cache entry: %s", exc)
+            return None
+        response = FetchResponse(meta["url"], meta["status"], meta.get("headers", {}), body)
+        return response, float(meta.get("stored_at", 0))
+
+    def _store(self, url: str, response: FetchResponse) -> None:
+        if not self.cache_dir or response.status != 200:
+            return
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "url": response.url,
+            "status": response.status,
+            "headers": response.headers,
+            "stored_at": time.time(),
+        }
+        try:
+            os.makedirs(os.path.dirname(meta_path), mode=0o700, exist_ok=True)
+            _write_private(body_path, response.body)
+            _write_private(meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError as exc:
+            logging.debug("Failed to write cache entry: %s", exc)
+
+
+def _write_private(path: str, data: bytes) -> None:
+    """Write ``data`` to ``path`` readable by the owner only, even if the file existed."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as handle:
+        os.chmod(path, 0o600)
+        handle.write(data)
@@ -1,68 +1,249 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import os
+import re
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
 
 from playwright.async_api import Page, Response
 
+from .backends import FetchBackend, FetchResponse, PlaywrightFetchBackend, StreamedResponse
+from .cache import ResponseCache
+from .retry import FetchError, RetryManager
+from .scheduler import RequestBudget
+from .throttle import RequestOutcome
+from .session import SessionExpiredError, SessionGuard, looks_like_login_page
+
+T = TypeVar("T")
+
+DEFAULT_CAPTURE_TIMEOUT = 10000
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+
+_CONTENT_RANGE_TOTAL = re.compile(r"/(\d+)\s*$")
+
+
+class DownloadTooLarge(RuntimeError):
+    """Raised when a download exceeds its size limit."""
+
+    def __init__(self, url: str, size: int, limit: int) -> None:
+        super().__init__(f"{url} is {size} bytes, over the {limit} byte limit")
+        self.url = url
+        self.size = size
+        self.limit = limit
+
 
 class CrawlerClient:
     """Lightweight wrapper around Playwright page for common fetch helpers."""
 
-    def __init__(self, page: Page) -> None:
+    def __init__(
+        self,
+        page: Optional[Page] = None,
+        backend: Optional[FetchBackend] = None,
+        session_guard: Optional[SessionGuard] = None,
+        cache: Optional[ResponseCache] = None,
+        budget: Optional[RequestBudget] = None,
+        retry: Optional[RetryManager] = None,
+    ) -> None:
+        if page is None and backend is None:
+            raise ValueError("CrawlerClient needs a page or a fetch backend")
         self.page = page
-        self._captured_urls: Dict[str, str] = {}
-        self._captured_responses: Dict[str, Response] = {}
+        self.backend: FetchBackend = backend or PlaywrightFetchBackend(page.request)
+        self.session_guard = session_guard
+        self.cache = cache
+        self.budget = budget
+        self.retry = retry
+        self._page_lock = asyncio.Lock()
+
+    def expect_response(self, pattern: str) -> "asyncio.Future[Response]":
+        """Return a future resolved by the first response whose URL contains pattern."""
+        future: "asyncio.Future[Response]" = asyncio.get_running_loop().create_future()
 
-    async def setup_response_capture(self, patterns: List[str]) -> None:
-        """Attach a response listener to capture URLs matching patterns."""
         def on_response(response: Response) -> None:
-            for pattern in patterns:
-                if pattern in response.url:
-                    self._captured_urls[pattern] = response.url
-                    self._captured_responses[pattern] = response
-                    logging.debug("Captured response %s -> %s", pattern, response.url)
+            if pattern in response.url and not future.done():
+                logging.debug("Captured response %s -> %s", pattern, response.url)
+                future.set_result(response)
 
-        self.page.on("response", on_response)
+        def detach(_future: "asyncio.Future[Response]") -> None:
+            self.page.remove_listener("response", on_response)
 
-    def get_captured_url(self, pattern: str) -> Optional[str]:
-        """Return the captured URL for a given pattern."""
-        return self._captured_urls.get(pattern)
+        self.page.on("response", on_response)
+        future.add_done_callback(detach)
+        return future
 
-    async def get_captured_json(self, pattern: str) -> Optional[Dict]:
-        """Return captured response JSON for a given pattern."""
-        response = self._captured_responses.get(pattern)
-        if not response:
-            return None
+    async def wait_for_response(
+        self,
+        future: "asyncio.Future[Response]",
+        timeout: int = DEFAULT_CAPTURE_TIMEOUT,
+    ) -> Optional[Response]:
+        """Wait for a captured response, returning None on timeout."""
         try:
-            return await response.json()
-        except Exception:
+            return await asyncio.wait_for(future, timeout / 1000)
+        except asyncio.TimeoutError:
             return None
 
-    def clear_captures(self) -> None:
-        """Clear captured URLs and responses."""
-        self._captured_urls.clear()
-        self._captured_responses.clear()
+    async def capture_url(
+        self,
+        url: str,
+        pattern: str,
+        timeout: int = DEFAULT_CAPTURE_TIMEOUT,
+    ) -> Optional[str]:
+        """Navigate to a URL and return the first response URL matching pattern."""
+        if self.session_guard:
+            await self.session_guard.wait_ready()
+        async def navigate() -> Optional[Response]:
+            async with self._slot(url) as outcome:
+                future = self.expect_response(pattern)
+                try:
+                    response = await self.goto(url)
+                except Exception:
+                    future.cancel()
+                    raise
+                # Waiting for the captured request is not server latency.
+                outcome.stop()
+                if response is not None:
+                    outcome.status = response.status
+                return await self.wait_for_response(future, timeout)
+
+        response = await self._with_retry("navigation", navigate)
+        return response.url if response else None
 
-    async def goto(self, url: str, wait_until: str = "domcontentloaded", timeout: int = 30000) -> None:
+    async def goto(
+        self,
+        url: str,
+        wait_until: str = "domcontentloaded",
+        timeout: int = 30000,
+    ) -> Optional[Response]:
         """Navigate to a URL with the specified load state."""
-        await self.page.goto(url, wait_until=wait_until, timeout=timeout)
+        return await self.page.goto(url, wait_until=wait_until, timeout=timeout)
+
+    async def extract(self, url: str, extractor: Callable[[Page], Awaitable[T]]) -> T:
+        """Navigate the page to a URL and return what ``extractor`` reads from it."""
+        async with self._page_lock:
+            return await self._extract(url, extractor)
+
+    async def _extract(self, url: str, extractor: Callable[[Page], Awaitable[T]]) -> T:
+        guard = self.session_guard
+        generation = 0
+        if guard is not None:
+            await guard.wait_ready()
+            generation = guard.generation
+        response = await self._navigate(url)
+        if looks_like_login_page(response.url):
+            if guard is None:
+                raise SessionExpiredError(f"Redirected to login while loading {url}")
+            logging.warning("Session expired while loading a page; waiting for re-login")
+            if not await guard.refresh(generation):
+                raise SessionExpiredError(f"Re-login failed while loading {url}")
+            if guard.cookies:
+                await self.page.context.add_cookies(guard.cookies)
+            response = await self._navigate(url)
+            if looks_like_login_page(response.url):
+                raise SessionExpiredError(f"Still redirected to login after re-login: {url}")
+        if not response.ok:
+            raise FetchError(url, response.status)
+        return await extractor(self.page)
+
+    async def _navigate(self, url: str) -> FetchResponse:
+        """Navigate inside a budget slot, with retries; the body is left in the page."""
+        async def navigate() -> FetchResponse:
+            async with self._slot(url) as outcome:
+                response = await self.goto(url)
+                status = response.status if response else 200
+                # The body stays in the page, so only the status reaches the throttle.
+                if response is not None:
+                    outcome.status = status
+                return FetchResponse(self.page.url, status, response.headers if response else {})
+
+        return await self._with_retry("navigation", navigate)
 
     async def wait_for_navigation(self, timeout: int = 30000) -> None:
         """Wait for the page to reach domcontentloaded."""
         await self.page.wait_for_load_state("domcontentloaded", timeout=timeout)
 
+    async def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        kind: str = "html",
+    ) -> FetchResponse:
+        """Fetch a URL through the configured backend, re-logging in if the session expired."""
+        guard = self.session_guard
+        if guard is None:
+            return await self._send(url, headers, kind)
+
+        await guard.wait_ready()
+        generation = guard.generation
+        response = await self._send(url, headers, kind)
+        if not self._is_login_response(response):
+            return response
+
+        logging.warning("Session expired while fetching; waiting for re-login")
+        if self.cache:
+            self.cache.invalidate(url)
+        if not await guard.refresh(generation):
+            raise SessionExpiredError(f"Re-login failed while fetching {url}")
+        if self.page is not None and guard.cookies:
+            await self.page.context.add_cookies(guard.cookies)
+        response = await self._send(url, headers, kind)
+        if self._is_login_response(response):
+            if self.cache:
+                self.cache.invalidate(url)
+            raise SessionExpiredError(f"Still redirected to login after re-login: {url}")
+        return response
+
+    async def _send(self, url: str, headers: Optional[Dict[str, str]], kind: str) -> FetchResponse:
+        """Send one GET, with retries, through the response cache unless it is a download."""
+        if self.cache is None or kind == "download":
+            return await self._with_retry(kind, lambda: self._get(url, headers))
+
+        async def fetch(validators: Dict[str, str]) -> FetchResponse:
+            merged = {**(headers or {}), **validators}
+            return await self._with_retry(kind, lambda: self._get(url, merged or None))
+
+        return await self.cache.get(url, fetch)
+
+    async def _with_retry(self, kind: str, operation: Callable[[], Awaitable[T]]) -> T:
+        if self.retry is None:
+            return await operation()
+        return await self.retry.call(kind, operation)
+
+    async def _get(self, url: str, headers: Optional[Dict[str, str]]) -> FetchResponse:
+        """Perform the network GET inside a request budget slot."""
+        async with self._slot(url) as outcome:
+            response = await self.backend.get(url, headers=headers)
+            outcome.record(response.status, len(response.body))
+            return response
+
+    @asynccontextmanager
+    async def _slot(self, url: str) -> AsyncIterator[RequestOutcome]:
+        if self.budget is None:
+            yield RequestOutcome()
+            return
+        async with self.budget.slot(url) as outcome:
+            yield outcome
+
+    @staticmethod
+    def _is_login_response(response: FetchResponse) -> bool:
+        if "html" not in response.headers.get("content-type", "html"):
+            return looks_like_login_page(response.url)
+        return looks_like_login_page(response.url, response.text())
+
     async def fetch_html(self, url: str) -> str:
-        """Fetch HTML content via Playwright's request API."""
-        response = await self.page.request.get(url)
-        return await response.text()
+        """Fetch HTML content through the fetch backend, raising ``FetchError`` on an error status."""
+        response = await self.fetch(url, kind="html")
+        if not response.ok:
+            raise FetchError(url, response.status)
+        return response.text()
 
     async def fetch_json(self, url: str) -> Optional[Dict]:
-        """Fetch JSON content via Playwright's request API."""
+        """Fetch JSON content through the fetch backend, returning None on failure."""
         try:
-            response = await self.page.request.get(url)
+            response = await self.fetch(url, kind="json")
             if response.ok:
-                return await response.json()
+                return response.json()
+            logging.error("Failed to fetch JSON from %s: HTTP %s", url, response.status)
         except Exception as exc:
             logging.error("Failed to fetch JSON from %s: %s", url, exc)
         return None
@@ -72,15 +253,134 @@ class CrawlerClient:
         cookies = await self.page.context.cookies()
         return {cookie["name"]: cookie["value"] for cookie in cookies}
 
-    async def download_file(self, url: str, save_path: str) -> bool:
-        """Download a file to the given path."""
+    async def download_file(
+        self,
+        url: str,
+        save_path: str,
+        max_bytes: Optional[int] = None,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    ) -> int:
+        """Download a file to ``save_path`` in ranged chunks, resuming a partial file; return its size."""
+        offset = os.path.getsize(save_path) if os.path.exists(save_path) else 0
+        while True:
+            headers = {"Range": f"bytes={offset}-{offset + chunk_bytes - 1}"}
+            response = await self._download_range(url, headers, save_path, offset, max_bytes)
+            total = _content_range_total(response.headers)
+            if response.status == 416:
+                # "bytes */N": nothing left past the offset; an empty file has N = 0.
+                if total is None and offset > 0:
+                    return offset
+                if total is not None and total <= offset:
+                    with open(save_path, "r+b" if os.path.exists(save_path) else "wb") as handle:
+                        handle.truncate(total)
+                    return total
+            if not response.ok:
+                raise FetchError(url, response.status)
+
+            previous = offset
+            offset = os.path.getsize(save_path)
+            if response.status != 206 or total is None or offset >= total or offset == previous:
+                return offset
+
+    async def _download_range(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        save_path: str,
+        offset: int,
+        max_bytes: Optional[int],
+    ) -> FetchResponse:
+        """Request one range and stream it into ``save_path``, re-logging in once if needed."""
+        guard = self.session_guard
+        generation = 0
+        if guard is not None:
+            await guard.wait_ready()
+            generation = guard.generation
+        response = await self._with_retry(
+            "download", lambda: self._stream_range(url, headers, save_path, offset, max_bytes)
+        )
+        if not looks_like_login_page(response.url):
+            return response
+        if guard is None:
+            raise SessionExpiredError(f"Redirected to login while downloading {url}")
+        logging.warning("Session expired while downloading; waiting for re-login")
+        if not await guard.refresh(generation):
+            raise SessionExpiredError(f"Re-login failed while downloading {url}")
+        if self.page is not None and guard.cookies:
+            await self.page.context.add_cookies(guard.cookies)
+        response = await self._with_retry(
+            "download", lambda: self._stream_range(url, headers, save_path, offset, max_bytes)
+        )
+        if looks_like_login_page(response.url):
+            raise SessionExpiredError(f"Still redirected to login after re-login: {url}")
+        return response
+
+    async def _stream_range(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        save_path: str,
+        offset: int,
+        max_bytes: Optional[int],
+    ) -> FetchResponse:
+        """Perform one ranged GET inside a budget slot, writing a successful body to disk."""
+        too_large: Optional[DownloadTooLarge] = None
+        async with self._slot(url) as outcome:
+            async with self.backend.stream(url, headers=headers) as response:
+                result = FetchResponse(response.url, response.status, response.headers)
+                if not response.ok or looks_like_login_page(response.url):
+                    outcome.record(response.status, 0)
+                    return result
+                try:
+                    await self._write_stream(url, response, save_path, offset, max_bytes)
+                except DownloadTooLarge as exc:
+                    too_large = exc
+                # Empty or oversized files are the server's answer, not a throttling signal.
+                outcome.record(response.status, None)
+        if too_large is not None:
+            raise too_large
+        return result
+
+    @staticmethod
+    async def _write_stream(
+        url: str,
+        response: StreamedResponse,
+        save_path: str,
+        offset: int,
+        max_bytes: Optional[int],
+    ) -> int:
+        """Write a streamed body at ``offset`` (0 unless it is a 206) and return its length."""
+        if response.status == 206:
+            declared = _content_range_total(response.headers)
+        else:
+            offset = 0
+            length = response.headers.get("content-length", "")
+            declared = int(length) if length.isdigit() else None
+        if max_bytes is not None and declared is not None and declared > max_bytes:
+            _remove(save_path)
+            raise DownloadTooLarge(url, declared, max_bytes)
+
+        position = offset
         try:
-            response = await self.page.request.get(url)
-            if response.ok:
-                content = await response.body()
-                with open(save_path, "wb") as handle:
-                    handle.write(content)
-                return True
-        except Exception as exc:
-            logging.error("Failed to download file %s: %s", url, exc)
-        return False
+            with open(save_path, "r+b" if offset else "wb") as handle:
+                handle.seek(offset)
+                async for chunk in response.chunks:
+                    position += len(chunk)
+                    if max_bytes is not None and position > max_bytes:
+                        raise DownloadTooLarge(url, position, max_bytes)
+                    handle.write(chunk)
+                handle.truncate()
+        except DownloadTooLarge:
+            _remove(save_path)
+            raise
+        return position - offset
+
+
+def _content_range_total(headers: Dict[str, str]) -> Optional[int]:
+    match = _CONTENT_RANGE_TOTAL.search(headers.get("content-range", ""))
+    return int(match.group(1)) if match else None
+
+
+def _remove(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
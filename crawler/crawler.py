@@ -1,20 +1,54 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-from bs4 import BeautifulSoup
-
-from core.browser import BrowserManager
-from utils.tools import convert_url, sanitize_folder_name
-
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+from urllib.parse import parse_qs, urlparse
+
+
+from core.browser import (
+    DEFAULT_ALLOWED_HOSTS,
+    DEFAULT_CONTEXT_MAX_HEAP_MB,
+    DEFAULT_CONTEXT_MAX_USES,
+    DEFAULT_PAGES_PER_CONTEXT,
+    BrowserManager,
+)
+from utils.image_store import DEFAULT_ATTACHMENT_STORE, DEFAULT_IMAGE_STORE, ContentStore, ImageStore
+from utils.tools import convert_url
+
+from .archive import HOMEWORK_LIST, LIST_ARCHIVE_PATH, PageArchive
+from .attachments import DEFAULT_MAX_ATTACHMENT_BYTES, AttachmentDownloader
 from .auth import LoginStrategy, create_login_strategy
-from .client import CrawlerClient
+from .backends import FetchBackend, create_fetch_backend
+from .cache import ResponseCache
+from .client import DEFAULT_CAPTURE_TIMEOUT, CrawlerClient
+from .dom import HOMEWORK_LIST as DOM_HOMEWORK_LIST, DomExtractor, list_page_count
+from .images import DEFAULT_MAX_IMAGE_BYTES, ImagePrefetcher
+from .pagination import fetch_all_pages
+from .parsing import (
+    ParserPool,
+    parse_class_id_map,
+    parse_homework_list,
+    resolve_parser,
+    select_homework_tasks,
+)
 from .processor import HomeworkProcessor
+from .retry import RetryManager, RetryPolicy
+from .scheduler import DEFAULT_QUEUE_SIZE, CrawlScheduler, RequestBudget, iterate
+from .session import SessionGuard, SessionStore, looks_like_login_page
+from .sharding import HashRing, crawl_shard
+from .state import FAILURE, IN_PROGRESS, SUCCESS, CrawlStateStore
+from .throttle import AdaptiveThrottle
+
+T = TypeVar("T")
+
+DEFAULT_REQUEST_BUDGET = 10
 
 
 class ChaoxingCrawler:
@@ -25,110 +59,586 @@ class ChaoxingCrawler:
         self.browser_manager: Optional[BrowserManager] = None
         self.login_strategy: LoginStrategy = create_login_strategy(config)
         self.cookies: List[Dict] = []
+        self.fetch_backend: Optional[FetchBackend] = None
+        self.session_store: Optional[SessionStore] = self._init_session_store()
+        self.session_guard: Optional[SessionGuard] = None
+        self.session_expired = False
+        self.response_cache: Optional[ResponseCache] = None
+        self.request_budget: Optional[RequestBudget] = None
+        self.retry = self._init_retry()
+        self.state: Optional[CrawlStateStore] = None
+        self.images: Optional[ImagePrefetcher] = self._init_image_prefetcher()
+        self.attachments: Optional[AttachmentDownloader] = self._init_attachment_downloader()
+        self.archive_pages = bool(getattr(config, "html_archive", False))
+        self.list_archive: Optional[PageArchive] = None
+        self.html_parser = resolve_parser(getattr(config, "html_parser", None))
+        self.parser_pool = ParserPool()
+        self.dom: Optional[DomExtractor] = self._init_dom_extractor()
 
     async def run(self) -> List[Path]:
-        """Run the full crawl workflow."""
-        saved_dirs: List[Path] = []
+        """Run the full crawl workflow, resuming an unfinished earlier run if there is one."""
+        download_dir = self._init_download_dir()
+        budget = self._resolve_request_budget()
+        assigned = self._start_state()
+
+        # A crawl waits on the network, so parse_workers=0 parses inline (reparse uses every core).
+        self.parser_pool = ParserPool(int(getattr(self.config, "parse_workers", 0) or 0))
+        if self.archive_pages:
+            self.list_archive = PageArchive(LIST_ARCHIVE_PATH)
+        try:
+            shards = int(getattr(self.config, "browser_shards", 1) or 1)
+            if shards > 1:
+                saved_dirs, task_count = await self._run_sharded(download_dir, budget, shards, assigned)
+            else:
+                result = await self._run_with_browser(
+                    download_dir, budget, lambda: self._crawl_tasks(assigned)
+                )
+                saved_dirs, task_count = result or ([], 0)
+        finally:
+            self.parser_pool.close()
+            if self.list_archive:
+                self.list_archive.close()
+            if self.state:
+                self.state.checkpoint(force=True)
+                logging.info("Crawl state: %s", self.state.summary())
+        if self.state:
+            self.state.finish_run()
+
+        logging.info("Crawl finished: %s/%s", len(saved_dirs), task_count)
+        return saved_dirs
+
+    def _start_state(self) -> Optional[List[Dict[str, Any]]]:
+        """Open the crawl state store; return the tasks to resume, or None to discover them."""
+        self.state = self._init_state_store()
+        if not self.state:
+            return None
+        scope = self._state_scope()
+        self.state.load()
+        if getattr(self.config, "resume_crawl", True) and self.state.resumable(scope):
+            remaining = self.state.unfinished_tasks()
+            if self.state.discovered and remaining:
+                logging.info(
+                    "Resuming unfinished crawl: %s/%s tasks left", len(remaining), len(self.state.tasks)
+                )
+                return remaining
+            if not self.state.discovered:
+                logging.info("Resuming unfinished crawl; rediscovering tasks and skipping finished ones")
+                return None
+        retried = self.state.start_run(scope, retry_unfinished=bool(getattr(self.config, "resume_crawl", True)))
+        if retried:
+            logging.info("Retrying %s homework tasks that did not finish in the previous run", retried)
+        return None
+
+    def _state_scope(self) -> str:
+        """Fingerprint the options that decide which tasks a run covers."""
+        scope = {
+            key: getattr(self.config, key, None) or []
+            for key in ("course_urls", "class_list", "homework_name_list")
+        }
+        return hashlib.sha1(json.dumps(scope, sort_keys=True).encode("utf-8")).hexdigest()
+
+    async def run_shard(
+        self,
+        tasks: List[Dict[str, Any]],
+        cookies: List[Dict],
+        budget: int,
+        session_guard: Optional[SessionGuard] = None,
+    ) -> List[Path]:
+        """Process an assigned list of tasks in this crawler's own browser, reusing cookies."""
         download_dir = self._init_download_dir()
-        max_workers = self._resolve_max_workers()
+        result = await self._run_with_browser(
+            download_dir, budget, lambda: self._crawl_tasks(tasks), cookies, session_guard
+        )
+        return result[0] if result else []
 
+    async def _run_sharded(
+        self,
+        download_dir: str,
+        budget: int,
+        shards: int,
+        assigned: Optional[List[Dict[str, Any]]] = None,
+    ) -> Tuple[List[Path], int]:
+        """Discover tasks once (unless ``assigned``), then crawl them across several browsers."""
+        if assigned is not None:
+            tasks = assigned
+            # Without discovery, log in here so every shard starts from one login.
+            if not await self._run_with_browser(download_dir, budget, self._logged_in):
+                return [], len(tasks)
+        else:
+            tasks = await self._run_with_browser(download_dir, budget, self._collect_tasks)
+        if not tasks:
+            logging.warning("No homework tasks found")
+            return [], 0
+
+        buckets = [
+            bucket for bucket in HashRing(shards).partition(tasks, self._task_id) if bucket
+        ]
+        shard_budget = max(1, budget // len(buckets))
+        logging.info("Crawling %s tasks across %s browser shards", len(tasks), len(buckets))
+
+        results: List[Any]
+        use_processes = bool(getattr(self.config, "shard_processes", False))
+        if use_processes:
+            if self.state:
+                for task in tasks:
+                    self.state.mark_task(self._task_id(task), IN_PROGRESS)
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(
+                max_workers=len(buckets),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                results = await asyncio.gather(
+                    *[
+                        loop.run_in_executor(
+                            executor, crawl_shard, self.config, self.cookies, bucket, shard_budget
+                        )
+                        for bucket in buckets
+                    ],
+                    return_exceptions=True,
+                )
+        else:
+            shard_crawlers = [ChaoxingCrawler(self.config) for _ in buckets]
+            for crawler in shard_crawlers:
+                crawler.parser_pool = self.parser_pool
+                crawler.state = self.state
+                crawler.images = self.images
+                crawler.attachments = self.attachments
+                crawler.dom = self.dom
+            guard = SessionGuard(lambda: self._relogin_shards(shard_crawlers))
+            results = await asyncio.gather(
+                *[
+                    crawler.run_shard(bucket, self.cookies, shard_budget, guard)
+                    for crawler, bucket in zip(shard_crawlers, buckets)
+                ],
+                return_exceptions=True,
+            )
+
+        saved_dirs: List[Path] = []
+        expired = False
+        for index, result in enumerate(results, 1):
+            if isinstance(result, BaseException):
+                logging.error("Browser shard %s failed: %s", index, result)
+            elif use_processes:
+                paths, shard_expired = result
+                saved_dirs.extend(Path(path) for path in paths)
+                expired = expired or shard_expired
+            else:
+                saved_dirs.extend(Path(path) for path in result)
+        leftover: List[Dict[str, Any]] = []
+        if expired:
+            saved = set(saved_dirs)
+            leftover = [task for task in tasks if Path(task["save_path"]) not in saved]
+            logging.warning(
+                "Session expired in shard processes; logging in again to retry %s tasks", len(leftover)
+            )
+            retried = await self._run_with_browser(download_dir, budget, lambda: self._crawl_tasks(leftover))
+            if retried is None:
+                leftover = []
+            else:
+                saved_dirs.extend(retried[0])
+        if use_processes and self.state:
+            saved = set(saved_dirs)
+            # Retried tasks were already marked by _process_homework.
+            retried_keys = {self._task_id(task) for task in leftover}
+            for task in tasks:
+                if self._task_id(task) in retried_keys:
+                    continue
+                status = SUCCESS if Path(task["save_path"]) in saved else FAILURE
+                self.state.mark_task(self._task_id(task), status)
+        return saved_dirs, len(tasks)
+
+    async def _logged_in(self) -> bool:
+        """Browser work that only needs the login ``_run_with_browser`` performs."""
+        return True
+
+    async def _collect_tasks(self) -> List[Dict[str, Any]]:
+        """Discover every homework task without processing any."""
+        source = self._iter_homework_tasks()
+        if self.state:
+            source = self._track_tasks(source, discovering=True)
+        return [task async for task in source]
+
+    async def _track_tasks(
+        self,
+        source: AsyncIterator[Dict[str, Any]],
+        discovering: bool,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Register tasks in the crawl state as they arrive, skipping already succeeded ones."""
+        skipped = 0
+        seen: Set[str] = set()
+        async for task in source:
+            key = self._task_id(task)
+            seen.add(key)
+            if self.state.succeeded(key):
+                skipped += 1
+                continue
+            self.state.add_task(key, task)
+            yield task
+        if discovering:
+            for task in self.state.unfinished_tasks(exclude=seen):
+                yield task
+            self.state.mark_discovered()
+        if skipped:
+            logging.info("Skipped %s homework tasks finished in an earlier run", skipped)
+
+    async def _run_with_browser(
+        self,
+        download_dir: str,
+        budget: int,
+        work: Callable[[], Awaitable[T]],
+        cookies: Optional[List[Dict]] = None,
+        session_guard: Optional[SessionGuard] = None,
+    ) -> Optional[T]:
+        """Log in (or adopt the given cookies), then run ``work`` inside one browser session."""
+        pages_per_context = int(
+            getattr(self.config, "pages_per_context", 0) or DEFAULT_PAGES_PER_CONTEXT
+        )
         async with BrowserManager(
             headless=getattr(self.config, "headless", False),
-            max_contexts=max_workers,
+            max_contexts=-(-budget // pages_per_context),
             download_path=download_dir,
+            lean=bool(getattr(self.config, "lean_browser", False)),
+            allowed_hosts=getattr(self.config, "lean_allowed_hosts", None) or DEFAULT_ALLOWED_HOSTS,
+            pages_per_context=pages_per_context,
+            context_max_uses=int(getattr(self.config, "context_max_uses", DEFAULT_CONTEXT_MAX_USES)),
+            context_max_heap_mb=int(
+                getattr(self.config, "context_max_heap_mb", DEFAULT_CONTEXT_MAX_HEAP_MB)
+            ),
+            report_traffic=bool(getattr(self.config, "report_browser_traffic", False)),
         ) as browser:
             self.browser_manager = browser
 
-            if not await self._login():
+            if cookies:
+                self.cookies = list(cookies)
+                browser.set_cookies(self.cookies)
+            elif not await self._login():
                 logging.error("Login failed; aborting crawler")
-                return saved_dirs
-
-            tasks = await self._get_all_homework_tasks()
-            if not tasks:
-                logging.warning("No homework tasks found")
-                return saved_dirs
-
-            semaphore = asyncio.Semaphore(max_workers)
-
-            async def process_with_limit(task: Dict[str, Any]) -> Optional[Path]:
-                async with semaphore:
-                    return await self._process_homework(task, max_workers)
+                return None
 
-            results = await asyncio.gather(
-                *[process_with_limit(task) for task in tasks],
-                return_exceptions=True,
+            self.request_budget = RequestBudget(budget, self._init_throttle(budget))
+            self.session_guard = session_guard or SessionGuard(self._relogin)
+            self.response_cache = self._init_response_cache()
+            self.fetch_backend = create_fetch_backend(
+                getattr(self.config, "fetch_backend", "playwright"),
+                self.cookies,
+                int(getattr(self.config, "http_limit_per_host", 0) or budget),
             )
+            try:
+                return await work()
+            finally:
+                self.browser_manager = None
+                if self.fetch_backend:
+                    await self.fetch_backend.close()
+                    self.fetch_backend = None
+                if self.response_cache:
+                    logging.info("Response cache: %s", self.response_cache.summary())
+                logging.info(
+                    "Request budget: limit=%s, peak=%s",
+                    self.request_budget.limit,
+                    self.request_budget.peak,
+                )
+                if self.request_budget.throttle:
+                    logging.info("Adaptive host limits: %s", self.request_budget.throttle.summary())
+                if self.retry.stats:
+                    logging.info("Fetch retries: %s", self.retry.summary())
+                if self.images:
+                    logging.info("Image prefetch: %s", self.images.summary())
+                if self.attachments:
+                    logging.info("Attachments: %s", self.attachments.summary())
+                if self.dom:
+                    logging.info("DOM extraction: %s", self.dom.summary())
+
+    async def _crawl_tasks(
+        self,
+        assigned: Optional[List[Dict[str, Any]]] = None,
+    ) -> Tuple[List[Path], int]:
+        """Process assigned or discovered homework tasks, returning saved folders and task count."""
+        budget_limit = self.request_budget.limit if self.request_budget else DEFAULT_REQUEST_BUDGET
+        workers = int(getattr(self.config, "homework_workers", 0) or budget_limit)
+        scheduler: CrawlScheduler[Dict[str, Any]] = CrawlScheduler(
+            workers,
+            priority=lambda task: -int(task.get("pending_count", 0) or 0),
+            queue_size=int(getattr(self.config, "task_queue_size", 0) or DEFAULT_QUEUE_SIZE),
+        )
+        source = iterate(assigned) if assigned is not None else self._iter_homework_tasks()
+        if self.state:
+            source = self._track_tasks(source, discovering=assigned is None)
+        results = await scheduler.run(source, self._process_homework)
+        if not results:
+            logging.warning("No homework tasks found")
+            return [], 0
 
-            for idx, result in enumerate(results):
-                if isinstance(result, Exception):
-                    logging.error("Failed to process homework #%s: %s", idx + 1, result)
-                elif result:
-                    saved_dirs.append(result)
+        saved_dirs: List[Path] = []
+        for idx, (_, result) in enumerate(results):
+            if isinstance(result, Exception):
+                logging.error("Failed to process homework #%s: %s", idx + 1, result)
+            elif result:
+                saved_dirs.append(result)
+        return saved_dirs, len(results)
+
+    def _resolve_request_budget(self) -> int:
+        configured = getattr(self.config, "max_workers_prepare", 0) or 0
+        return int(configured) if int(configured) > 0 else DEFAULT_REQUEST_BUDGET
 
-        logging.info("Crawl finished: %s/%s", len(saved_dirs), len(tasks))
-        return saved_dirs
+    def _resolve_page_size(self) -> Optional[int]:
+        configured = getattr(self.config, "list_page_size", None)
+        return int(configured) if configured else None
 
-    def _resolve_max_workers(self) -> int:
-        configured = getattr(self.config, "max_workers_prepare", 0) or 0
-        return max(int(configured), 10)
+    def _resolve_capture_timeout(self) -> int:
+        return int(getattr(self.config, "capture_timeout", 0) or DEFAULT_CAPTURE_TIMEOUT)
 
     def _init_download_dir(self) -> str:
         download_dir = os.path.join(os.getcwd(), "downloads")
         os.makedirs(download_dir, exist_ok=True)
         return download_dir
 
-    async def _login(self) -> bool:
-        """Perform login and capture shared cookies."""
+    def _init_throttle(self, budget: int) -> Optional[AdaptiveThrottle]:
+        if not getattr(self.config, "adaptive_concurrency", True):
+            return None
+        ceiling = int(getattr(self.config, "host_concurrency_ceiling", 0) or budget)
+        initial = int(getattr(self.config, "host_concurrency_initial", 0) or 0) or None
+        return AdaptiveThrottle(min(ceiling, budget), initial)
+
+    def _init_retry(self) -> RetryManager:
+        base_delay = float(getattr(self.config, "retry_base_delay", 0.5))
+        max_delay = float(getattr(self.config, "retry_max_delay", 20.0))
+
+        def policy(option: str, default: int) -> RetryPolicy:
+            attempts = int(getattr(self.config, option, default))
+            return RetryPolicy(attempts=attempts + 1, base_delay=base_delay, max_delay=max_delay)
+
+        return RetryManager(
+            {
+                "html": policy("fetch_retries", 3),
+                "json": policy("fetch_retries", 3),
+                "download": policy("download_retries", 4),
+                "navigation": policy("navigation_retries", 2),
+            }
+        )
+
+    def _init_response_cache(self) -> ResponseCache:
+        cache_dir: Optional[str] = None
+        if getattr(self.config, "response_cache", False):
+            cache_dir = getattr(self.config, "response_cache_dir", "") or os.path.join(
+                os.getcwd(), ".cache", "responses"
+            )
+        ttl = float(getattr(self.config, "response_cache_ttl", 30) or 0)
+        return ResponseCache(cache_dir, ttl=ttl)
+
+    def _init_image_prefetcher(self) -> Optional[ImagePrefetcher]:
+        if not getattr(self.config, "prefetch_images", True):
+            return None
+        max_mb = float(getattr(self.config, "max_image_mb", 0) or 0)
+        max_bytes = int(max_mb * 1024 * 1024) if max_mb > 0 else DEFAULT_MAX_IMAGE_BYTES
+        return ImagePrefetcher(ImageStore(DEFAULT_IMAGE_STORE), max_bytes)
+
+    def _init_attachment_downloader(self) -> Optional[AttachmentDownloader]:
+        if not getattr(self.config, "download_attachments", True):
+            return None
+        max_mb = float(getattr(self.config, "max_attachment_mb", 0) or 0)
+        max_bytes = int(max_mb * 1024 * 1024) if max_mb > 0 else DEFAULT_MAX_ATTACHMENT_BYTES
+        return AttachmentDownloader(ContentStore(DEFAULT_ATTACHMENT_STORE), max_bytes)
+
+    def _init_dom_extractor(self) -> Optional[DomExtractor]:
+        if not getattr(self.config, "dom_extraction", False):
+            return None
+        if self.archive_pages:
+            logging.warning("html_archive needs each page's HTML; DOM extraction is disabled")
+            return None
+        return DomExtractor(self.html_parser, bool(getattr(self.config, "dom_extraction_verify", True)))
+
+    def _active_dom(self) -> Optional[DomExtractor]:
+        """Return the DOM extractor if pages are fetched through the browser in this session."""
+        return self.dom if self.fetch_backend is None else None
+
+    def _init_state_store(self) -> Optional[CrawlStateStore]:
+        if not getattr(self.config, "crawl_state", True):
+            return None
+        path = getattr(self.config, "crawl_state_path", "") or os.path.join(
+            os.getcwd(), ".cache", "crawl_state.json"
+        )
+        return CrawlStateStore(path)
+
+    def _init_session_store(self) -> Optional[SessionStore]:
+        if not getattr(self.config, "session_cache", True):
+            return None
+        path = getattr(self.config, "session_cache_path", "") or os.path.join(
+            os.getcwd(), ".session", "storage_state.json"
+        )
+        return SessionStore(path)
+
+    async def _login(self, force: bool = False) -> bool:
+        """Reuse a cached session if it is still valid, otherwise log in and capture cookies."""
         if not self.browser_manager:
             raise RuntimeError("Browser manager is not initialized")
+        if not force and await self._restore_session():
+            return True
+
         login_url = "https://passport2.chaoxing.com/"
-        async with self.browser_manager.new_context(with_cookies=False) as context:
+        async with self.browser_manager.new_context(with_cookies=False, lean=False) as context:
             page = await context.new_page()
             success = await self.login_strategy.login(page, login_url)
             if success:
                 self.cookies = await self.login_strategy.get_cookies(page)
                 self.browser_manager.set_cookies(self.cookies)
                 logging.info("Login succeeded, cookies captured")
+                if self.session_store:
+                    self.session_store.save(await context.storage_state())
             return success
 
-    async def _get_all_homework_tasks(self) -> List[Dict[str, Any]]:
-        """Collect homework tasks across all configured courses."""
-        all_tasks: List[Dict[str, Any]] = []
+    async def _relogin(self) -> Optional[List[Dict]]:
+        """Log in again mid-run and propagate the fresh cookies; None on failure."""
+        logging.warning("Session expired mid-run; logging in again")
+        if not await self._login(force=True):
+            logging.error("Re-login failed")
+            return None
+        await self._adopt_cookies(self.cookies)
+        return self.cookies
+
+    async def _adopt_cookies(self, cookies: List[Dict]) -> None:
+        """Switch this crawler's browser and fetch backend to fresh login cookies."""
+        self.cookies = list(cookies)
+        if self.fetch_backend:
+            self.fetch_backend.set_cookies(self.cookies)
+        if self.browser_manager:
+            self.browser_manager.set_cookies(self.cookies)
+            await self.browser_manager.sync_cookies()
+
+    async def _relogin_shards(self, shards: List["ChaoxingCrawler"]) -> Optional[List[Dict]]:
+        """Log in once through a shard that is still running and hand its cookies to the others."""
+        for shard in shards:
+            if shard.browser_manager is None:
+                continue
+            cookies = await shard._relogin()
+            if cookies is None:
+                return None
+            self.cookies = list(cookies)
+            for other in shards:
+                if other is not shard and other.browser_manager is not None:
+                    await other._adopt_cookies(cookies)
+            return cookies
+        return None
+
+    async def _give_up_relogin(self) -> Optional[List[Dict]]:
+        """Re-login stand-in for shard processes, which cannot prompt for a login."""
+        logging.warning("Session expired in a shard process; leaving its tasks to be retried")
+        self.session_expired = True
+        return None
+
+    async def _restore_session(self) -> bool:
+        """Load cached cookies and keep them only if a probe request is still authenticated."""
+        if not self.session_store or not self.browser_manager:
+            return False
+        state = self.session_store.load()
+        if not state or not state.get("cookies"):
+            return False
+
+        self.browser_manager.set_cookies(state["cookies"])
+        course_urls = getattr(self.config, "course_urls", []) or []
+        probe_url = getattr(self.config, "session_probe_url", "") or (
+            course_urls[0] if course_urls else "https://i.chaoxing.com/"
+        )
+        valid = False
+        async with self.browser_manager.new_context() as context:
+            try:
+                response = await context.request.get(probe_url)
+                valid = response.ok and not looks_like_login_page(response.url, await response.text())
+            except Exception as exc:
+                logging.warning("Session probe failed: %s", exc)
+
+        if not valid:
+            logging.info("Cached session expired; logging in again")
+            self.browser_manager.set_cookies([])
+            return False
+        self.cookies = state["cookies"]
+        logging.info("Reusing cached login session")
+        return True
+
+    async def _iter_homework_tasks(self) -> AsyncIterator[Dict[str, Any]]:
+        """Discover homework tasks across all courses concurrently, yielding them as found."""
         course_urls = getattr(self.config, "course_urls", []) or []
         if not course_urls:
             logging.warning("No course URLs configured")
-            return all_tasks
+            return
+
+        queue: "asyncio.Queue[Optional[List[Dict[str, Any]]]]" = asyncio.Queue()
 
-        for index, course_url in enumerate(course_urls, 1):
-            logging.info("Processing course %s/%s", index, len(course_urls))
+        async def discover(index: int, course_url: str) -> None:
             try:
-                tasks = await self._get_course_tasks(course_url)
-                all_tasks.extend(tasks)
-                logging.info("Course tasks collected: %s", len(tasks))
+                tasks = await self._get_course_tasks(course_url, queue.put_nowait)
+                logging.info("Course %s/%s tasks collected: %s", index, len(course_urls), len(tasks))
             except Exception as exc:
                 logging.error("Failed to fetch course tasks: %s", exc)
-        return all_tasks
 
-    async def _get_course_tasks(self, course_url: str) -> List[Dict[str, Any]]:
-        """Fetch homework tasks for a single course."""
+        async def discover_all() -> None:
+            try:
+                await asyncio.gather(
+                    *[discover(index, course_url) for index, course_url in enumerate(course_urls, 1)]
+                )
+            finally:
+                queue.put_nowait(None)
+
+        producer = asyncio.ensure_future(discover_all())
+        seen: Set[Tuple[str, str, str]] = set()
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    break
+                for task in batch:
+                    key = self._task_key(task)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield task
+        finally:
+            if not producer.done():
+                producer.cancel()
+
+    def _task_key(self, task: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Return the (class id, homework name, answer time) key of a task."""
+        query = parse_qs(urlparse(task.get("作业批阅链接", "")).query)
+        class_ids = query.get("clazzid") or query.get("classId") or [task.get("班级", "")]
+        return class_ids[0], task.get("作业名", ""), task.get("作答时间", "")
+
+    def _task_id(self, task: Dict[str, Any]) -> str:
+        """Return the task key joined into one string, for hashing and the state store."""
+        return "|".join(self._task_key(task))
+
+    async def _get_course_tasks(
+        self,
+        course_url: str,
+        emit: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch homework tasks for a single course, passing each batch to ``emit``."""
         tasks: List[Dict[str, Any]] = []
         if not self.browser_manager:
             raise RuntimeError("Browser manager is not initialized")
-        async with self.browser_manager.new_context() as context:
-            page = await context.new_page()
-            client = CrawlerClient(page)
-            await client.setup_response_capture(["mooc2-ans/work/list"])
-            await client.goto(course_url)
-            await page.wait_for_timeout(2000)
-
-            list_url = client.get_captured_url("mooc2-ans/work/list")
+        async with self.browser_manager.page() as page:
+            client = CrawlerClient(
+                page,
+                self.fetch_backend,
+                self.session_guard,
+                self.response_cache,
+                self.request_budget,
+                self.retry,
+            )
+            capture_timeout = self._resolve_capture_timeout()
+            # The list XHR only fires on load when the homework tab is the default tab.
+            list_url = await client.capture_url(
+                course_url, "mooc2-ans/work/list", min(capture_timeout, 3000)
+            )
             if not list_url:
+                list_response = client.expect_response("mooc2-ans/work/list")
                 try:
                     await page.get_by_role("link", name="作业").click()
-                    await page.wait_for_timeout(2000)
+                    response = await client.wait_for_response(list_response, capture_timeout)
+                    list_url = response.url if response else None
                 except Exception:
+                    list_response.cancel()
                     logging.warning("Failed to click homework tab; attempting iframe fallback")
 
+            if not list_url:
                 iframe = await page.query_selector("iframe[name='frame_content-zy']")
                 if iframe:
                     iframe_src = await iframe.get_attribute("src")
@@ -144,9 +654,11 @@ class ChaoxingCrawler:
 
             class_list = getattr(self.config, "class_list", []) or []
             if class_list:
-                tasks = await self._get_tasks_by_classes(client, list_url, class_list)
+                tasks = await self._get_tasks_by_classes(client, list_url, class_list, emit)
             else:
                 tasks = await self._parse_all_pages(client, list_url)
+                if emit:
+                    emit(tasks)
         return tasks
 
     async def _get_tasks_by_classes(
@@ -154,142 +666,144 @@ class ChaoxingCrawler:
         client: CrawlerClient,
         list_url: str,
         class_list: List[str],
+        emit: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
     ) -> List[Dict[str, Any]]:
-        """Fetch homework tasks for specified class names."""
+        """Fetch homework tasks for specified class names concurrently."""
         tasks: List[Dict[str, Any]] = []
         html = await client.fetch_html(list_url)
-        class_id_map = self._parse_class_id_map(html)
+        class_id_map = await self.parser_pool.run(parse_class_id_map, html, self.html_parser)
         if not class_id_map:
             logging.warning("Class ID map missing; falling back to default list")
-            return await self._parse_all_pages(client, list_url)
+            tasks = await self._parse_all_pages(client, list_url)
+            if emit:
+                emit(tasks)
+            return tasks
 
-        for class_name in class_list:
+        async def fetch_class(class_name: str) -> List[Dict[str, Any]]:
             class_id = class_id_map.get(class_name)
             if not class_id:
                 logging.warning("Class not found in page")
-                continue
+                return []
             class_url = self._construct_class_url(list_url, class_id)
             class_tasks = await self._parse_all_pages(client, class_url)
-            tasks.extend(class_tasks)
+            if emit:
+                emit(class_tasks)
+            return class_tasks
+
+        results = await asyncio.gather(
+            *[fetch_class(class_name) for class_name in class_list],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logging.error("Failed to fetch class tasks: %s", result)
+            else:
+                tasks.extend(result)
         return tasks
 
     async def _parse_all_pages(self, client: CrawlerClient, list_url: str) -> List[Dict[str, Any]]:
         """Parse all pages of a homework list."""
-        tasks: List[Dict[str, Any]] = []
-        page_num = 1
-        while True:
-            url = convert_url(list_url, page_num)
+        page_size = self._resolve_page_size() or 12
+
+        dom = self._active_dom()
+
+        async def fetch_page(page_num: int) -> Any:
+            url = convert_url(list_url, page_num, page_size)
+            if dom is not None and dom.enabled(DOM_HOMEWORK_LIST):
+                extracted = await dom.load(
+                    DOM_HOMEWORK_LIST,
+                    lambda: client.extract(url, lambda loaded: dom.extract(loaded, DOM_HOMEWORK_LIST)),
+                    lambda: client.fetch_html(url),
+                )
+                if extracted is not None:
+                    return extracted
             html = await client.fetch_html(url)
-            page_tasks = self._parse_homework_list(html)
-            if not page_tasks:
-                break
-            tasks.extend(page_tasks)
-            page_num += 1
+            if self.list_archive:
+                self.list_archive.add(HOMEWORK_LIST, url, html, page=page_num)
+            return html
+
+        failed_pages: List[int] = []
+        tasks = await fetch_all_pages(
+            fetch_page, self._parse_homework_list, failed_pages=failed_pages, page_count=list_page_count
+        )
+        if failed_pages:
+            logging.error("Homework list incomplete: %s pages failed", len(failed_pages))
         return tasks
 
-    def _parse_class_id_map(self, html: str) -> Dict[str, str]:
-        """Parse class name to ID mapping from HTML."""
-        class_map: Dict[str, str] = {}
-        soup = BeautifulSoup(html, "html.parser")
-        for item in soup.select("li.classli"):
-            name = item.get("title", "").strip()
-            class_id = item.get("data", "")
-            if name and class_id:
-                class_map[name] = class_id
-        return class_map
-
-    def _parse_homework_list(self, html: str) -> List[Dict[str, Any]]:
-        """Parse homework tasks from list HTML."""
-        tasks: List[Dict[str, Any]] = []
-        soup = BeautifulSoup(html, "html.parser")
-
-        null_data = soup.find("div", class_="nullData")
-        if null_data and "暂无数据" in null_data.text:
-            return tasks
-
-        work_items = soup.find_all("li", id=lambda x: x and x.startswith("work"))
-        homework_name_list = getattr(self.config, "homework_name_list", []) or []
+    async def _parse_homework_list(self, page: Any) -> List[Dict[str, Any]]:
+        """Parse homework tasks from list HTML or from fields extracted in the browser."""
+        homework_name_list = list(getattr(self.config, "homework_name_list", []) or [])
         min_ungraded = getattr(self.config, "min_ungraded_students", 0)
-
-        for item in work_items:
-            task = self._parse_work_item(item)
-            if not task:
-                continue
-            if homework_name_list and task["作业名"] not in homework_name_list:
-                continue
-            if min_ungraded is not None and int(min_ungraded) >= 0:
-                if task.get("pending_count", 0) <= int(min_ungraded):
-                    continue
-            tasks.append(task)
-        return tasks
-
-    def _parse_work_item(self, item: Any) -> Optional[Dict[str, Any]]:
-        """Extract homework task fields from a list item."""
-        try:
-            class_div = item.find("div", class_="list_class")
-            if not class_div:
-                return None
-            class_name = class_div.get("title", "").strip()
-
-            title_h2 = item.find("h2", class_="list_li_tit")
-            if not title_h2:
-                return None
-            homework_name = title_h2.text.strip()
-
-            time_p = item.find("p", class_="list_li_time")
-            time_span = time_p.find("span") if time_p else None
-            answer_time = time_span.text.strip() if time_span else ""
-
-            pending_em = item.find("em", class_="fs28")
-            try:
-                pending_count = int(pending_em.text.strip()) if pending_em else 0
-            except ValueError:
-                pending_count = 0
-
-            review_a = item.find("a", class_="piyueBtn")
-            if not review_a or "href" not in review_a.attrs:
-                return None
-            review_url = "https://mooc2-ans.chaoxing.com" + review_a["href"]
-
-            save_path = os.path.join(
-                "homework",
-                sanitize_folder_name(class_name),
-                sanitize_folder_name(f"{homework_name}{answer_time}"),
-            )
-            return {
-                "班级": class_name,
-                "作业名": homework_name,
-                "作答时间": answer_time,
-                "作业批阅链接": review_url,
-                "save_path": save_path,
-                "pending_count": pending_count,
-            }
-        except Exception as exc:
-            logging.error("Failed to parse homework item: %s", exc)
-            return None
-
-    async def _process_homework(self, task: Dict[str, Any], max_workers: int) -> Optional[Path]:
-        """Process a single homework task and persist results."""
+        if not isinstance(page, str):
+            return select_homework_tasks(page["fields"], homework_name_list, min_ungraded)
+        return await self.parser_pool.run(
+            parse_homework_list, page, self.html_parser, homework_name_list, min_ungraded
+        )
+
+    async def _process_homework(self, task: Dict[str, Any]) -> Optional[Path]:
+        """Process a single homework task, retrying it if the browser crashed meanwhile."""
         if not self.browser_manager:
             raise RuntimeError("Browser manager is not initialized")
+        key = self._task_id(task)
+        if self.state:
+            self.state.mark_task(key, IN_PROGRESS)
+        retries = int(getattr(self.config, "browser_task_retries", 2) or 0)
+        for attempt in range(retries + 1):
+            disruptions = self.browser_manager.disruptions
+            result, failed = await self._process_homework_once(task)
+            if not failed or self.browser_manager.disruptions == disruptions:
+                break
+            if attempt < retries:
+                logging.warning(
+                    "Browser crashed during homework; retrying (%s/%s)", attempt + 1, retries
+                )
+        if self.state:
+            self.state.mark_task(key, FAILURE if failed else SUCCESS)
+        return result
+
+    async def _process_homework_once(self, task: Dict[str, Any]) -> Tuple[Optional[Path], bool]:
+        """Process a homework task once; return the saved folder and whether anything failed."""
         save_path = Path(task["save_path"])
         try:
-            async with self.browser_manager.new_context() as context:
-                processor = HomeworkProcessor(context, max_concurrent=max_workers)
-                student_data = await processor.get_all_students_data(task["作业批阅链接"])
-                if not student_data:
-                    logging.warning("No student data for homework")
-                    return None
-                final_result = processor.format_results(student_data)
-                save_path.mkdir(parents=True, exist_ok=True)
-                answer_file = save_path / "answer.json"
-                with open(answer_file, "w", encoding="utf-8") as handle:
-                    json.dump(final_result, handle, ensure_ascii=False, indent=2)
-                logging.info("Homework saved: %s", save_path)
-                return save_path
+            processor = HomeworkProcessor(
+                self.browser_manager.page,
+                budget=self.request_budget,
+                retry=self.retry,
+                direct_fetch=bool(getattr(self.config, "direct_answer_fetch", True)),
+                page_size=self._resolve_page_size(),
+                capture_timeout=self._resolve_capture_timeout(),
+                backend=self.fetch_backend,
+                session_guard=self.session_guard,
+                cache=self.response_cache,
+                html_parser=self.html_parser,
+                parser_pool=self.parser_pool,
+                on_student=self._student_reporter(task),
+                images=self.images,
+                attachments=self.attachments,
+                archive_pages=self.archive_pages,
+                dom=self._active_dom(),
+            )
+            saved = await processor.save_all_students(
+                task["作业批阅链接"],
+                save_path,
+                incremental=bool(getattr(self.config, "incremental_crawl", True)),
+            )
+            failed = bool(processor.failed_students or processor.failed_pages)
+            if not saved:
+                logging.warning("No student data for homework")
+                return None, failed
+            logging.info("Homework saved: %s", save_path)
+            return save_path, failed
         except Exception as exc:
             logging.error("Failed to process homework: %s", exc)
+            return None, True
+
+    def _student_reporter(self, task: Dict[str, Any]) -> Optional[Callable[[str, str], None]]:
+        """Return a callback recording a task's student statuses in the state store."""
+        if not self.state:
             return None
+        state, key = self.state, self._task_id(task)
+        return lambda name, status: state.mark_student(key, name, status)
 
     def _construct_class_url(self, base_url: str, class_id: str) -> str:
         """Build a class-specific list URL."""
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, TypeVar
+
+from playwright.async_api import Page
+
+from utils.stats import format_counters
+
+from .pagination import PAGE_COUNT_PATTERN, extract_page_count
+from .parsing import (
+    ATTACHMENT_EXTENSIONS,
+    DEFAULT_PARSER,
+    STATUS_KEYWORDS,
+    SUBMIT_TIME_PATTERN,
+    parse_answer_blocks,
+    parse_homework_fields,
+    parse_student_answers,
+    parse_student_list,
+)
+
+STUDENT_ANSWERS = "student_answers"
+ANSWER_BLOCKS = "answer_blocks"
+STUDENT_LIST = "student_list"
+HOMEWORK_LIST = "homework_list"
+
+T = TypeVar("T")
+
+EXTRACTOR_SCRIPT = Path(__file__).with_name("dom_extract.js").read_text(encoding="utf-8")
+
+
+def list_page_count(page: Any) -> Optional[int]:
+    """Return the page count of a fetched list page, given as HTML or as extracted fields."""
+    if isinstance(page, str):
+        return extract_page_count(page)
+    return page["page_count"]
+
+
+def _parse_student_page(html: str, parser: str) -> Dict[str, Any]:
+    return {"students": parse_student_list(html, parser), "page_count": extract_page_count(html)}
+
+
+def _parse_homework_page(html: str, parser: str) -> Dict[str, Any]:
+    return {"fields": parse_homework_fields(html, parser), "page_count": extract_page_count(html)}
+
+
+# What each extractor must match, computed from the page HTML by the Python parsers.
+PYTHON_PARSERS: Dict[str, Callable[[str, str], Any]] = {
+    STUDENT_ANSWERS: parse_student_answers,
+    ANSWER_BLOCKS: parse_answer_blocks,
+    STUDENT_LIST: _parse_student_page,
+    HOMEWORK_LIST: _parse_homework_page,
+}
+
+
+class DomExtractor:
+    """Read list and review page fields in the browser instead of parsing HTML in Python."""
+
+    def __init__(self, html_parser: str = DEFAULT_PARSER, verify: bool = True) -> None:
+        self.html_parser = html_parser
+        self.verify = verify
+        self.disabled: Set[str] = set()
+        self.stats: Dict[str, int] = {"extracted": 0, "mismatches": 0, "slower": 0}
+        self._seconds: Dict[str, float] = {}
+        self._pages: Dict[str, int] = {}
+        self._verified: Set[str] = set()
+        self._options = {
+            "attachmentExtensions": sorted(ATTACHMENT_EXTENSIONS),
+            "statusKeywords": list(STATUS_KEYWORDS),
+            "submitTimePattern": SUBMIT_TIME_PATTERN.pattern,
+            "pageCountPattern": PAGE_COUNT_PATTERN.pattern,
+        }
+
+    def enabled(self, kind: str) -> bool:
+        """Return True if pages of ``kind`` are still extracted in the browser."""
+        return kind not in self.disabled
+
+    async def extract(self, page: Page, kind: str) -> Any:
+        """Run the extractor for ``kind`` in a loaded page."""
+        result = await page.evaluate(EXTRACTOR_SCRIPT, {**self._options, "kind": kind})
+        if kind in (STUDENT_LIST, HOMEWORK_LIST):
+            result["page_count"] = extract_page_count(result["page_count"] or "")
+        return result
+
+    async def load(
+        self,
+        kind: str,
+        extract: Callable[[], Awaitable[T]],
+        fetch_html: Callable[[], Awaitable[str]],
+    ) -> Optional[Any]:
+        """Load one page with ``extract`` (navigate and read it); None if ``kind`` is disabled."""
+        if kind in self.disabled:
+            return None
+        started = time.perf_counter()
+        result = await extract()
+        dom_seconds = time.perf_counter() - started
+        self._seconds[kind] = self._seconds.get(kind, 0.0) + dom_seconds
+        self._pages[kind] = self._pages.get(kind, 0) + 1
+        self.stats["extracted"] += 1
+        if not self.verify or kind in self._verified:
+            return result
+
+        started = time.perf_counter()
+        expected = PYTHON_PARSERS[kind](await fetch_html(), self.html_parser)
+        html_seconds = time.perf_counter() - started
+        if result != expected:
+            self.disabled.add(kind)
+            self.stats["mismatches"] += 1
+            logging.warning("DOM extraction differs from the %s parser; parsing HTML instead", kind)
+            return expected
+        self._verified.add(kind)
+        if dom_seconds > html_seconds:
+            self.disabled.add(kind)
+            self.stats["slower"] += 1
+            logging.info(
+                "DOM extraction of %s took %.2fs against %.2fs to fetch and parse; parsing HTML instead",
+                kind,
+                dom_seconds,
+                html_seconds,
+            )
+        else:
+            logging.info(
+                "DOM extraction matches the %s parser (%.2fs against %.2fs to fetch and parse)",
+                kind,
+                dom_seconds,
+                html_seconds,
+            )
+        return result
+
+    def summary(self) -> str:
+        """Return the counters and mean load time per kind formatted for logging."""
+        parts = [format_counters(self.stats)]
+        parts.extend(
+            f"{kind}={self._seconds[kind] / pages:.2f}s/page" for kind, pages in sorted(self._pages.items())
+        )
+        if self.disabled:
+            parts.append("disabled=" + ",".join(sorted(self.disabled)))
+        return ", ".join(parts)
@@ -0,0 +1,220 @@
+// In-page counterparts of the parsers in parsing.py, run with page.evaluate.
+// Each kind returns exactly what its Python parser returns for the same page;
+// DomExtractor checks that against the Python parser before trusting it.
+({ kind, attachmentExtensions, statusKeywords, submitTimePattern, pageCountPattern }) => {
+  // Python's str.strip() whitespace, which differs from String.prototype.trim().
+  const WS = "[\\t\\n\\v\\f\\r\\x1c-\\x20\\x85\\xa0\\u1680\\u2000-\\u200a\\u2028\\u2029\\u202f\\u205f\\u3000]";
+  const TRIM = new RegExp(`^${WS}+|${WS}+$`, "g");
+  const strip = (value) => value.replace(TRIM, "");
+
+  // Text nodes as BeautifulSoup's get_text sees them: no comments, scripts or styles.
+  const SKIPPED = new Set(["script", "style", "template"]);
+  const strings = (element) => {
+    const found = [];
+    const walk = (node) => {
+      for (let child = node.firstChild; child; child = child.nextSibling) {
+        if (child.nodeType === Node.TEXT_NODE || child.nodeType === Node.CDATA_SECTION_NODE) {
+          found.push(child.data);
+        } else if (child.nodeType === Node.ELEMENT_NODE && !SKIPPED.has(child.localName)) {
+          walk(child);
+        }
+      }
+    };
+    walk(element);
+    return found;
+  };
+  const text = (element) => strings(element).join("");
+  const strippedText = (element, separator) => strings(element).map(strip).filter(Boolean).join(separator);
+  const first = (element, selector) => element.querySelector(selector);
+  const all = (element, selector) => Array.from(element.querySelectorAll(selector));
+
+  const isNullData = () => {
+    const nullData = first(document, "div.nullData");
+    return Boolean(nullData && text(nullData).includes("暂无数据"));
+  };
+
+  const extractContent = (element) => {
+    if (!element) {
+      return { text: [], images: [] };
+    }
+    for (const br of all(element, "br")) {
+      if (br.attributes.length === 0) {
+        br.replaceWith("\n");
+      }
+    }
+    const paragraphs = all(element, "p").map((p) => strip(text(p))).filter(Boolean);
+    return {
+      text: paragraphs.length ? [paragraphs.join("\n")] : [],
+      images: all(element, "img").filter((img) => img.hasAttribute("src")).map((img) => img.getAttribute("src")),
+    };
+  };
+
+  // urllib.parse.urlparse(url).path, unquote and os.path.splitext, as extract_attachments uses them.
+  const USES_PARAMS = new Set([
+    "", "ftp", "hdl", "prospero", "http", "imap", "https", "shttp", "rtsp", "rtsps", "rtspu",
+    "sip", "sips", "mms", "sftp", "tel",
+  ]);
+  const urlPath = (url) => {
+    let rest = url.replace(/^[\x00-\x20]+/, "").replace(/[\t\r\n]/g, "");
+    let scheme = "";
+    const colon = rest.indexOf(":");
+    if (colon > 0 && /^[A-Za-z][A-Za-z0-9+.-]*$/.test(rest.slice(0, colon))) {
+      scheme = rest.slice(0, colon).toLowerCase();
+      rest = rest.slice(colon + 1);
+    }
+    if (rest.startsWith("//")) {
+      const end = rest.slice(2).search(/[/?#]/);
+      rest = end < 0 ? "" : rest.slice(end + 2);
+    }
+    for (const delimiter of ["#", "?"]) {
+      const index = rest.indexOf(delimiter);
+      if (index >= 0) {
+        rest = rest.slice(0, index);
+      }
+    }
+    if (USES_PARAMS.has(scheme)) {
+      const params = rest.indexOf(";", Math.max(rest.lastIndexOf("/"), 0));
+      if (params >= 0) {
+        rest = rest.slice(0, params);
+      }
+    }
+    return rest;
+  };
+  const unquote = (value) =>
+    value.replace(/(?:%[0-9A-Fa-f]{2})+/g, (run) => {
+      const bytes = new Uint8Array(run.length / 3);
+      for (let index = 0; index < bytes.length; index += 1) {
+        bytes[index] = parseInt(run.substr(index * 3 + 1, 2), 16);
+      }
+      return new TextDecoder().decode(bytes);
+    });
+  const extension = (path) => {
+    const sep = path.lastIndexOf("/");
+    const dot = path.lastIndexOf(".");
+    if (dot > sep) {
+      for (let index = sep + 1; index < dot; index += 1) {
+        if (path[index] !== ".") {
+          return path.slice(dot);
+        }
+      }
+    }
+    return "";
+  };
+  const extensions = new Set(attachmentExtensions);
+
+  const extractAttachments = (element) => {
+    if (!element) {
+      return [];
+    }
+    const attachments = [];
+    const seen = new Set();
+    for (const link of all(element, "a[href]")) {
+      const href = strip(link.getAttribute("href"));
+      if (!href || ["javascript:", "#", "mailto:"].some((prefix) => href.startsWith(prefix)) || seen.has(href)) {
+        continue;
+      }
+      const path = unquote(urlPath(href));
+      if (!(link.hasAttribute("download") || extensions.has(extension(path).toLowerCase()) || path.includes("/download"))) {
+        continue;
+      }
+      seen.add(href);
+      const name =
+        link.getAttribute("download") ||
+        link.getAttribute("title") ||
+        strippedText(link, "") ||
+        path.slice(path.lastIndexOf("/") + 1) ||
+        "attachment";
+      attachments.push({ name, url: href });
+    }
+    return attachments;
+  };
+
+  const studentAnswers = () =>
+    all(document, "div.mark_item1").map((block) => {
+      const description = extractContent(first(block, "div.hiddenTitle"));
+      const answerDl = first(block, 'dl.mark_fill[id^="stuanswer_"]');
+      const studentAnswer = extractContent(answerDl);
+      const attachments = extractAttachments(answerDl);
+      const correctDl = first(block, 'dl.mark_fill[id^="correctanswer_"]');
+      return {
+        description,
+        student_answer: studentAnswer,
+        correct_answer: correctDl ? strip(text(correctDl)).replace("参考答案：", "") : "此题无参考答案",
+        attachments,
+        answer_id: answerDl ? answerDl.getAttribute("id") : "",
+      };
+    });
+
+  const answerBlocks = () => {
+    const blocks = {};
+    for (const answerDl of all(document, 'dl.mark_fill[id^="stuanswer_"]')) {
+      blocks[answerDl.getAttribute("id")] = {
+        student_answer: extractContent(answerDl),
+        attachments: extractAttachments(answerDl),
+      };
+    }
+    return blocks;
+  };
+
+  const pageCount = () => {
+    const match = new RegExp(pageCountPattern, "i").exec(document.documentElement.outerHTML);
+    return match ? match[0] : null;
+  };
+
+  const studentList = () => {
+    if (isNullData()) {
+      return { students: [], page_count: pageCount() };
+    }
+    const submitTime = new RegExp(submitTimePattern);
+    const students = [];
+    for (const row of all(document, "ul.dataBody_td")) {
+      const nameDiv = first(row, "div.py_name");
+      const reviewLink = first(row, "a.cz_py");
+      if (!nameDiv || !reviewLink || !reviewLink.hasAttribute("data")) {
+        continue;
+      }
+      const rowText = strippedText(row, " ");
+      const time = submitTime.exec(rowText);
+      students.push({
+        name: strip(text(nameDiv)),
+        review_url: "https://mooc2-ans.chaoxing.com" + reviewLink.getAttribute("data").split("&amp;").join("&"),
+        submit_time: time ? time[0] : "",
+        status: statusKeywords.find((keyword) => rowText.includes(keyword)) || "",
+      });
+    }
+    return { students, page_count: pageCount() };
+  };
+
+  const homeworkList = () => {
+    const fields = [];
+    if (!isNullData()) {
+      for (const item of all(document, 'li[id^="work"]')) {
+        const classDiv = first(item, "div.list_class");
+        const title = first(item, "h2.list_li_tit");
+        const reviewLink = first(item, "a.piyueBtn");
+        if (!classDiv || !title || !reviewLink || !reviewLink.hasAttribute("href")) {
+          continue;
+        }
+        const timeP = first(item, "p.list_li_time");
+        const timeSpan = timeP ? first(timeP, "span") : null;
+        const pending = first(item, "em.fs28");
+        fields.push({
+          class_name: strip(classDiv.getAttribute("title") || ""),
+          homework_name: strip(text(title)),
+          answer_time: timeSpan ? strip(text(timeSpan)) : "",
+          pending: pending ? strip(text(pending)) : null,
+          review_href: reviewLink.getAttribute("href"),
+        });
+      }
+    }
+    return { fields, page_count: pageCount() };
+  };
+
+  const extractors = {
+    student_answers: studentAnswers,
+    answer_blocks: answerBlocks,
+    student_list: studentList,
+    homework_list: homeworkList,
+  };
+  return extractors[kind]();
+};
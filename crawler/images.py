@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+from utils.image_store import ImageStore
+from utils.stats import format_counters
+
+from .backends import FetchResponse
+
+DEFAULT_MAX_IMAGE_BYTES = 20 * 1024 * 1024
+
+ImageFetch = Callable[[str], Awaitable[FetchResponse]]
+
+
+def image_references(answers: Iterable[Dict[str, Any]]) -> List[str]:
+    """Return every image reference of parsed answers, stems and reference answers included."""
+    references: List[str] = []
+    for item in answers:
+        for key in ("description", "correct_answer", "student_answer"):
+            content = item.get(key)
+            if isinstance(content, dict):
+                references.extend(content.get("images") or [])
+    return references
+
+
+class ImagePrefetcher:
+    """Copy answer images into the shared ``ImageStore`` while the session is valid."""
+
+    def __init__(self, store: ImageStore, max_bytes: int = DEFAULT_MAX_IMAGE_BYTES) -> None:
+        self.store = store
+        self.max_bytes = max_bytes
+        self.stats: Dict[str, int] = {"fetched": 0, "decoded": 0, "stored": 0, "failed": 0}
+        self._seen: Set[str] = set()
+
+    async def prefetch(self, references: Iterable[str], base_url: str, fetch: ImageFetch) -> None:
+        """Store every reference not seen before in this crawl, concurrently."""
+        pending = []
+        for reference in references:
+            if not reference or reference in self._seen:
+                continue
+            self._seen.add(reference)
+            pending.append(reference)
+        if pending:
+            await asyncio.gather(*[self._store(reference, base_url, fetch) for reference in pending])
+
+    async def _store(self, reference: str, base_url: str, fetch: ImageFetch) -> None:
+        if self.store.lookup(reference):
+            return
+        decoded = ImageStore.decode_data_uri(reference)
+        if decoded is not None:
+            data, content_type = decoded
+            self.stats["decoded"] += 1
+        elif reference.startswith("data:"):
+            return
+        else:
+            content = await self._fetch(urljoin(base_url, reference), fetch)
+            if content is None:
+                self.stats["failed"] += 1
+                return
+            data, content_type = content
+            self.stats["fetched"] += 1
+        key, new = self.store.put(data, content_type)
+        self.store.link(reference, key)
+        if new:
+            self.stats["stored"] += 1
+
+    async def _fetch(self, url: str, fetch: ImageFetch) -> Optional[Tuple[bytes, str]]:
+        try:
+            response = await fetch(url)
+        except Exception as exc:
+            logging.warning("Failed to prefetch image: %s", exc)
+            return None
+        content_type = response.headers.get("content-type", "")
+        if not response.ok or not content_type.startswith("image/"):
+            logging.warning("Failed to prefetch image: HTTP %s (%s)", response.status, content_type)
+            return None
+        if len(response.body) > self.max_bytes:
+            logging.warning("Skipping image larger than %s bytes", self.max_bytes)
+            return None
+        return response.body, content_type
+
+    def summary(self) -> str:
+        """Return the counters formatted for logging."""
+        return format_counters(self.stats)
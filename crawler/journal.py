@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+JOURNAL_FILE = "answers.jsonl"
+
+
+class AnswerJournal:
+    """Append-only JSONL record of one homework's fetched answers."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._handle: Optional[IO[str]] = None
+        self.has_questions = False
+
+    def load(self) -> Dict[str, Dict[str, str]]:
+        """Return the fingerprint of every student already journaled."""
+        fingerprints: Dict[str, Dict[str, str]] = {}
+        self.has_questions = False
+        for record in self._records():
+            if record.get("type") == "questions":
+                self.has_questions = True
+            elif record.get("type") == "student":
+                fingerprints[record["name"]] = record.get("meta", {})
+        return fingerprints
+
+    def write_questions(self, questions: List[Dict[str, Any]]) -> None:
+        """Record the stems and reference answers once per homework."""
+        if self.has_questions:
+            return
+        self._append({"type": "questions", "questions": questions})
+        self.has_questions = True
+
+    def write_student(
+        self,
+        name: str,
+        meta: Dict[str, str],
+        answers: List[Any],
+        attachments: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    ) -> None:
+        """Record one student's answers in question order, with attachment records per question."""
+        record: Dict[str, Any] = {"type": "student", "name": name, "meta": meta, "answers": answers}
+        if attachments:
+            record["attachments"] = attachments
+        self._append(record)
+
+    def questions(self) -> List[Dict[str, Any]]:
+        """Return the journaled stems and reference answers."""
+        for record in self._records():
+            if record.get("type") == "questions":
+                return record["questions"]
+        return []
+
+    def students(
+        self,
+        names: List[str],
+    ) -> Iterator[Tuple[str, Dict[str, str], List[Any], Dict[str, List[Dict[str, Any]]]]]:
+        """Yield the latest record of each named student, in the order given."""
+        offsets = self._latest_offsets()
+        with open(self.path, "rb") as handle:
+            for name in names:
+                if name not in offsets:
+                    continue
+                handle.seek(offsets[name])
+                record = json.loads(handle.readline())
+                yield name, record.get("meta", {}), record["answers"], record.get("attachments", {})
+
+    def close(self) -> None:
+        """Close the append handle."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def remove(self) -> None:
+        """Delete the journal once its contents are safely assembled."""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._truncate_partial_line()
+            self._handle = open(self.path, "a", encoding="utf-8")
+        self._handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._handle.flush()
+
+    def _truncate_partial_line(self) -> None:
+        """Drop a half-written last line left by a crash, so appends stay valid."""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb+") as handle:
+            data = handle.read()
+            if data and not data.endswith(b"\n"):
+                handle.truncate(data.rfind(b"\n") + 1)
+
+    def _records(self) -> Iterator[Dict[str, Any]]:
+        for _, record in self._scan():
+            yield record
+
+    def _latest_offsets(self) -> Dict[str, int]:
+        return {
+            record["name"]: offset
+            for offset, record in self._scan()
+            if record.get("type") == "student"
+        }
+
+    def _scan(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as handle:
+            offset = handle.tell()
+            line = handle.readline()
+            while line:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logging.warning("Ignoring truncated answer journal record")
+                else:
+                    yield offset, record
+                offset = handle.tell()
+                line = handle.readline()
+
+
+def write_answer_file(
+    journal: AnswerJournal,
+    names: List[str],
+    answer_path: Path,
+    meta_path: Path,
+) -> int:
+    """Stream ``answer.json`` and the student metadata from the journal; return the student count."""
+    questions = journal.questions()
+    tmp_path = answer_path.with_name(answer_path.name + ".tmp")
+    meta: Dict[str, Dict[str, str]] = {}
+    attachments: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        stems = {
+            f"题目{index}": {"题干": question["description"], "正确答案": question["correct_answer"]}
+            for index, question in enumerate(questions, 1)
+        }
+        handle.write('{\n  "题目": ' + _indented(stems, 2) + ',\n  "学生回答": {')
+        for name, student_meta, answers, student_attachments in journal.students(names):
+            entry = {
+                f"题目{index}": answer
+                for index, answer in enumerate(answers[: len(questions)], 1)
+            }
+            handle.write(("," if meta else "") + f"\n    {json.dumps(name, ensure_ascii=False)}: ")
+            handle.write(_indented(entry, 4))
+            meta[name] = student_meta
+            if student_attachments:
+                attachments[name] = student_attachments
+        handle.write("\n  }" if meta else "}")
+        if attachments:
+            handle.write(',\n  "附件": ' + _indented(attachments, 2))
+        handle.write("\n}")
+    os.replace(tmp_path, answer_path)
+    with open(meta_path, "w", encoding="utf-8") as handle:
+        json.dump(meta, handle, ensure_ascii=False, indent=2)
+    return len(meta)
+
+
+def _indented(value: Any, indent: int) -> str:
+    """Dump value with indent=2, shifting continuation lines to sit at ``indent``."""
+    return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n" + " " * indent)
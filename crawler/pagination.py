@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from .retry import FetchError, is_retryable_exception
+
+T = TypeVar("T")
+P = TypeVar("P")
+
+PAGE_COUNT_PATTERN = re.compile(
+    r"""(?:totalPages?|pageCount|pageTotal|allPages?)["']?\s*[:=]\s*["']?(\d+)""",
+    re.IGNORECASE,
+)
+
+
+def extract_page_count(html: str) -> Optional[int]:
+    """Return the total page count advertised by a list page, if any."""
+    match = PAGE_COUNT_PATTERN.search(html or "")
+    if not match:
+        return None
+    count = int(match.group(1))
+    return count if count > 0 else None
+
+
+def with_page(url: str, page_num: int, page_size: Optional[int] = None) -> str:
+    """Return the URL with its ``pages`` (and optionally ``size``) parameter replaced."""
+    parsed = urlparse(url)
+    params = parse_qsl(parsed.query, keep_blank_values=True)
+    overrides = {"pages": str(page_num)}
+    if page_size:
+        overrides["size"] = str(page_size)
+    query = [(key, overrides.pop(key, value)) for key, value in params]
+    query.extend(overrides.items())
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+async def fetch_all_pages(
+    fetch_html: Callable[[int], Awaitable[P]],
+    parse: Callable[[P], Awaitable[List[T]]],
+    max_concurrent: Optional[int] = None,
+    failed_pages: Optional[List[int]] = None,
+    page_count: Callable[[Any], Optional[int]] = extract_page_count,
+) -> List[T]:
+    """Fetch and parse every page of a paginated list concurrently."""
+    first_html = await fetch_html(1)
+    first_items = await parse(first_html)
+    if not first_items:
+        return []
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrent)) if max_concurrent else None
+
+    async def fetch_and_parse(page_num: int) -> Optional[List[T]]:
+        try:
+            html = await fetch_html(page_num)
+        except Exception as exc:
+            if not isinstance(exc, FetchError) and not is_retryable_exception(exc):
+                raise
+            logging.error("List page %s failed permanently; results are incomplete: %s", page_num, exc)
+            if failed_pages is not None:
+                failed_pages.append(page_num)
+            return None
+        return await parse(html)
+
+    async def load(page_num: int) -> Optional[List[T]]:
+        if semaphore is None:
+            return await fetch_and_parse(page_num)
+        async with semaphore:
+            return await fetch_and_parse(page_num)
+
+    pages: Dict[int, List[T]] = {1: first_items}
+    total_pages = page_count(first_html)
+    next_page = 2
+    batch = total_pages - 1 if total_pages and total_pages > 1 else 1
+    while True:
+        page_nums = list(range(next_page, next_page + batch))
+        results = await asyncio.gather(*[load(page_num) for page_num in page_nums])
+        if all(items is None for items in results):
+            return [item for num in sorted(pages) for item in pages[num]]
+        for page_num, items in zip(page_nums, results):
+            if items is None:
+                continue
+            if not items:
+                return [item for num in sorted(pages) for item in pages[num]]
+            pages[page_num] = items
+        next_page += batch
+        batch = 1 if total_pages else batch * 2
+        total_pages = None
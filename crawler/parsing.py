@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, TypeVar
+from urllib.parse import unquote, urlparse
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from utils.tools import sanitize_folder_name
+
+T = TypeVar("T")
+
+DEFAULT_PARSER = "html.parser"
+
+SUBMIT_TIME_PATTERN = re.compile(r"\d{4}-\d{1,2}-\d{1,2}\s+\d{1,2}:\d{2}(?::\d{2})?")
+STATUS_KEYWORDS = ("待批阅", "已批阅", "已完成", "待重做", "已打回", "已退回", "未提交", "未交")
+
+# Partial-parse filters: only the subtrees the parsers read are built.
+HOMEWORK_LIST_STRAINER = SoupStrainer("li", id=re.compile(r"^work"))
+CLASS_LIST_STRAINER = SoupStrainer("li", class_="classli")
+STUDENT_LIST_STRAINER = SoupStrainer("ul", class_="dataBody_td")
+REVIEW_STRAINER = SoupStrainer("div", class_="mark_item1")
+ANSWER_STRAINER = SoupStrainer("dl", id=re.compile(r"^stuanswer_"))
+NULL_DATA_STRAINER = SoupStrainer("div", class_="nullData")
+
+# Links in a student answer that point at uploaded files rather than pages.
+ATTACHMENT_EXTENSIONS = frozenset(
+    {
+        ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".txt", ".md", ".csv",
+        ".zip", ".rar", ".7z", ".tar", ".gz", ".py", ".ipynb", ".c", ".cpp", ".h", ".java",
+        ".js", ".sql", ".m", ".r",
+    }
+)
+
+
+class ParserPool:
+    """Run module-level parse functions in a process pool, or inline with no workers."""
+
+    def __init__(self, workers: int = 0) -> None:
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Call ``func(*args)`` in the pool, or inline when the pool is disabled."""
+        if self._executor is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def close(self) -> None:
+        """Shut down worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def resolve_parser(name: Optional[str] = None) -> str:
+    """Return a usable BeautifulSoup tree builder name."""
+    name = (name or DEFAULT_PARSER).strip()
+    if name not in ("auto", "lxml"):
+        return name
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        if name == "lxml":
+            logging.warning("lxml is not installed; using %s", DEFAULT_PARSER)
+        return DEFAULT_PARSER
+    return "lxml"
+
+
+def make_soup(
+    html: str,
+    parser: str = DEFAULT_PARSER,
+    parse_only: Optional[SoupStrainer] = None,
+) -> BeautifulSoup:
+    """Parse HTML with the given backend, optionally building only matching subtrees."""
+    return BeautifulSoup(html, parser, parse_only=parse_only)
+
+
+def is_null_data(html: str, parser: str = DEFAULT_PARSER) -> bool:
+    """Return True if the page is Chaoxing's "暂无数据" placeholder."""
+    if "nullData" not in html:
+        return False
+    null_data = make_soup(html, parser, NULL_DATA_STRAINER).find("div", class_="nullData")
+    return bool(null_data and "暂无数据" in null_data.text)
+
+
+def extract_content(element: Any) -> Dict[str, List[str]]:
+    """Collect paragraph text and image sources from an answer or stem element."""
+    if not element:
+        return {"text": [], "images": []}
+
+    for br in element.find_all("br"):
+        if not br.attrs:
+            br.replace_with("\n")
+
+    text_contents: List[str] = []
+    for p in element.find_all("p"):
+        text = p.get_text().strip()
+        if text:
+            text_contents.append(text)
+
+    combined_text = ["\n".join(text_contents)] if text_contents else []
+    images = [img["src"] for img in element.find_all("img") if "src" in img.attrs]
+    return {"text": combined_text, "images": images}
+
+
+def extract_attachments(element: Any) -> List[Dict[str, str]]:
+    """Collect uploaded-file links (documents, archives, code) from an answer element."""
+    if not element:
+        return []
+    attachments: List[Dict[str, str]] = []
+    seen: Set[str] = set()
+    for link in element.find_all("a", href=True):
+        href = link["href"].strip()
+        if not href or href.startswith(("javascript:", "#", "mailto:")) or href in seen:
+            continue
+        path = unquote(urlparse(href).path)
+        extension = os.path.splitext(path)[1].lower()
+        if not (link.has_attr("download") or extension in ATTACHMENT_EXTENSIONS or "/download" in path):
+            continue
+        seen.add(href)
+        name = (
+            link.get("download")
+            or link.get("title")
+            or link.get_text(strip=True)
+            or os.path.basename(path)
+            or "attachment"
+        )
+        attachments.append({"name": name, "url": href})
+    return attachments
+
+
+def parse_class_id_map(html: str, parser: str = DEFAULT_PARSER) -> Dict[str, str]:
+    """Parse class name to ID mapping from HTML."""
+    class_map: Dict[str, str] = {}
+    soup = make_soup(html, parser, CLASS_LIST_STRAINER)
+    for item in soup.select("li.classli"):
+        name = item.get("title", "").strip()
+        class_id = item.get("data", "")
+        if name and class_id:
+            class_map[name] = class_id
+    return class_map
+
+
+def parse_homework_list(
+    html: str,
+    parser: str = DEFAULT_PARSER,
+    homework_name_list: Optional[List[str]] = None,
+    min_ungraded: Optional[int] = 0,
+) -> List[Dict[str, Any]]:
+    """Parse homework tasks from list HTML."""
+    return select_homework_tasks(parse_homework_fields(html, parser), homework_name_list, min_ungraded)
+
+
+def parse_homework_fields(html: str, parser: str = DEFAULT_PARSER) -> List[Dict[str, Any]]:
+    """Parse the raw fields of every homework list item, before tasks are built."""
+    fields: List[Dict[str, Any]] = []
+    if is_null_data(html, parser):
+        return fields
+
+    soup = make_soup(html, parser, HOMEWORK_LIST_STRAINER)
+    for item in soup.find_all("li", id=lambda x: x and x.startswith("work")):
+        item_fields = work_item_fields(item)
+        if item_fields:
+            fields.append(item_fields)
+    return fields
+
+
+def select_homework_tasks(
+    fields: List[Dict[str, Any]],
+    homework_name_list: Optional[List[str]] = None,
+    min_ungraded: Optional[int] = 0,
+) -> List[Dict[str, Any]]:
+    """Build homework tasks from list item fields, keeping those the filters select."""
+    tasks: List[Dict[str, Any]] = []
+    for item_fields in fields:
+        task = build_work_task(item_fields)
+        if not task:
+            continue
+        if homework_name_list and task["作业名"] not in homework_name_list:
+            continue
+        if min_ungraded is not None and int(min_ungraded) >= 0:
+            if task.get("pending_count", 0) <= int(min_ungraded):
+                continue
+        tasks.append(task)
+    return tasks
+
+
+def work_item_fields(item: Any) -> Optional[Dict[str, Any]]:
+    """Extract the raw text fields of a list item; None if it is not a reviewable homework."""
+    class_div = item.find("div", class_="list_class")
+    if not class_div:
+        return None
+    title_h2 = item.find("h2", class_="list_li_tit")
+    if not title_h2:
+        return None
+    review_a = item.find("a", class_="piyueBtn")
+    if not review_a or "href" not in review_a.attrs:
+        return None
+
+    time_p = item.find("p", class_="list_li_time")
+    time_span = time_p.find("span") if time_p else None
+    pending_em = item.find("em", class_="fs28")
+    return {
+        "class_name": class_div.get("title", "").strip(),
+        "homework_name": title_h2.text.strip(),
+        "answer_time": time_span.text.strip() if time_span else "",
+        "pending": pending_em.text.strip() if pending_em else None,
+        "review_href": review_a["href"],
+    }
+
+
+def build_work_task(item_fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Build a homework task from list item fields."""
+    try:
+        try:
+            pending_count = int(item_fields["pending"]) if item_fields["pending"] is not None else 0
+        except ValueError:
+            pending_count = 0
+
+        class_name = item_fields["class_name"]
+        homework_name = item_fields["homework_name"]
+        answer_time = item_fields["answer_time"]
+        save_path = os.path.join(
+            "homework",
+            sanitize_folder_name(class_name),
+            sanitize_folder_name(f"{homework_name}{answer_time}"),
+        )
+        return {
+            "班级": class_name,
+            "作业名": homework_name,
+            "作答时间": answer_time,
+            "作业批阅链接": "https://mooc2-ans.chaoxing.com" + item_fields["review_href"],
+            "save_path": save_path,
+            "pending_count": pending_count,
+        }
+    except Exception as exc:
+        logging.error("Failed to parse homework item: %s", exc)
+        return None
+
+
+def parse_student_list(html: str, parser: str = DEFAULT_PARSER) -> List[Dict[str, str]]:
+    """Parse student names, review URLs, submit times and statuses from a mark-list page."""
+    students: List[Dict[str, str]] = []
+    if is_null_data(html, parser):
+        return students
+
+    soup = make_soup(html, parser, STUDENT_LIST_STRAINER)
+    for ul in soup.find_all("ul", class_="dataBody_td"):
+        name_div = ul.find("div", class_="py_name")
+        if not name_div:
+            continue
+        name = name_div.text.strip()
+        review_a = ul.find("a", class_="cz_py")
+        if not review_a or "data" not in review_a.attrs:
+            continue
+        review_url = "https://mooc2-ans.chaoxing.com" + review_a["data"].replace("&amp;", "&")
+        row_text = ul.get_text(" ", strip=True)
+        time_match = SUBMIT_TIME_PATTERN.search(row_text)
+        status = next((keyword for keyword in STATUS_KEYWORDS if keyword in row_text), "")
+        students.append(
+            {
+                "name": name,
+                "review_url": review_url,
+                "submit_time": time_match.group(0) if time_match else "",
+                "status": status,
+            }
+        )
+    return students
+
+
+def parse_student_answers(html: str, parser: str = DEFAULT_PARSER) -> List[Dict[str, Any]]:
+    """Parse question stems, student answers, reference answers and attachment links from a review page."""
+    answers: List[Dict[str, Any]] = []
+    soup = make_soup(html, parser, REVIEW_STRAINER)
+    for block in soup.find_all("div", class_="mark_item1"):
+        desc_div = block.find("div", class_="hiddenTitle")
+        description = extract_content(desc_div)
+
+        answer_dl = block.find(
+            "dl",
+            class_="mark_fill",
+            id=lambda x: x and x.startswith("stuanswer_"),
+        )
+        student_answer = extract_content(answer_dl)
+        attachments = extract_attachments(answer_dl)
+
+        correct_dl = block.find(
+            "dl",
+            class_="mark_fill",
+            id=lambda x: x and x.startswith("correctanswer_"),
+        )
+        correct_answer = (
+            correct_dl.text.strip().replace("参考答案：", "", 1) if correct_dl else "此题无参考答案"
+        )
+        answers.append(
+            {
+                "description": description,
+                "student_answer": student_answer,
+                "correct_answer": correct_answer,
+                "attachments": attachments,
+                "answer_id": answer_dl["id"] if answer_dl else "",
+            }
+        )
+    return answers
+
+
+def parse_answer_blocks(html: str, parser: str = DEFAULT_PARSER) -> Dict[str, Dict[str, Any]]:
+    """Parse only the student-answer blocks of a review page, keyed by their ``stuanswer_`` id."""
+    soup = make_soup(html, parser, ANSWER_STRAINER)
+    return {
+        answer_dl["id"]: {
+            "student_answer": extract_content(answer_dl),
+            "attachments": extract_attachments(answer_dl),
+        }
+        for answer_dl in soup.find_all("dl", class_="mark_fill", id=lambda x: x and x.startswith("stuanswer_"))
+    }
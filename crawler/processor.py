@@ -1,188 +1,589 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
-from typing import Any, Dict, List, Optional
-
-from bs4 import BeautifulSoup
-from playwright.async_api import BrowserContext
+from pathlib import Path
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from playwright.async_api import Page
+
+from .archive import ARCHIVE_FILE, MARK_LIST, REVIEW, PageArchive
+from .attachments import AttachmentDownloader
+from .backends import FetchBackend, FetchResponse
+from .cache import ResponseCache
+from .client import DEFAULT_CAPTURE_TIMEOUT, CrawlerClient
+from .dom import ANSWER_BLOCKS, STUDENT_ANSWERS, STUDENT_LIST, DomExtractor, list_page_count
+from .images import ImagePrefetcher, image_references
+from .journal import JOURNAL_FILE, AnswerJournal, write_answer_file
+from .pagination import fetch_all_pages, with_page
+from .parsing import (
+    DEFAULT_PARSER,
+    ParserPool,
+    parse_answer_blocks,
+    parse_student_answers,
+    parse_student_list,
+)
+from .retry import FetchError, RetryManager
+from .scheduler import CrawlScheduler, RequestBudget, iterate
+from .session import SessionGuard
+from .state import FAILURE, IN_PROGRESS, SUCCESS
+
+T = TypeVar("T")
+
+ANSWER_FILE = "answer.json"
+STUDENT_META_FILE = "students.json"
+DEFAULT_STUDENT_WORKERS = 10
+
+_EMPTY_ANSWER: Dict[str, Any] = {"student_answer": {"text": [], "images": []}, "attachments": []}
+
+PageSource = Callable[[], AsyncContextManager[Page]]
+StudentStatusCallback = Callable[[str, str], None]
+
+
+class ReviewUrlTemplate:
+    """Rebuild a student's ``review-work`` URL from their mark-list review URL."""
+
+    def __init__(self, base_url: str, params: List[Tuple[str, Optional[str], str]]) -> None:
+        self.base_url = base_url
+        self.params = params
+
+    @classmethod
+    def learn(cls, review_url: str, content_url: str) -> Optional["ReviewUrlTemplate"]:
+        """Learn a template from a review URL and its captured content URL."""
+        review_params = parse_qsl(urlparse(review_url).query, keep_blank_values=True)
+        keys_by_value: Dict[str, List[str]] = {}
+        for key, value in review_params:
+            if value:
+                keys_by_value.setdefault(value, []).append(key)
+
+        parsed = urlparse(content_url)
+        params: List[Tuple[str, Optional[str], str]] = []
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True):
+            sources = keys_by_value.get(value, []) if value else []
+            source: Optional[str] = None
+            if len(sources) == 1:
+                source = sources[0]
+            else:
+                source = next((item for item in sources if item.lower() == key.lower()), None)
+            params.append((key, source, value))
+
+        if not any(source for _, source, _ in params):
+            return None
+        base_url = urlunparse((parsed.scheme, parsed.netloc, parsed.path, "", "", ""))
+        return cls(base_url, params)
+
+    @property
+    def source_keys(self) -> Set[str]:
+        """Return review URL parameters the template depends on."""
+        return {source for _, source, _ in self.params if source}
+
+    def build(self, review_url: str) -> Optional[str]:
+        """Build the content URL for a review URL, or None if a parameter is missing."""
+        review_params = dict(parse_qsl(urlparse(review_url).query, keep_blank_values=True))
+        query: List[Tuple[str, str]] = []
+        for key, source, constant in self.params:
+            if source is None:
+                query.append((key, constant))
+                continue
+            value = review_params.get(source)
+            if not value:
+                return None
+            query.append((key, value))
+        return f"{self.base_url}?{urlencode(query)}"
 
-from .client import CrawlerClient
+    @staticmethod
+    def varying_keys(review_urls: List[str]) -> Set[str]:
+        """Return review URL parameters whose values differ between students."""
+        values: Dict[str, Set[str]] = {}
+        for review_url in review_urls:
+            for key, value in parse_qsl(urlparse(review_url).query, keep_blank_values=True):
+                values.setdefault(key, set()).add(value)
+        return {key for key, seen in values.items() if len(seen) > 1}
 
 
 class HomeworkProcessor:
     """Fetch and format homework answers for all students."""
 
-    def __init__(self, context: BrowserContext, max_concurrent: int = 10) -> None:
-        self.context = context
-        self.max_concurrent = max_concurrent
-
-    async def get_all_students_data(self, grading_url: str) -> Dict[str, List[Dict[str, Any]]]:
-        """Fetch all students' answers for a homework grading URL."""
+    def __init__(
+        self,
+        pages: PageSource,
+        budget: Optional[RequestBudget] = None,
+        retry: Optional[RetryManager] = None,
+        direct_fetch: bool = True,
+        page_size: Optional[int] = None,
+        capture_timeout: int = DEFAULT_CAPTURE_TIMEOUT,
+        backend: Optional[FetchBackend] = None,
+        session_guard: Optional[SessionGuard] = None,
+        cache: Optional[ResponseCache] = None,
+        html_parser: str = DEFAULT_PARSER,
+        parser_pool: Optional[ParserPool] = None,
+        on_student: Optional[StudentStatusCallback] = None,
+        images: Optional[ImagePrefetcher] = None,
+        attachments: Optional[AttachmentDownloader] = None,
+        archive_pages: bool = False,
+        dom: Optional[DomExtractor] = None,
+    ) -> None:
+        self.pages = pages
+        self.budget = budget
+        self.retry = retry
+        self.direct_fetch = direct_fetch
+        self.page_size = page_size
+        self.capture_timeout = capture_timeout
+        self.backend = backend
+        self.session_guard = session_guard
+        self.cache = cache
+        self.html_parser = html_parser
+        self.parser_pool = parser_pool or ParserPool()
+        self.on_student = on_student
+        self.images = images
+        self.attachments = attachments
+        self.archive_pages = archive_pages
+        self.dom = dom
+        self._archive: Optional[PageArchive] = None
+
+        self._review_template: Optional[ReviewUrlTemplate] = None
+        self._template_failed = False
+        self._template_lock = asyncio.Lock()
+        self._varying_keys: Set[str] = set()
+        self._questions: Optional[List[Dict[str, Any]]] = None
+        self.failed_students = 0
+        self.failed_pages: List[int] = []
+
+    async def save_all_students(
+        self,
+        grading_url: str,
+        save_path: Path,
+        incremental: bool = True,
+    ) -> int:
+        """Fetch all students' answers for a homework and save them under ``save_path``."""
+        self._archive = PageArchive(save_path / ARCHIVE_FILE) if self.archive_pages else None
+        try:
+            return await self._save_all_students(grading_url, save_path, incremental)
+        finally:
+            if self._archive is not None:
+                self._archive.close()
+                self._archive = None
+
+    async def _save_all_students(self, grading_url: str, save_path: Path, incremental: bool) -> int:
+        self._questions = None
+        self.failed_students = 0
+        self.failed_pages = []
         students = await self._get_student_list(grading_url)
         if not students:
-            return {}
+            return 0
 
         logging.info("Student list fetched: %s", len(students))
 
-        semaphore = asyncio.Semaphore(self.max_concurrent)
+        journal = AnswerJournal(save_path / JOURNAL_FILE)
+        try:
+            journaled = journal.load()
+            done = set()
+            for student in students:
+                fingerprint = self.student_fingerprint(student)
+                if fingerprint and journaled.get(student["name"]) == fingerprint:
+                    done.add(student["name"])
+            if done:
+                logging.info("Resuming from answer journal: %s students already fetched", len(done))
+            if incremental:
+                done |= self.carry_over_previous(save_path, students, done, journal)
+            for name in done:
+                self._report(name, SUCCESS)
+
+            await self._fetch_students([student for student in students if student["name"] not in done], journal)
+            names = [student["name"] for student in students]
+            if self.failed_pages:
+                # Students on the failed mark-list pages keep their previous answers.
+                listed = set(names)
+                kept = self.keep_previous(save_path, journal, lambda name: name not in listed)
+                if kept:
+                    logging.warning("Keeping %s students from unlisted pages as previously saved", len(kept))
+                names += kept
+            if not journal.has_questions:
+                return 0
+            saved = write_answer_file(
+                journal,
+                names,
+                save_path / ANSWER_FILE,
+                save_path / STUDENT_META_FILE,
+            )
+        finally:
+            journal.close()
 
-        async def fetch_with_limit(student: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
-            async with semaphore:
-                return await self._get_student_answers(student)
+        if self.failed_students or self.failed_pages:
+            logging.warning("Keeping answer journal to resume %s failed students", self.failed_students)
+        else:
+            journal.remove()
+        logging.info("Student data collected: %s", saved)
+        return saved
 
-        results = await asyncio.gather(
-            *[fetch_with_limit(student) for student in students],
-            return_exceptions=True,
+    async def _fetch_students(self, students: List[Dict[str, str]], journal: AnswerJournal) -> None:
+        """Fetch answers for the given students, journaling each one as it arrives."""
+        if not students:
+            return
+
+        self._reset_template([student["review_url"] for student in students])
+
+        async def fetch(item: Tuple[int, Dict[str, str]]) -> bool:
+            student = item[1]
+            self._report(student["name"], IN_PROGRESS)
+            try:
+                answers = await self._get_student_answers(student)
+                attachments = await self._download_attachments(student, answers or [])
+            except Exception:
+                self._report(student["name"], FAILURE)
+                raise
+            if not answers:
+                self._report(student["name"], FAILURE)
+                return False
+            journal.write_questions(
+                [
+                    {"description": item["description"], "correct_answer": item["correct_answer"]}
+                    for item in answers
+                ]
+            )
+            journal.write_student(
+                student["name"],
+                self.student_fingerprint(student),
+                [item["student_answer"] for item in answers],
+                attachments,
+            )
+            self._report(student["name"], SUCCESS)
+            if self.images is not None:
+                await self.images.prefetch(
+                    image_references(answers), student["review_url"], self._fetch_image
+                )
+            return True
+
+        workers = self.budget.limit if self.budget else DEFAULT_STUDENT_WORKERS
+        scheduler: CrawlScheduler[Tuple[int, Dict[str, str]]] = CrawlScheduler(
+            workers, priority=lambda item: item[0], queue_size=workers
         )
-
-        student_data: Dict[str, List[Dict[str, Any]]] = {}
-        for idx, result in enumerate(results):
-            student_name = students[idx]["name"]
+        results = await scheduler.run(iterate(list(enumerate(students, 1))), fetch)
+        for (idx, _), result in results:
             if isinstance(result, Exception):
-                logging.error("Failed to fetch student data for index %s: %s", idx + 1, result)
-            elif result:
-                student_data[student_name] = result
-        logging.info("Student data collected: %s", len(student_data))
-        return student_data
+                self.failed_students += 1
+                logging.error("Failed to fetch student data for index %s: %s", idx, result)
+
+    async def _download_attachments(
+        self,
+        student: Dict[str, str],
+        answers: List[Dict[str, Any]],
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Download the files linked from a student's answers; return records per question key."""
+        if self.attachments is None:
+            return {}
+        links = {
+            f"题目{index}": item["attachments"]
+            for index, item in enumerate(answers, 1)
+            if item.get("attachments")
+        }
+        if not links:
+            return {}
+        return await self.attachments.download_all(links, student["review_url"], self._download_file)
+
+    def _report(self, name: str, status: str) -> None:
+        if self.on_student is not None:
+            self.on_student(name, status)
+
+    @staticmethod
+    def student_fingerprint(student: Dict[str, str]) -> Dict[str, str]:
+        """Return the mark-list fields that change when a submission changes."""
+        return {key: student[key] for key in ("submit_time", "status") if student.get(key)}
+
+    @classmethod
+    def carry_over_previous(
+        cls,
+        previous_dir: Path,
+        students: List[Dict[str, str]],
+        done: Set[str],
+        journal: AnswerJournal,
+    ) -> Set[str]:
+        """Journal unchanged students from an earlier ``answer.json``; return their names."""
+        previous = _PreviousResults.load(previous_dir)
+        if previous is None:
+            return set()
+
+        carried: Set[str] = set()
+        for student in students:
+            name = student["name"]
+            fingerprint = cls.student_fingerprint(student)
+            if name in done or not fingerprint or fingerprint != previous.meta.get(name):
+                continue
+            if previous.journal_student(name, journal):
+                carried.add(name)
+        logging.info(
+            "Delta crawl: %s/%s students new or changed", len(students) - len(carried), len(students)
+        )
+        return carried
+
+    @staticmethod
+    def keep_previous(previous_dir: Path, journal: AnswerJournal, keep: Callable[[str], bool]) -> List[str]:
+        """Journal students from an earlier ``answer.json`` as they were, if ``keep(name)``."""
+        previous = _PreviousResults.load(previous_dir)
+        if previous is None:
+            return []
+        return [name for name in previous.answers if keep(name) and previous.journal_student(name, journal)]
 
     async def _get_student_list(self, grading_url: str) -> List[Dict[str, str]]:
         students: List[Dict[str, str]] = []
-        page = await self.context.new_page()
-        client = CrawlerClient(page)
-        try:
-            await client.setup_response_capture(["mooc2-ans/work/mark-list"])
-            await client.goto(grading_url)
-            await page.wait_for_timeout(2000)
-
-            mark_list_url = client.get_captured_url("mooc2-ans/work/mark-list")
+        async with self.pages() as page:
+            client = CrawlerClient(
+                page, self.backend, self.session_guard, self.cache, self.budget, self.retry
+            )
+            mark_list_url = await client.capture_url(
+                grading_url, "mooc2-ans/work/mark-list", self.capture_timeout
+            )
             if not mark_list_url:
                 logging.error("Failed to capture student list URL")
                 return students
 
-            page_num = 1
-            paginated_url = mark_list_url.replace("pages=1", "pages={}")
-            while True:
-                url = paginated_url.format(page_num)
+            async def fetch_page(page_num: int) -> Any:
+                url = with_page(mark_list_url, page_num, self.page_size)
+                if self.dom is not None and self.dom.enabled(STUDENT_LIST):
+                    extracted = await self.dom.load(
+                        STUDENT_LIST,
+                        lambda: client.extract(url, lambda loaded: self.dom.extract(loaded, STUDENT_LIST)),
+                        lambda: client.fetch_html(url),
+                    )
+                    if extracted is not None:
+                        return extracted
                 html = await client.fetch_html(url)
-                page_students = self._parse_student_list(html)
-                if not page_students:
-                    break
-                students.extend(page_students)
-                page_num += 1
-        finally:
-            await page.close()
+                if self._archive is not None:
+                    self._archive.add(MARK_LIST, url, html, page=page_num)
+                return html
+
+            students = await fetch_all_pages(
+                fetch_page,
+                self._parse_student_list,
+                failed_pages=self.failed_pages,
+                page_count=list_page_count,
+            )
+            if self.failed_pages:
+                logging.error("Student list incomplete: %s mark-list pages failed", len(self.failed_pages))
         return students
 
-    def _parse_student_list(self, html: str) -> List[Dict[str, str]]:
-        students: List[Dict[str, str]] = []
-        soup = BeautifulSoup(html, "html.parser")
-
-        null_data = soup.find("div", class_="nullData")
-        if null_data and "暂无数据" in null_data.text:
-            return students
+    async def _parse_student_list(self, page: Any) -> List[Dict[str, str]]:
+        if not isinstance(page, str):
+            return page["students"]
+        return await self.parser_pool.run(parse_student_list, page, self.html_parser)
 
-        for ul in soup.find_all("ul", class_="dataBody_td"):
-            name_div = ul.find("div", class_="py_name")
-            if not name_div:
-                continue
-            name = name_div.text.strip()
-            review_a = ul.find("a", class_="cz_py")
-            if not review_a or "data" not in review_a.attrs:
-                continue
-            review_url = "https://mooc2-ans.chaoxing.com" + review_a["data"].replace("&amp;", "&")
-            students.append({"name": name, "review_url": review_url})
-        return students
+    def _reset_template(self, review_urls: List[str]) -> None:
+        self._review_template = None
+        self._template_failed = not self.direct_fetch
+        self._varying_keys = ReviewUrlTemplate.varying_keys(review_urls)
 
     async def _get_student_answers(self, student: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
         review_url = student["review_url"]
-        page = await self.context.new_page()
-        client = CrawlerClient(page)
+        templated = False
+        if not self._template_failed:
+            content_url, templated = await self._resolve_content_url(review_url)
+        else:
+            content_url = await self._capture_content_url(review_url)
+        if not content_url:
+            logging.warning("Failed to capture review content URL")
+            return None
+        if not templated:
+            return await self._load_student_answers(review_url, content_url)
+
+        answers: Optional[List[Dict[str, Any]]] = None
         try:
-            await client.setup_response_capture(["review-work"])
-            await client.goto(review_url)
-            await page.wait_for_timeout(2000)
-
-            content_url = client.get_captured_url("review-work")
-            if not content_url:
-                logging.warning("Failed to capture review content URL")
-                return None
-
-            html = await client.fetch_html(content_url)
-            return self._parse_student_answers(html)
-        finally:
-            await page.close()
-
-    def _parse_student_answers(self, html: str) -> List[Dict[str, Any]]:
-        answers: List[Dict[str, Any]] = []
-        soup = BeautifulSoup(html, "html.parser")
-        for block in soup.find_all("div", class_="mark_item1"):
-            desc_div = block.find("div", class_="hiddenTitle")
-            description = self._extract_content(desc_div)
-
-            answer_dl = block.find(
-                "dl",
-                class_="mark_fill",
-                id=lambda x: x and x.startswith("stuanswer_"),
+            answers = await self._load_student_answers(review_url, content_url)
+        except FetchError as exc:
+            logging.warning("Templated review URL was rejected (%s); navigating instead", exc)
+        else:
+            if answers:
+                return answers
+            logging.warning("Templated review URL returned no answers; navigating instead")
+
+        content_url = await self._capture_content_url(review_url)
+        if not content_url:
+            return answers
+        navigated = await self._load_student_answers(review_url, content_url)
+        if navigated and not self._template_failed:
+            self._template_failed = True
+            logging.warning("Review URL template does not match this homework; navigating for the rest")
+        return navigated
+
+    async def _load_student_answers(self, review_url: str, content_url: str) -> List[Dict[str, Any]]:
+        """Read a student's answers from their review content page."""
+        if self.dom is not None and self.dom.enabled(STUDENT_ANSWERS):
+            answers = await self.dom.load(
+                STUDENT_ANSWERS,
+                lambda: self._with_client(
+                    lambda client: client.extract(content_url, self._extract_student_answers)
+                ),
+                lambda: self._fetch_html(content_url),
             )
-            student_answer = self._extract_content(answer_dl)
-
-            correct_dl = block.find(
-                "dl",
-                class_="mark_fill",
-                id=lambda x: x and x.startswith("correctanswer_"),
+            if answers is not None:
+                return answers
+        html = await self._fetch_html(content_url)
+        self._archive_review(review_url, content_url, html)
+        return await self._parse_student_answers(html)
+
+    def _archive_review(self, review_url: str, content_url: str, html: str) -> None:
+        if self._archive is not None:
+            self._archive.add(REVIEW, content_url, html, review_url=review_url)
+
+    async def _resolve_content_url(self, review_url: str) -> Tuple[Optional[str], bool]:
+        """Return the content URL and whether it was built from the learned template."""
+        if self._review_template is None and not self._template_failed:
+            async with self._template_lock:
+                if self._review_template is None and not self._template_failed:
+                    content_url = await self._capture_content_url(review_url)
+                    if content_url:
+                        self._learn_template(review_url, content_url)
+                    return content_url, False
+
+        if self._review_template is not None and not self._template_failed:
+            content_url = self._review_template.build(review_url)
+            if content_url:
+                return content_url, True
+        return await self._capture_content_url(review_url), False
+
+    def _learn_template(self, review_url: str, content_url: str) -> None:
+        template = ReviewUrlTemplate.learn(review_url, content_url)
+        if template and (not self._varying_keys or template.source_keys & self._varying_keys):
+            self._review_template = template
+            logging.info("Review URL template learned; fetching answers without navigation")
+        else:
+            self._template_failed = True
+            logging.warning("Review URL template unavailable; falling back to page navigation")
+
+    async def _fetch_html(self, url: str) -> str:
+        return await self._with_client(lambda client: client.fetch_html(url))
+
+    async def _fetch_image(self, url: str) -> FetchResponse:
+        return await self._with_client(lambda client: client.fetch(url, kind="download"))
+
+    async def _download_file(self, url: str, save_path: str, max_bytes: int) -> int:
+        return await self._with_client(lambda client: client.download_file(url, save_path, max_bytes))
+
+    async def _with_client(self, call: Callable[[CrawlerClient], Awaitable[T]]) -> T:
+        """Run ``call`` on a client over the shared backend, or a briefly borrowed page's request API."""
+        if self.backend is not None:
+            client = CrawlerClient(
+                backend=self.backend,
+                session_guard=self.session_guard,
+                cache=self.cache,
+                budget=self.budget,
+                retry=self.retry,
+            )
+            return await call(client)
+        async with self.pages() as page:
+            client = CrawlerClient(
+                page,
+                session_guard=self.session_guard,
+                cache=self.cache,
+                budget=self.budget,
+                retry=self.retry,
             )
-            correct_answer = (
-                correct_dl.text.strip().replace("参考答案：", "", 1) if correct_dl else "此题无参考答案"
+            return await call(client)
+
+    async def _capture_content_url(self, review_url: str) -> Optional[str]:
+        """Navigate to a review page and capture its ``review-work`` request URL."""
+        async with self.pages() as page:
+            client = CrawlerClient(
+                page, session_guard=self.session_guard, budget=self.budget, retry=self.retry
             )
-            answers.append(
+            return await client.capture_url(review_url, "review-work", self.capture_timeout)
+
+    async def _parse_student_answers(self, html: str) -> List[Dict[str, Any]]:
+        """Parse a review page, reusing the homework's stems after the first full parse."""
+        answers = await self._read_answers(
+            lambda: self.parser_pool.run(parse_answer_blocks, html, self.html_parser),
+            lambda: self.parser_pool.run(parse_student_answers, html, self.html_parser),
+        )
+        return answers or []
+
+    async def _extract_student_answers(self, page: Page) -> Optional[List[Dict[str, Any]]]:
+        """Read a loaded review page in the browser, reusing stems like ``_parse_student_answers``."""
+        return await self._read_answers(
+            lambda: self.dom.extract(page, ANSWER_BLOCKS),
+            lambda: self.dom.extract(page, STUDENT_ANSWERS),
+        )
+
+    async def _read_answers(
+        self,
+        read_blocks: Callable[[], Awaitable[Optional[Dict[str, Dict[str, Any]]]]],
+        read_all: Callable[[], Awaitable[Optional[List[Dict[str, Any]]]]],
+    ) -> Optional[List[Dict[str, Any]]]:
+        questions = self._questions
+        if questions is not None:
+            blocks = await read_blocks()
+            if blocks is not None:
+                known = {question["answer_id"] for question in questions if question["answer_id"]}
+                if known and known == set(blocks):
+                    return [
+                        {**question, **blocks.get(question["answer_id"], _EMPTY_ANSWER)}
+                        for question in questions
+                    ]
+                logging.debug("Review page does not match the homework's stems; reading it in full")
+
+        answers = await read_all()
+        if answers and questions is None:
+            self._questions = [
                 {
-                    "description": description,
-                    "student_answer": student_answer,
-                    "correct_answer": correct_answer,
+                    "description": item["description"],
+                    "correct_answer": item["correct_answer"],
+                    "answer_id": item["answer_id"],
                 }
-            )
+                for item in answers
+            ]
         return answers
 
-    def _extract_content(self, element: Any) -> Dict[str, List[str]]:
-        if not element:
-            return {"text": [], "images": []}
-
-        text_contents: List[str] = []
-        for p in element.find_all("p"):
-            html_content = str(p).replace("<br>", "\n").replace("<br/>", "\n")
-            text = BeautifulSoup(html_content, "html.parser").get_text().strip()
-            if text:
-                text_contents.append(text)
-
-        combined_text = ["\n".join(text_contents)] if text_contents else []
-        images = [img["src"] for img in element.find_all("img") if "src" in img.attrs]
-        return {"text": combined_text, "images": images}
-
-    def format_results(self, student_data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
-        """Format student answers into the grader-compatible schema."""
-        result: Dict[str, Any] = {"题目": {}, "学生回答": {}}
-        if not student_data:
-            return result
-
-        student_names = list(student_data.keys())
-        if not student_names:
-            return result
-
-        for student_name in student_names:
-            result["学生回答"][student_name] = {}
-
-        first_student = student_names[0]
-        questions = student_data[first_student]
-
-        for index, question in enumerate(questions, 1):
-            key = f"题目{index}"
-            result["题目"][key] = {
-                "题干": question["description"],
-                "正确答案": question["correct_answer"],
-            }
-            for student_name in student_names:
-                answers = student_data.get(student_name, [])
-                if index - 1 < len(answers):
-                    result["学生回答"][student_name][key] = answers[index - 1]["student_answer"]
-        return result
+
+class _PreviousResults:
+    """``answer.json`` with its student metadata and attachment records from an earlier crawl."""
+
+    def __init__(
+        self,
+        questions: List[Tuple[str, Dict[str, Any]]],
+        answers: Dict[str, Dict[str, Any]],
+        meta: Dict[str, Dict[str, str]],
+        attachments: Dict[str, Any],
+    ) -> None:
+        self.questions = questions
+        self.answers = answers
+        self.meta = meta
+        self.attachments = attachments
+
+    @classmethod
+    def load(cls, previous_dir: Path) -> Optional["_PreviousResults"]:
+        """Load the results saved in ``previous_dir``; None if missing or unreadable."""
+        answer_file = previous_dir / ANSWER_FILE
+        meta_file = previous_dir / STUDENT_META_FILE
+        if not answer_file.exists() or not meta_file.exists():
+            return None
+        try:
+            with open(answer_file, "r", encoding="utf-8") as handle:
+                result = json.load(handle)
+            with open(meta_file, "r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+        except (OSError, ValueError) as exc:
+            logging.warning("Failed to load previous results; crawling all students: %s", exc)
+            return None
+        return cls(
+            list(result.get("题目", {}).items()), result.get("学生回答", {}), meta, result.get("附件", {})
+        )
+
+    def journal_student(self, name: str, journal: AnswerJournal) -> bool:
+        """Journal one student's previous answers; False if they have none for every question."""
+        if name not in self.answers:
+            return False
+        answers: List[Any] = []
+        for key, _ in self.questions:
+            if key not in self.answers[name]:
+                break
+            answers.append(self.answers[name][key])
+        if not answers:
+            return False
+        journal.write_questions(
+            [
+                {"description": question["题干"], "correct_answer": question["正确答案"]}
+                for _, question in self.questions
+            ]
+        )
+        journal.write_student(name, self.meta.get(name, {}), answers, self.attachments.get(name))
+        return True
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from utils.image_store import HOMEWORK_ROOT
+
+from .archive import ARCHIVE_FILE, HOMEWORK_LIST, LIST_ARCHIVE_PATH, MARK_LIST, REVIEW, PageArchive
+from .journal import AnswerJournal, write_answer_file
+from .parsing import ParserPool, parse_homework_list, parse_student_answers, parse_student_list, resolve_parser
+from .processor import ANSWER_FILE, STUDENT_META_FILE, HomeworkProcessor
+
+REPARSE_JOURNAL_FILE = "answers.reparse.jsonl"
+
+
+async def reparse_archives(config: Any) -> List[Path]:
+    """Rebuild every archived homework's ``answer.json`` from its page snapshot."""
+    parser = resolve_parser(getattr(config, "html_parser", None))
+    workers = int(getattr(config, "parse_workers", 0) or os.cpu_count() or 1)
+    archives = sorted(Path(HOMEWORK_ROOT).glob(f"*/*/{ARCHIVE_FILE}"))
+    if not archives:
+        logging.warning("No page archives found; crawl with html_archive enabled first")
+        return []
+
+    pool = ParserPool(workers)
+    slots = asyncio.Semaphore(workers * 2)
+    try:
+        await _check_homework_lists(pool, parser, {archive.parent for archive in archives})
+        results = await asyncio.gather(
+            *[reparse_homework(archive.parent, pool, parser, slots) for archive in archives],
+            return_exceptions=True,
+        )
+    finally:
+        pool.close()
+
+    rebuilt: List[Path] = []
+    for archive, result in zip(archives, results):
+        if isinstance(result, BaseException):
+            logging.error("Failed to reparse homework %s: %s", archive.parent, result)
+        elif result:
+            rebuilt.append(result)
+    logging.info("Reparse finished: %s/%s homework rebuilt", len(rebuilt), len(archives))
+    return rebuilt
+
+
+async def reparse_homework(
+    save_path: Path,
+    pool: ParserPool,
+    parser: str,
+    slots: asyncio.Semaphore,
+) -> Optional[Path]:
+    """Rebuild one homework's results from its archive; None if nothing could be parsed."""
+    mark_pages: Dict[int, str] = {}
+    mark_run: Optional[str] = None
+    parsed: Dict[str, Tuple[int, List[Dict[str, Any]]]] = {}
+
+    async def parse_review(sequence: int, review_url: str, html: str) -> None:
+        try:
+            answers = await pool.run(parse_student_answers, html, parser)
+        finally:
+            slots.release()
+        previous = parsed.get(review_url)
+        if previous is None or previous[0] < sequence:
+            parsed[review_url] = (sequence, answers)
+
+    pending: List["asyncio.Future[None]"] = []
+    for sequence, record in enumerate(PageArchive(save_path / ARCHIVE_FILE).records()):
+        if record["kind"] == MARK_LIST:
+            if record["run"] != mark_run:
+                mark_run, mark_pages = record["run"], {}
+            mark_pages[int(record.get("page", 1))] = record["html"]
+        elif record["kind"] == REVIEW:
+            await slots.acquire()
+            pending.append(
+                asyncio.ensure_future(parse_review(sequence, record["review_url"], record["html"]))
+            )
+    await asyncio.gather(*pending)
+
+    students: List[Dict[str, str]] = []
+    for page in sorted(mark_pages):
+        items = await pool.run(parse_student_list, mark_pages[page], parser)
+        if not items:
+            break
+        students.extend(items)
+    if not students:
+        logging.warning("No student list in archive of %s; leaving it unchanged", save_path)
+        return None
+
+    journal = AnswerJournal(save_path / REPARSE_JOURNAL_FILE)
+    journal.remove()
+    try:
+        attachments = _load_json(save_path / ANSWER_FILE).get("附件", {})
+        reparsed: Set[str] = set()
+        for student in students:
+            answers = parsed.get(student["review_url"], (0, []))[1]
+            if not answers:
+                continue
+            journal.write_questions(
+                [
+                    {"description": item["description"], "correct_answer": item["correct_answer"]}
+                    for item in answers
+                ]
+            )
+            journal.write_student(
+                student["name"],
+                HomeworkProcessor.student_fingerprint(student),
+                [item["student_answer"] for item in answers],
+                attachments.get(student["name"]),
+            )
+            reparsed.add(student["name"])
+        if not reparsed:
+            logging.error("No answers could be parsed from archive of %s; leaving it unchanged", save_path)
+            return None
+        if len(reparsed) < len(students):
+            # Nothing newer than the previous answers exists for these students,
+            # whether or not the mark list gave them a fingerprint.
+            listed = {student["name"] for student in students}
+            HomeworkProcessor.keep_previous(
+                save_path, journal, lambda name: name in listed and name not in reparsed
+            )
+        write_answer_file(
+            journal,
+            [student["name"] for student in students],
+            save_path / ANSWER_FILE,
+            save_path / STUDENT_META_FILE,
+        )
+    finally:
+        journal.remove()
+    logging.info("Reparsed %s: %s/%s students from archive", save_path, len(reparsed), len(students))
+    return save_path
+
+
+async def _check_homework_lists(pool: ParserPool, parser: str, archived: Set[Path]) -> None:
+    """Re-parse the latest archived homework lists and flag homework the parser no longer finds."""
+    latest_run: Optional[str] = None
+    pages: List[str] = []
+    for record in PageArchive(LIST_ARCHIVE_PATH).records():
+        if record["kind"] != HOMEWORK_LIST:
+            continue
+        if record["run"] != latest_run:
+            latest_run, pages = record["run"], []
+        pages.append(record["html"])
+    if not pages:
+        return
+
+    found: Set[Path] = set()
+    for html in pages:
+        for task in await pool.run(parse_homework_list, html, parser, None, None):
+            found.add(Path(task["save_path"]))
+    missing = len(archived - found)
+    logging.info("Homework lists re-parsed: %s tasks", len(found))
+    if missing:
+        logging.warning("%s archived homework not found in re-parsed homework lists", missing)
+
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError) as exc:
+        logging.warning("Failed to read %s: %s", path, exc)
+        return {}
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, FrozenSet, Optional, TypeVar
+
+from utils.stats import format_counters
+
+from .backends import FetchResponse
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+_RETRYABLE_ERROR_NAMES = {"TimeoutError", "ClientError", "ServerDisconnectedError"}
+_RETRYABLE_MESSAGES = ("net::ERR_", "ECONNRESET", "ECONNREFUSED", "ETIMEDOUT", "socket hang up")
+
+
+class FetchError(RuntimeError):
+    """Raised when a fetch still fails after its retries."""
+
+    def __init__(self, url: str, status: int) -> None:
+        super().__init__(f"HTTP {status} for {url}")
+        self.url = url
+        self.status = status
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds from a ``Retry-After`` header value."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable_exception(exc: BaseException) -> bool:
+    """Return True for timeouts and transient network failures."""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    if {cls.__name__ for cls in type(exc).__mro__} & _RETRYABLE_ERROR_NAMES:
+        return True
+    message = str(exc)
+    return any(marker in message for marker in _RETRYABLE_MESSAGES)
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how patiently one kind of call is retried."""
+
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    max_retry_after: float = 120.0
+    statuses: FrozenSet[int] = RETRYABLE_STATUSES
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Return the delay before retry ``attempt`` (0-based), with full jitter."""
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class RetryManager:
+    """Apply per-call-type retry policies and count retries for reporting."""
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, RetryPolicy]] = None,
+        default: Optional[RetryPolicy] = None,
+    ) -> None:
+        self.policies = dict(policies or {})
+        self.default = default or RetryPolicy()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def policy(self, kind: str) -> RetryPolicy:
+        """Return the policy for a call type."""
+        return self.policies.get(kind, self.default)
+
+    async def call(self, kind: str, operation: Callable[[], Awaitable[T]]) -> T:
+        """Run ``operation``, retrying retryable errors and ``FetchResponse`` statuses."""
+        policy = self.policy(kind)
+        stats = self.stats.setdefault(kind, {"calls": 0, "retries": 0, "gave_up": 0})
+        stats["calls"] += 1
+        attempts = max(1, policy.attempts)
+        attempt = 0
+        while True:
+            last = attempt == attempts - 1
+            try:
+                result = await operation()
+            except Exception as exc:
+                if not is_retryable_exception(exc):
+                    raise
+                if last:
+                    stats["gave_up"] += 1
+                    raise
+                delay = policy.backoff(attempt)
+                reason = type(exc).__name__
+            else:
+                status = result.status if isinstance(result, FetchResponse) else None
+                if status is None or status not in policy.statuses:
+                    return result
+                if last:
+                    stats["gave_up"] += 1
+                    return result
+                delay = policy.backoff(attempt, parse_retry_after(result.headers.get("retry-after")))
+                reason = f"HTTP {status}"
+            stats["retries"] += 1
+            logging.warning(
+                "Retrying %s request after %s in %.1fs (%s/%s)",
+                kind,
+                reason,
+                delay,
+                attempt + 1,
+                attempts - 1,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def summary(self) -> str:
+        """Return the per-type counters formatted for logging."""
+        return "; ".join(
+            f"{kind}: " + format_counters(counters)
+            for kind, counters in sorted(self.stats.items())
+        )
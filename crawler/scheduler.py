@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .throttle import AdaptiveThrottle, RequestOutcome
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_QUEUE_SIZE = 64
+
+
+class RequestBudget:
+    """The single cap on concurrent requests sent to Chaoxing."""
+
+    def __init__(self, limit: int, throttle: Optional[AdaptiveThrottle] = None) -> None:
+        self.limit = max(1, limit)
+        self.throttle = throttle
+        self.in_flight = 0
+        self.peak = 0
+        self._semaphore = asyncio.Semaphore(self.limit)
+
+    @asynccontextmanager
+    async def slot(self, url: str = "") -> AsyncIterator[RequestOutcome]:
+        """Hold one request slot; record the response on the yielded outcome."""
+        if self.throttle is None or not url:
+            async with self._semaphore:
+                with self._count():
+                    yield RequestOutcome()
+            return
+        async with self.throttle.track(url) as outcome:
+            async with self._semaphore:
+                outcome.start()
+                with self._count():
+                    yield outcome
+
+    @contextmanager
+    def _count(self) -> Iterator[None]:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+
+class CrawlScheduler(Generic[T]):
+    """Run work items from a bounded priority queue with a fixed worker count."""
+
+    def __init__(
+        self,
+        workers: int,
+        priority: Callable[[T], float],
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.priority = priority
+        self.queue_size = max(1, queue_size)
+
+    async def run(
+        self,
+        source: AsyncIterator[T],
+        handler: Callable[[T], Awaitable[R]],
+    ) -> List[Tuple[T, Union[R, Exception]]]:
+        """Feed ``source`` through ``handler``; return (item, result or exception) pairs."""
+        queue: "asyncio.PriorityQueue[Tuple[float, int, Optional[T]]]" = asyncio.PriorityQueue(
+            self.queue_size
+        )
+        order = itertools.count()
+        results: List[Tuple[T, Union[R, Exception]]] = []
+
+        async def produce() -> None:
+            try:
+                async for item in source:
+                    await queue.put((self.priority(item), next(order), item))
+            finally:
+                for _ in range(self.workers):
+                    await queue.put((math.inf, next(order), None))
+
+        async def work() -> None:
+            while True:
+                _, _, item = await queue.get()
+                if item is None:
+                    return
+                try:
+                    results.append((item, await handler(item)))
+                except Exception as exc:
+                    results.append((item, exc))
+
+        outcomes = await asyncio.gather(
+            produce(),
+            *[work() for _ in range(self.workers)],
+            return_exceptions=True,
+        )
+        if isinstance(outcomes[0], BaseException):
+            raise outcomes[0]
+        return results
+
+
+async def iterate(items: List[Any]) -> AsyncIterator[Any]:
+    """Adapt a list to the async source expected by ``CrawlScheduler.run``."""
+    for item in items:
+        yield item
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+LOGIN_HOST = "passport2.chaoxing.com"
+_LOGIN_MARKERS = ('id="loginBtn"', "id='loginBtn'", 'id="quickCode"')
+
+
+def looks_like_login_page(url: str, html: str = "") -> bool:
+    """Return True if a response is the passport login page instead of data."""
+    if LOGIN_HOST in (url or ""):
+        return True
+    return any(marker in html for marker in _LOGIN_MARKERS)
+
+
+class SessionExpiredError(RuntimeError):
+    """Raised when a fetch still lands on the login page after re-login."""
+
+
+class SessionGuard:
+    """Coordinate a single re-login when fetches detect an expired session."""
+
+    def __init__(self, relogin: Callable[[], Awaitable[Optional[List[Dict]]]]) -> None:
+        self._relogin = relogin
+        self._lock = asyncio.Lock()
+        self._ready = asyncio.Event()
+        self._ready.set()
+        self.generation = 0
+        self.cookies: List[Dict] = []
+        self._failed = False
+
+    async def wait_ready(self) -> None:
+        """Block while a re-login is in progress."""
+        await self._ready.wait()
+
+    async def refresh(self, seen_generation: int) -> bool:
+        """Re-login unless another caller already did since ``seen_generation``."""
+        async with self._lock:
+            if self.generation != seen_generation:
+                return True
+            if self._failed:
+                return False
+            self._ready.clear()
+            try:
+                cookies = await self._relogin()
+            finally:
+                self._ready.set()
+            if cookies is None:
+                self._failed = True
+                return False
+            self.cookies = cookies
+            self.generation += 1
+            return True
+
+
+class SessionStore:
+    """Persist the authenticated Playwright ``storage_state`` between runs."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the stored state, or None if missing or unreadable."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError) as exc:
+            logging.warning("Failed to read session cache: %s", exc)
+            return None
+        state = data.get("storage_state") if isinstance(data, dict) else None
+        return state if isinstance(state, dict) else None
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """Write the state atomically with owner-only permissions."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"saved_at": time.time(), "storage_state": state}, handle)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            logging.warning("Failed to write session cache: %s", exc)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def clear(self) -> None:
+        """Remove the stored state."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
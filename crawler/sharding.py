@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_REPLICAS = 64
+
+
+class HashRing:
+    """Consistent-hash ring mapping task keys to shard indexes."""
+
+    def __init__(self, shards: int, replicas: int = DEFAULT_REPLICAS) -> None:
+        self.shards = max(1, shards)
+        points: List[tuple] = []
+        for shard in range(self.shards):
+            for replica in range(replicas):
+                points.append((self._hash(f"shard-{shard}-{replica}"), shard))
+        points.sort()
+        self._hashes = [point for point, _ in points]
+        self._owners = [shard for _, shard in points]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:16], 16)
+
+    def shard_for(self, key: str) -> int:
+        """Return the shard index owning key."""
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+    def partition(self, items: List[T], key: Callable[[T], str]) -> List[List[T]]:
+        """Split items into one list per shard."""
+        buckets: List[List[T]] = [[] for _ in range(self.shards)]
+        for item in items:
+            buckets[self.shard_for(key(item))].append(item)
+        return buckets
+
+
+def crawl_shard(
+    config: Any,
+    cookies: List[Dict],
+    tasks: List[Dict[str, Any]],
+    budget: int,
+) -> Tuple[List[str], bool]:
+    """Worker-process entry point: crawl one shard in a fresh event loop."""
+    from .crawler import ChaoxingCrawler
+    from .session import SessionGuard
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    crawler = ChaoxingCrawler(config)
+
+    async def run() -> List[Path]:
+        return await crawler.run_shard(tasks, cookies, budget, SessionGuard(crawler._give_up_relogin))
+
+    saved_dirs = asyncio.run(run())
+    return [str(path) for path in saved_dirs], crawler.session_expired
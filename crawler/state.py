@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from typing import AbstractSet, Any, Dict, List
+
+from utils.stats import format_counters
+
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+SUCCESS = "success"
+FAILURE = "failure"
+
+# Transitions from specs/001-playwright-arch-upgrade/data-model.md, plus
+# in_progress -> in_progress for work interrupted by a crash and
+# failure -> in_progress for a retry.
+_TRANSITIONS = {
+    PENDING: {IN_PROGRESS},
+    IN_PROGRESS: {IN_PROGRESS, SUCCESS, FAILURE},
+    SUCCESS: {IN_PROGRESS},
+    FAILURE: {IN_PROGRESS},
+}
+
+RUN_ACTIVE = "active"
+RUN_FINISHED = "finished"
+
+DEFAULT_CHECKPOINT_INTERVAL = 2.0
+
+
+class CrawlStateStore:
+    """Checkpointed status of every homework task and student of a crawl."""
+
+    def __init__(self, path: str, checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL) -> None:
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+        self.run_status = RUN_FINISHED
+        self.scope = ""
+        self.discovered = False
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+
+    def load(self) -> None:
+        """Read the stored state; a missing or unreadable file starts empty."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError) as exc:
+            logging.warning("Failed to read crawl state; starting a new run: %s", exc)
+            return
+        self.run_status = data.get("run_status", RUN_FINISHED)
+        self.scope = data.get("scope", "")
+        self.discovered = bool(data.get("discovered"))
+        self.tasks = data.get("tasks", {})
+
+    def resumable(self, scope: str) -> bool:
+        """Return True if the stored run for ``scope`` was interrupted before it finished."""
+        return self.run_status == RUN_ACTIVE and self.scope == scope and bool(self.tasks)
+
+    def start_run(self, scope: str, retry_unfinished: bool = False) -> int:
+        """Start recording a new run for ``scope``; return the number of tasks carried over."""
+        carried: Dict[str, Dict[str, Any]] = {}
+        if retry_unfinished and self.scope == scope:
+            carried = {
+                key: {"status": PENDING, "task": entry["task"], "students": {}, "updated_at": time.time()}
+                for key, entry in self.tasks.items()
+                if entry["status"] != SUCCESS
+            }
+        self.run_status = RUN_ACTIVE
+        self.scope = scope
+        self.discovered = False
+        self.tasks = carried
+        self.checkpoint(force=True)
+        return len(carried)
+
+    def mark_discovered(self) -> None:
+        """Record that every task of the run has been registered."""
+        self.discovered = True
+        self.checkpoint(force=True)
+
+    def succeeded(self, key: str) -> bool:
+        """Return True if the task already succeeded in this run."""
+        entry = self.tasks.get(key)
+        return entry is not None and entry["status"] == SUCCESS
+
+    def unfinished_tasks(self, exclude: AbstractSet[str] = frozenset()) -> List[Dict[str, Any]]:
+        """Return the task dicts of every task that has not succeeded, except those in ``exclude``."""
+        return [
+            entry["task"]
+            for key, entry in self.tasks.items()
+            if entry["status"] != SUCCESS and key not in exclude
+        ]
+
+    def add_task(self, key: str, task: Dict[str, Any]) -> None:
+        """Register a discovered task as pending, refreshing a carried-over one."""
+        entry = self.tasks.get(key)
+        if entry is not None:
+            entry["task"] = task
+        else:
+            self.tasks[key] = {"status": PENDING, "task": task, "students": {}, "updated_at": time.time()}
+        self._dirty = True
+        self.checkpoint()
+
+    def mark_task(self, key: str, status: str, error: str = "") -> None:
+        """Move a task to ``status``; written with the next checkpoint."""
+        entry = self.tasks.get(key)
+        if entry is None:
+            return
+        self._transition(entry, status)
+        entry["error"] = error
+        self._dirty = True
+        self.checkpoint()
+
+    def mark_student(self, key: str, name: str, status: str) -> None:
+        """Record one student's status; written with the next checkpoint."""
+        entry = self.tasks.get(key)
+        if entry is None:
+            return
+        entry.setdefault("students", {})[name] = status
+        self._dirty = True
+        self.checkpoint()
+
+    def finish_run(self) -> None:
+        """Mark the run finished, so the next run discovers tasks afresh, and write it."""
+        self.run_status = RUN_FINISHED
+        self.checkpoint(force=True)
+
+    def summary(self) -> str:
+        """Return task and student counts per status, formatted for logging."""
+        task_counts = {status: 0 for status in _TRANSITIONS}
+        student_counts = {status: 0 for status in _TRANSITIONS}
+        for entry in self.tasks.values():
+            task_counts[entry["status"]] += 1
+            for status in entry.get("students", {}).values():
+                student_counts[status] += 1
+        return f"tasks: {format_counters(task_counts)}; students: {format_counters(student_counts)}"
+
+    def checkpoint(self, force: bool = False) -> None:
+        """Write the state atomically if it changed and the interval has passed."""
+        now = time.monotonic()
+        if not force and (not self._dirty or now - self._saved_at < self.checkpoint_interval):
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(
+                    {
+                        "run_status": self.run_status,
+                        "scope": self.scope,
+                        "discovered": self.discovered,
+                        "saved_at": time.time(),
+                        "tasks": self.tasks,
+                    },
+                    handle,
+                    ensure_ascii=False,
+                )
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            logging.warning("Failed to write crawl state: %s", exc)
+            return
+        self._dirty = False
+        self._saved_at = now
+
+    @staticmethod
+    def _transition(entry: Dict[str, Any], status: str) -> None:
+        current = entry["status"]
+        if status not in _TRANSITIONS[current]:
+            raise ValueError(f"Invalid task state change {current} -> {status}")
+        entry["status"] = status
+        entry["updated_at"] = time.time()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlparse
+
+DEFAULT_SLOW_SECONDS = 5.0
+
+
+class RequestOutcome:
+    """What a request reported back to its throttle slot."""
+
+    def __init__(self) -> None:
+        self.status: Optional[int] = None
+        self.size: Optional[int] = None
+        self._started: Optional[float] = None
+        self._stopped: Optional[float] = None
+
+    def record(self, status: int, size: Optional[int]) -> None:
+        """Record the HTTP status and body size (None if not checked) of the response."""
+        self.status = status
+        self.size = size
+
+    def start(self) -> None:
+        """Start (or restart) the latency clock."""
+        self._started = time.perf_counter()
+        self._stopped = None
+
+    def stop(self) -> None:
+        """Stop the latency clock, e.g. before waiting on something other than the server."""
+        if self._started is not None and self._stopped is None:
+            self._stopped = time.perf_counter()
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Return the measured latency in seconds, or None if the clock never started."""
+        if self._started is None:
+            return None
+        return (self._stopped or time.perf_counter()) - self._started
+
+    @property
+    def throttled(self) -> Optional[str]:
+        """Return the throttling signal carried by the response, if any."""
+        if self.status is None:
+            return None
+        if self.status == 429 or self.status >= 500:
+            return f"HTTP {self.status}"
+        if self.status == 200 and self.size == 0:
+            return "empty response"
+        return None
+
+
+class AimdLimiter:
+    """Additive-increase / multiplicative-decrease concurrency limit for one host."""
+
+    def __init__(
+        self,
+        host: str,
+        initial: int,
+        ceiling: int,
+        floor: int = 1,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        slow_factor: float = 3.0,
+        slow_seconds: float = DEFAULT_SLOW_SECONDS,
+    ) -> None:
+        self.host = host
+        self.ceiling = max(1, ceiling)
+        self.floor = max(1, min(floor, self.ceiling))
+        self.limit = float(min(max(initial, self.floor), self.ceiling))
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_factor = slow_factor
+        self.slow_seconds = slow_seconds
+        self.in_flight = 0
+        self.cuts = 0
+        self._latency: Optional[float] = None
+        self._last_cut = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait until the host is below its current limit, then take a slot."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        """Give the slot back and wake waiters, which may now fit a raised limit."""
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        """Grow the limit after a healthy response, or cut it if it was too slow."""
+        if self._latency is not None and latency > max(
+            self.slow_seconds, self.slow_factor * self._latency
+        ):
+            self.on_throttle(f"slow response ({latency:.1f}s)")
+            return
+        self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+        previous = int(self.limit)
+        self.limit = min(float(self.ceiling), self.limit + self.increase / self.limit)
+        if int(self.limit) != previous:
+            logging.info("Concurrency limit for %s raised to %s", self.host, int(self.limit))
+
+    def on_throttle(self, reason: str) -> None:
+        """Cut the limit multiplicatively on a throttling signal."""
+        now = time.monotonic()
+        if now - self._last_cut < (self._latency or 1.0):
+            return
+        self._last_cut = now
+        self.cuts += 1
+        self.limit = max(float(self.floor), self.limit * self.decrease)
+        logging.warning(
+            "Throttling signal from %s (%s); concurrency limit cut to %s",
+            self.host,
+            reason,
+            int(self.limit),
+        )
+
+
+class AdaptiveThrottle:
+    """Per-host AIMD limiters applied inside the crawler's fetch path."""
+
+    def __init__(self, ceiling: int, initial: Optional[int] = None) -> None:
+        self.ceiling = max(1, ceiling)
+        self.initial = initial or self.ceiling
+        self._limiters: Dict[str, AimdLimiter] = {}
+
+    def limiter(self, url: str) -> AimdLimiter:
+        """Return the limiter for the URL's host, creating it on first use."""
+        host = urlparse(url).hostname or ""
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = AimdLimiter(host, self.initial, self.ceiling)
+            self._limiters[host] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def track(self, url: str) -> AsyncIterator[RequestOutcome]:
+        """Hold a host slot for one request and feed its outcome back to the limiter."""
+        limiter = self.limiter(url)
+        await limiter.acquire()
+        outcome = RequestOutcome()
+        outcome.start()
+        try:
+            yield outcome
+        except Exception as exc:
+            limiter.on_throttle(type(exc).__name__)
+            raise
+        else:
+            signal = outcome.throttled
+            latency = outcome.latency
+            if signal:
+                limiter.on_throttle(signal)
+            elif outcome.status is not None and latency is not None:
+                limiter.on_success(latency)
+        finally:
+            await limiter.release()
+
+    def summary(self) -> str:
+        """Return the current per-host limits formatted for logging."""
+        return ", ".join(
+            f"{host}={int(limiter.limit)} (cuts={limiter.cuts})"
+            for host, limiter in sorted(self._limiters.items())
+        )
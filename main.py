@@ -4,6 +4,7 @@ import logging
 
 from config._args import config
 from crawler.crawler import ChaoxingCrawler
+from crawler.reparse import reparse_archives
 from grader.homework_grader import HomeworkGrader
 
 
@@ -15,6 +16,10 @@ async def run_crawler() -> list:
     return await crawler.run()
 
 
+async def run_reparse() -> list:
+    return await reparse_archives(config)
+
+
 def run_grader() -> None:
     grader = HomeworkGrader(config=config)
     logging.info("Starting grading flow...")
@@ -26,12 +31,18 @@ async def main() -> None:
     parser = argparse.ArgumentParser(description="超星作业自动批改系统")
     parser.add_argument(
         "--mode",
-        choices=["crawl", "grade", "all"],
+        choices=["crawl", "grade", "all", "reparse"],
         default="all",
-        help="运行模式: crawl=仅爬取, grade=仅批改, all=全部",
+        help="运行模式: crawl=仅爬取, grade=仅批改, all=全部, reparse=从本地网页快照重建answer.json",
     )
     args = parser.parse_args()
 
+    if args.mode == "reparse":
+        logging.info("Starting offline reparse...")
+        rebuilt_dirs = await run_reparse()
+        logging.info("Reparse finished, rebuilt %s homework folders", len(rebuilt_dirs))
+        return
+
     if args.mode in ["crawl", "all"]:
         logging.info("Starting crawl flow...")
         saved_dirs = await run_crawler()
@@ -0,0 +1,223 @@
+"""Benchmark crawler HTML parsing on saved Chaoxing pages.
+
+Usage:
+    python parser_bench.py --review "saved/review_*.html"
+    python parser_bench.py --dom --review "saved/review_*.html" \
+        --students "saved/mark_list_*.html" --homework "saved/work_list_*.html"
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from crawler.dom import (
+    ANSWER_BLOCKS,
+    HOMEWORK_LIST,
+    PYTHON_PARSERS,
+    STUDENT_ANSWERS,
+    STUDENT_LIST,
+    DomExtractor,
+)
+from crawler.parsing import parse_answer_blocks, parse_student_answers, resolve_parser
+
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+LEGACY_KEYS = ("description", "student_answer", "correct_answer")
+
+
+def legacy_extract_content(element: Any) -> Dict[str, List[str]]:
+    if not element:
+        return {"text": [], "images": []}
+    text_contents: List[str] = []
+    for p in element.find_all("p"):
+        html_content = str(p).replace("<br>", "\n").replace("<br/>", "\n")
+        text = BeautifulSoup(html_content, "html.parser").get_text().strip()
+        if text:
+            text_contents.append(text)
+    combined_text = ["\n".join(text_contents)] if text_contents else []
+    images = [img["src"] for img in element.find_all("img") if "src" in img.attrs]
+    return {"text": combined_text, "images": images}
+
+
+def legacy_parse_student_answers(html: str) -> List[Dict[str, Any]]:
+    answers: List[Dict[str, Any]] = []
+    soup = BeautifulSoup(html, "html.parser")
+    for block in soup.find_all("div", class_="mark_item1"):
+        description = legacy_extract_content(block.find("div", class_="hiddenTitle"))
+        answer_dl = block.find("dl", class_="mark_fill", id=lambda x: x and x.startswith("stuanswer_"))
+        correct_dl = block.find("dl", class_="mark_fill", id=lambda x: x and x.startswith("correctanswer_"))
+        correct_answer = (
+            correct_dl.text.strip().replace("参考答案：", "", 1) if correct_dl else "此题无参考答案"
+        )
+        answers.append(
+            {
+                "description": description,
+                "student_answer": legacy_extract_content(answer_dl),
+                "correct_answer": correct_answer,
+            }
+        )
+    return answers
+
+
+def strained_parse_student_answers(html: str, backend: str) -> List[Dict[str, Any]]:
+    """Full parse, restricted to the fields the legacy parser produced."""
+    return [{key: item[key] for key in LEGACY_KEYS} for item in parse_student_answers(html, backend)]
+
+
+def answer_blocks_match(html: str, backend: str) -> bool:
+    """Return True if the answers-only parse matches the full parse's answers."""
+    blocks = parse_answer_blocks(html, backend)
+    return all(
+        blocks.get(item["answer_id"], {}).get("student_answer") == item["student_answer"]
+        for item in parse_student_answers(html, backend)
+        if item["answer_id"]
+    )
+
+
+def bench_answer_blocks(pages: List[str], rounds: int) -> None:
+    if not pages:
+        return
+    for backend in sorted({"html.parser", resolve_parser("auto")}):
+        def full(html: str, backend: str = backend) -> Any:
+            return parse_student_answers(html, backend)
+
+        def blocks(html: str, backend: str = backend) -> Any:
+            return parse_answer_blocks(html, backend)
+
+        identical = all(answer_blocks_match(html, backend) for html in pages)
+        baseline = time_parser(full, pages, rounds)
+        elapsed = time_parser(blocks, pages, rounds)
+        logging.info(
+            "answers-only %s: %.3fs vs full %.3fs (%.1fx), identical answers: %s",
+            backend,
+            elapsed,
+            baseline,
+            baseline / elapsed if elapsed else float("inf"),
+            identical,
+        )
+
+
+def time_parser(parse: Callable[[str], Any], pages: List[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for html in pages:
+            parse(html)
+    return time.perf_counter() - start
+
+
+def bench(
+    label: str,
+    legacy: Callable[[str], Any],
+    parse_func: Callable[[str, str], Any],
+    pages: List[str],
+    rounds: int,
+) -> None:
+    if not pages:
+        return
+    baseline = time_parser(legacy, pages, rounds)
+    expected = [legacy(html) for html in pages]
+    logging.info("%s legacy: %.3fs for %s pages x %s", label, baseline, len(pages), rounds)
+
+    for backend in sorted({"html.parser", resolve_parser("auto")}):
+        def parse(html: str, backend: str = backend) -> Any:
+            return parse_func(html, backend)
+
+        identical = [parse(html) for html in pages] == expected
+        elapsed = time_parser(parse, pages, rounds)
+        logging.info(
+            "%s %s: %.3fs (%.1fx), identical output: %s",
+            label,
+            backend,
+            elapsed,
+            baseline / elapsed if elapsed else float("inf"),
+            identical,
+        )
+
+
+async def bench_dom(pages_by_kind: Dict[str, List[str]], rounds: int) -> None:
+    """Check and time the in-page extractors against the Python parsers."""
+    from core.browser import BrowserManager
+
+    backend = resolve_parser("auto")
+    extractor = DomExtractor(verify=False)
+    async with BrowserManager(headless=True, max_contexts=1) as browser:
+        async with browser.page() as page:
+            for kind, pages in pages_by_kind.items():
+                if not pages:
+                    continue
+                parse = PYTHON_PARSERS[kind]
+                identical = True
+                dom_seconds = 0.0
+                html_bytes = 0
+                result_bytes = 0
+                for html in pages:
+                    await page.set_content(html, wait_until="domcontentloaded")
+                    expected = parse(html, "html.parser")
+                    start = time.perf_counter()
+                    for _ in range(rounds):
+                        result = await extractor.extract(page, kind)
+                    dom_seconds += time.perf_counter() - start
+                    identical = identical and result == expected
+                    html_bytes += len(html.encode("utf-8"))
+                    result_bytes += len(json.dumps(result, ensure_ascii=False).encode("utf-8"))
+
+                def python(html: str, parse: Callable[[str, str], Any] = parse) -> Any:
+                    return parse(html, backend)
+
+                python_seconds = time_parser(python, pages, rounds)
+                logging.info(
+                    "dom %s: evaluate %.3fs vs %s %.3fs, payload %s -> %s bytes, identical output: %s",
+                    kind,
+                    dom_seconds,
+                    backend,
+                    python_seconds,
+                    html_bytes,
+                    result_bytes,
+                    identical,
+                )
+
+
+def load_pages(patterns: List[str]) -> List[str]:
+    pages: List[str] = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, "r", encoding="utf-8") as handle:
+                pages.append(handle.read())
+    return pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark crawler HTML parsers on saved pages")
+    parser.add_argument("--review", nargs="*", default=[], help="saved review-work pages (glob)")
+    parser.add_argument("--students", nargs="*", default=[], help="saved mark-list pages (glob)")
+    parser.add_argument("--homework", nargs="*", default=[], help="saved homework list pages (glob)")
+    parser.add_argument("--rounds", type=int, default=5, help="repetitions per page")
+    parser.add_argument("--dom", action="store_true", help="check the in-browser extractors (needs Playwright)")
+    args = parser.parse_args()
+
+    pages = load_pages(args.review)
+    bench("review", legacy_parse_student_answers, strained_parse_student_answers, pages, args.rounds)
+    bench_answer_blocks(pages, args.rounds)
+    if args.dom:
+        asyncio.run(
+            bench_dom(
+                {
+                    STUDENT_ANSWERS: pages,
+                    ANSWER_BLOCKS: pages,
+                    STUDENT_LIST: load_pages(args.students),
+                    HOMEWORK_LIST: load_pages(args.homework),
+                },
+                args.rounds,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
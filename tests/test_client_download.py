@@ -0,0 +1,103 @@
+"""Ranged, resumable downloads through ``CrawlerClient`` with a fake streaming backend."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+import pytest
+
+from crawler.backends import FetchBackend, FetchResponse, StreamedResponse
+from crawler.client import CrawlerClient, DownloadTooLarge
+from crawler.scheduler import RequestBudget
+from crawler.throttle import AdaptiveThrottle
+
+URL = "https://mooc2-ans.chaoxing.com/file"
+
+
+class RangeBackend(FetchBackend):
+    """Serve ``data`` in 3-byte chunks, answering Range requests unless ``ranges`` is off."""
+
+    def __init__(self, data: bytes, ranges: bool = True, length: bool = True) -> None:
+        self.data = data
+        self.ranges = ranges
+        self.length = length
+        self.requested: List[str] = []
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResponse:
+        raise AssertionError("downloads must stream")
+
+    async def set_cookies(self, cookies: List[Dict]) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @asynccontextmanager
+    async def stream(self, url: str, headers: Optional[Dict[str, str]] = None) -> AsyncIterator[StreamedResponse]:
+        header = (headers or {})["Range"]
+        self.requested.append(header)
+        start, end = (int(value) for value in header[len("bytes="):].split("-"))
+        total = len(self.data)
+        if not self.ranges:
+            fields = {"content-length": str(total)} if self.length else {}
+            yield StreamedResponse(url, 200, fields, self._chunks(self.data))
+        elif start >= total:
+            yield StreamedResponse(url, 416, {"content-range": f"bytes */{total}"}, self._chunks(b""))
+        else:
+            part = self.data[start:end + 1]
+            fields = {"content-range": f"bytes {start}-{start + len(part) - 1}/{total}"}
+            yield StreamedResponse(url, 206, fields, self._chunks(part))
+
+    @staticmethod
+    async def _chunks(body: bytes) -> AsyncIterator[bytes]:
+        for index in range(0, len(body), 3):
+            yield body[index:index + 3]
+
+
+def _download(client: CrawlerClient, path: Path, **options) -> int:
+    return asyncio.run(client.download_file(URL, str(path), **options))
+
+
+def test_download_in_ranges(tmp_path: Path) -> None:
+    backend = RangeBackend(b"0123456789abc")
+    path = tmp_path / "file"
+
+    assert _download(CrawlerClient(backend=backend), path, chunk_bytes=4) == 13
+    assert path.read_bytes() == b"0123456789abc"
+    assert backend.requested[0] == "bytes=0-3"
+
+
+def test_download_resumes_partial_file(tmp_path: Path) -> None:
+    backend = RangeBackend(b"0123456789")
+    path = tmp_path / "file"
+    path.write_bytes(b"0123")
+
+    assert _download(CrawlerClient(backend=backend), path, chunk_bytes=100) == 10
+    assert path.read_bytes() == b"0123456789"
+    assert backend.requested == ["bytes=4-103"]
+    assert _download(CrawlerClient(backend=backend), path, chunk_bytes=100) == 10
+
+
+@pytest.mark.parametrize("ranges, length", [(True, True), (False, True), (False, False)])
+def test_download_over_limit_removes_file(tmp_path: Path, ranges: bool, length: bool) -> None:
+    path = tmp_path / "file"
+    client = CrawlerClient(backend=RangeBackend(b"x" * 20, ranges, length))
+
+    with pytest.raises(DownloadTooLarge):
+        _download(client, path, max_bytes=10, chunk_bytes=4)
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("data, max_bytes", [(b"", None), (b"x" * 20, 10)])
+def test_download_outcome_is_not_a_throttle_signal(tmp_path: Path, data: bytes, max_bytes: Optional[int]) -> None:
+    throttle = AdaptiveThrottle(4)
+    client = CrawlerClient(backend=RangeBackend(data, ranges=False), budget=RequestBudget(4, throttle))
+
+    try:
+        _download(client, tmp_path / "file", max_bytes=max_bytes)
+    except DownloadTooLarge:
+        pass
+    assert throttle.limiter(URL).cuts == 0
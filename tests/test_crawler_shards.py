@@ -0,0 +1,120 @@
+"""Sharded crawls resuming from the state store, with the browser replaced by a stub."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+import crawler.crawler as crawler_module
+from crawler.crawler import ChaoxingCrawler
+from crawler.state import RUN_FINISHED, SUCCESS, CrawlStateStore
+
+COOKIES = [{"name": "uid", "value": "1"}]
+
+
+def _task(name: str) -> Dict[str, Any]:
+    return {
+        "班级": "c1",
+        "作业名": name,
+        "作答时间": "",
+        "作业批阅链接": f"https://mooc2-ans.chaoxing.com/mark?clazzid=1&name={name}",
+        "save_path": str(Path("homework") / "c1" / name),
+        "pending_count": 1,
+    }
+
+
+@pytest.fixture
+def logins(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> List[ChaoxingCrawler]:
+    """Stub the browser session; return the crawlers that had to log in themselves."""
+    monkeypatch.chdir(tmp_path)
+    performed: List[ChaoxingCrawler] = []
+
+    async def run_with_browser(self, download_dir, budget, work, cookies=None, session_guard=None):
+        if cookies:
+            self.cookies = list(cookies)
+        else:
+            performed.append(self)
+            self.cookies = list(COOKIES)
+        self.browser_manager = SimpleNamespace(disruptions=0)
+        try:
+            return await work()
+        finally:
+            self.browser_manager = None
+
+    async def process_once(self, task):
+        return Path(task["save_path"]), False
+
+    monkeypatch.setattr(ChaoxingCrawler, "_run_with_browser", run_with_browser)
+    monkeypatch.setattr(ChaoxingCrawler, "_process_homework_once", process_once)
+    return performed
+
+
+def _interrupted_run(tmp_path: Path, **options: Any) -> SimpleNamespace:
+    """Return a config whose state store holds a discovered, unfinished sharded run."""
+    config = SimpleNamespace(
+        browser_shards=2,
+        course_urls=["https://mooc2-ans.chaoxing.com/course"],
+        crawl_state_path=str(tmp_path / "state.json"),
+        session_cache=False,
+        prefetch_images=False,
+        download_attachments=False,
+        **options,
+    )
+    crawler = ChaoxingCrawler(config)
+    store = CrawlStateStore(config.crawl_state_path)
+    store.start_run(crawler._state_scope())
+    for name in ("a", "b", "c", "d"):
+        task = _task(name)
+        store.add_task(crawler._task_id(task), task)
+    store.mark_discovered()
+    return config
+
+
+def _final_state(config: SimpleNamespace) -> CrawlStateStore:
+    store = CrawlStateStore(config.crawl_state_path)
+    store.load()
+    return store
+
+
+def test_resumed_shards_share_one_login(tmp_path: Path, logins: List[ChaoxingCrawler]) -> None:
+    config = _interrupted_run(tmp_path)
+    saved = asyncio.run(ChaoxingCrawler(config).run())
+
+    assert len(saved) == 4
+    assert len(logins) == 1
+    store = _final_state(config)
+    assert store.run_status == RUN_FINISHED
+    assert {entry["status"] for entry in store.tasks.values()} == {SUCCESS}
+
+
+def test_expired_shard_processes_are_retried_once(
+    tmp_path: Path,
+    logins: List[ChaoxingCrawler],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    shard_cookies: List[List[Dict]] = []
+
+    def crawl_shard(config, cookies, tasks, budget):
+        shard_cookies.append(cookies)
+        return [], True
+
+    monkeypatch.setattr(crawler_module, "crawl_shard", crawl_shard)
+    monkeypatch.setattr(
+        crawler_module,
+        "ProcessPoolExecutor",
+        lambda max_workers, mp_context: ThreadPoolExecutor(max_workers),
+    )
+    config = _interrupted_run(tmp_path, shard_processes=True)
+    saved = asyncio.run(ChaoxingCrawler(config).run())
+
+    assert len(saved) == 4
+    assert shard_cookies and all(cookies == COOKIES for cookies in shard_cookies)
+    assert len(logins) == 2
+    store = _final_state(config)
+    assert store.run_status == RUN_FINISHED
+    assert {entry["status"] for entry in store.tasks.values()} == {SUCCESS}
@@ -0,0 +1,58 @@
+"""Parity of the in-page extractors with the Python parsers on saved pages; needs Chromium."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from crawler.dom import (
+    ANSWER_BLOCKS,
+    HOMEWORK_LIST,
+    PYTHON_PARSERS,
+    STUDENT_ANSWERS,
+    STUDENT_LIST,
+    DomExtractor,
+)
+
+PAGES = Path(__file__).parent / "fixtures" / "pages"
+
+CASES = [
+    ("review.html", STUDENT_ANSWERS),
+    ("review.html", ANSWER_BLOCKS),
+    ("mark_list.html", STUDENT_LIST),
+    ("no_data.html", STUDENT_LIST),
+    ("homework_list.html", HOMEWORK_LIST),
+    ("no_data.html", HOMEWORK_LIST),
+]
+
+PAGE_URL = "https://mooc2-ans.chaoxing.com/page"
+
+
+async def _extract_in_chromium(html: str, kind: str) -> Any:
+    async_api = pytest.importorskip("playwright.async_api")
+    async with async_api.async_playwright() as playwright:
+        try:
+            browser = await playwright.chromium.launch(headless=True)
+        except Exception as exc:
+            pytest.skip(f"Chromium is not available: {exc}")
+        try:
+            page = await browser.new_page()
+
+            async def serve(route: Any) -> None:
+                await route.fulfill(status=200, content_type="text/html; charset=utf-8", body=html)
+
+            await page.route(PAGE_URL, serve)
+            await page.goto(PAGE_URL, wait_until="domcontentloaded")
+            return await DomExtractor(verify=False).extract(page, kind)
+        finally:
+            await browser.close()
+
+
+@pytest.mark.parametrize("name, kind", CASES)
+def test_extractor_matches_python_parser(name: str, kind: str) -> None:
+    html = (PAGES / name).read_text(encoding="utf-8")
+    extracted = asyncio.run(_extract_in_chromium(html, kind))
+    assert extracted == PYTHON_PARSERS[kind](html, "html.parser")
@@ -0,0 +1,64 @@
+"""``write_answer_file`` must produce exactly what ``json.dump(indent=2)`` would."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from crawler.journal import AnswerJournal, write_answer_file
+
+QUESTIONS = [
+    {"description": "题干一", "correct_answer": "A"},
+    {"description": "second \"stem\"\nwith a newline", "correct_answer": ""},
+]
+ATTACHMENTS = {"题目2": [{"name": "报告.pdf", "path": "files/1.pdf", "size": 3}]}
+
+
+def _answer(text: str) -> Dict[str, Any]:
+    return {"student_answer": {"text": [text], "images": []}, "attachments": []}
+
+
+def _expected(students: List[str], attachments: Dict[str, Any]) -> str:
+    result: Dict[str, Any] = {
+        "题目": {
+            f"题目{index}": {"题干": question["description"], "正确答案": question["correct_answer"]}
+            for index, question in enumerate(QUESTIONS, 1)
+        },
+        "学生回答": {
+            name: {f"题目{index}": _answer(f"{name}{index}") for index in (1, 2)} for name in students
+        },
+    }
+    if attachments:
+        result["附件"] = attachments
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+
+@pytest.mark.parametrize(
+    "students, attachments",
+    [
+        ([], {}),
+        (["张三"], {}),
+        (["张三", "b"], {}),
+        (["张三", "b"], {"b": ATTACHMENTS}),
+    ],
+)
+def test_answer_file_matches_json_dump(tmp_path: Path, students: List[str], attachments: Dict[str, Any]) -> None:
+    journal = AnswerJournal(tmp_path / "answers.jsonl")
+    journal.write_questions(QUESTIONS)
+    for name in students:
+        journal.write_student(name, {"status": "done"}, [_answer("stale")] * 2)
+        journal.write_student(
+            name, {"status": "done"}, [_answer(f"{name}{index}") for index in (1, 2)], attachments.get(name)
+        )
+    journal.close()
+
+    saved = write_answer_file(journal, students + ["missing"], tmp_path / "answer.json", tmp_path / "students.json")
+
+    assert saved == len(students)
+    assert (tmp_path / "answer.json").read_text(encoding="utf-8") == _expected(students, attachments)
+    assert json.loads((tmp_path / "students.json").read_text(encoding="utf-8")) == {
+        name: {"status": "done"} for name in students
+    }
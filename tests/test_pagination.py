@@ -0,0 +1,90 @@
+"""Concurrent list pagination with a fake page source."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List, Optional
+
+import pytest
+
+from crawler.pagination import fetch_all_pages
+from crawler.retry import FetchError
+
+
+class Pages:
+    """Serve ``items`` per page number; pages in ``failing`` raise ``FetchError``."""
+
+    def __init__(self, items: Dict[int, List[str]], failing: tuple = (), count: Optional[int] = None) -> None:
+        self.items = items
+        self.failing = failing
+        self.count = count
+        self.fetched: List[int] = []
+
+    async def fetch(self, page_num: int) -> str:
+        self.fetched.append(page_num)
+        if page_num in self.failing:
+            raise FetchError(f"page {page_num}", 503)
+        header = f"totalPages: {self.count}\n" if self.count else ""
+        return header + "\n".join(self.items.get(page_num, []))
+
+    @staticmethod
+    async def parse(html: str) -> List[str]:
+        return [line for line in html.split("\n") if line and not line.startswith("totalPages")]
+
+
+def _crawl(pages: Pages, failed_pages: Optional[List[int]] = None) -> List[str]:
+    return asyncio.run(fetch_all_pages(pages.fetch, pages.parse, failed_pages=failed_pages))
+
+
+def _items(count: int) -> Dict[int, List[str]]:
+    return {page: [f"p{page}a", f"p{page}b"] for page in range(1, count + 1)}
+
+
+def test_advertised_count_fetches_remaining_pages_in_one_batch() -> None:
+    pages = Pages(_items(3), count=3)
+
+    assert _crawl(pages) == ["p1a", "p1b", "p2a", "p2b", "p3a", "p3b"]
+    assert pages.fetched[0] == 1
+    assert sorted(pages.fetched[1:3]) == [2, 3]
+    assert pages.fetched[3:] == [4]
+
+
+def test_unknown_count_doubles_batches_until_empty_page() -> None:
+    pages = Pages({**_items(5), 7: ["after-gap"]})
+
+    assert _crawl(pages) == [f"p{page}{half}" for page in range(1, 6) for half in "ab"]
+    assert sorted(pages.fetched) == list(range(1, 9))
+
+
+def test_empty_first_page_stops_at_once() -> None:
+    pages = Pages({})
+
+    assert _crawl(pages) == []
+    assert pages.fetched == [1]
+
+
+def test_failed_page_is_reported_and_skipped() -> None:
+    pages = Pages(_items(3), failing=(2,), count=3)
+    failed: List[int] = []
+
+    assert _crawl(pages, failed) == ["p1a", "p1b", "p3a", "p3b"]
+    assert failed == [2]
+
+
+def test_batch_where_every_page_failed_ends_the_scan() -> None:
+    pages = Pages(_items(4), failing=(2,))
+    failed: List[int] = []
+
+    assert _crawl(pages, failed) == ["p1a", "p1b"]
+    assert failed == [2]
+    assert pages.fetched == [1, 2]
+
+
+def test_other_errors_propagate() -> None:
+    async def fetch(page_num: int) -> str:
+        if page_num > 1:
+            raise KeyError(page_num)
+        return "totalPages: 2\nitem"
+
+    with pytest.raises(KeyError):
+        asyncio.run(fetch_all_pages(fetch, Pages.parse))
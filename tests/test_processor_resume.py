@@ -0,0 +1,84 @@
+"""Resuming a homework from its answer journal, with the network side stubbed out."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from crawler.journal import JOURNAL_FILE, AnswerJournal, write_answer_file
+from crawler.processor import ANSWER_FILE, STUDENT_META_FILE, HomeworkProcessor
+
+QUESTIONS = [{"description": "q1", "correct_answer": "r1"}]
+ANSWER = [{"student_answer": {"text": ["x"], "images": []}, "attachments": []}]
+
+
+def _processor(monkeypatch: pytest.MonkeyPatch, students: List[Dict[str, str]], fetched: List[str]) -> HomeworkProcessor:
+    processor = HomeworkProcessor(pages=None)
+
+    async def student_list(grading_url: str) -> List[Dict[str, str]]:
+        return students
+
+    async def fetch_students(pending: List[Dict[str, str]], journal: AnswerJournal) -> None:
+        journal.write_questions(QUESTIONS)
+        for student in pending:
+            fetched.append(student["name"])
+            journal.write_student(student["name"], processor.student_fingerprint(student), ANSWER)
+
+    monkeypatch.setattr(processor, "_get_student_list", student_list)
+    monkeypatch.setattr(processor, "_fetch_students", fetch_students)
+    return processor
+
+
+def _journal(save_path: Path, students: List[Dict[str, str]]) -> None:
+    journal = AnswerJournal(save_path / JOURNAL_FILE)
+    journal.load()
+    journal.write_questions(QUESTIONS)
+    for student in students:
+        journal.write_student(student["name"], HomeworkProcessor.student_fingerprint(student), ANSWER)
+    journal.close()
+
+
+def test_resume_skips_journaled_students(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    students = [
+        {"name": "a", "submit_time": "t1", "status": "done"},
+        {"name": "b", "submit_time": "t2", "status": "done"},
+    ]
+    _journal(tmp_path, students[:1])
+    fetched: List[str] = []
+
+    saved = asyncio.run(_processor(monkeypatch, students, fetched).save_all_students("url", tmp_path, False))
+
+    assert saved == 2
+    assert fetched == ["b"]
+    assert set(json.loads((tmp_path / ANSWER_FILE).read_text(encoding="utf-8"))["学生回答"]) == {"a", "b"}
+
+
+def test_resume_refetches_students_without_fingerprint(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    students = [{"name": "a"}, {"name": "b", "submit_time": "t2"}]
+    _journal(tmp_path, students)
+    fetched: List[str] = []
+
+    asyncio.run(_processor(monkeypatch, students, fetched).save_all_students("url", tmp_path, False))
+
+    assert fetched == ["a"]
+
+
+def test_incremental_crawl_keeps_previous_attachments(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    students = [{"name": "a", "submit_time": "t1"}, {"name": "b", "submit_time": "t2"}]
+    attachments = {"题目1": [{"name": "a.pdf", "path": "files/a.pdf", "size": 1}]}
+    journal = AnswerJournal(tmp_path / JOURNAL_FILE)
+    journal.write_questions(QUESTIONS)
+    journal.write_student("a", HomeworkProcessor.student_fingerprint(students[0]), ANSWER, attachments)
+    journal.close()
+    write_answer_file(journal, ["a"], tmp_path / ANSWER_FILE, tmp_path / STUDENT_META_FILE)
+    journal.remove()
+    fetched: List[str] = []
+
+    asyncio.run(_processor(monkeypatch, students, fetched).save_all_students("url", tmp_path, True))
+
+    assert fetched == ["b"]
+    assert json.loads((tmp_path / ANSWER_FILE).read_text(encoding="utf-8"))["附件"] == {"a": attachments}
@@ -0,0 +1,54 @@
+"""Learning and rebuilding ``review-work`` URLs from mark-list review URLs."""
+
+from __future__ import annotations
+
+from crawler.processor import ReviewUrlTemplate
+
+REVIEW = "https://mooc1.chaoxing.com/mooc-ans/work/review?courseid=10&clazzid=20&workid=30&answerid=401&cpi=5"
+CONTENT = (
+    "https://mooc1.chaoxing.com/mooc-ans/work/review-work"
+    "?courseId=10&classId=20&workId=30&workAnswerId=401&cpi=5&isdisplaytable=2"
+)
+
+
+def test_learned_template_rebuilds_other_students() -> None:
+    template = ReviewUrlTemplate.learn(REVIEW, CONTENT)
+
+    assert template is not None
+    assert template.build(REVIEW) == CONTENT
+    assert template.build(REVIEW.replace("answerid=401", "answerid=402")) == CONTENT.replace(
+        "workAnswerId=401", "workAnswerId=402"
+    )
+
+
+def test_constants_stay_and_sources_are_tracked() -> None:
+    template = ReviewUrlTemplate.learn(REVIEW, CONTENT)
+
+    assert template is not None
+    assert template.source_keys == {"courseid", "clazzid", "workid", "answerid", "cpi"}
+    assert ("isdisplaytable", None, "2") in template.params
+
+
+def test_ambiguous_value_maps_to_matching_key() -> None:
+    review = "https://mooc1.chaoxing.com/review?workid=7&answerid=7"
+    template = ReviewUrlTemplate.learn(review, "https://mooc1.chaoxing.com/review-work?answerId=7")
+
+    assert template is not None
+    assert template.source_keys == {"answerid"}
+
+
+def test_missing_source_parameter_builds_nothing() -> None:
+    template = ReviewUrlTemplate.learn(REVIEW, CONTENT)
+
+    assert template is not None
+    assert template.build(REVIEW.replace("&answerid=401", "")) is None
+
+
+def test_unrelated_content_url_learns_nothing() -> None:
+    assert ReviewUrlTemplate.learn(REVIEW, "https://mooc1.chaoxing.com/review-work?x=1") is None
+
+
+def test_varying_keys() -> None:
+    urls = [REVIEW, REVIEW.replace("answerid=401", "answerid=402")]
+
+    assert ReviewUrlTemplate.varying_keys(urls) == {"answerid"}
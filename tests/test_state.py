@@ -0,0 +1,109 @@
+"""Task transitions, checkpoints and run boundaries of ``CrawlStateStore``."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from crawler.state import FAILURE, IN_PROGRESS, PENDING, RUN_ACTIVE, RUN_FINISHED, SUCCESS, CrawlStateStore
+
+TASK = {"作业名": "hw"}
+
+
+def _store(tmp_path: Path, interval: float = 0) -> CrawlStateStore:
+    store = CrawlStateStore(str(tmp_path / "state.json"), checkpoint_interval=interval)
+    store.load()
+    return store
+
+
+def _reloaded(store: CrawlStateStore) -> CrawlStateStore:
+    fresh = CrawlStateStore(store.path)
+    fresh.load()
+    return fresh
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        [IN_PROGRESS, SUCCESS],
+        [IN_PROGRESS, FAILURE, IN_PROGRESS, SUCCESS],
+        [IN_PROGRESS, IN_PROGRESS, FAILURE],
+        [IN_PROGRESS, SUCCESS, IN_PROGRESS, SUCCESS],
+    ],
+)
+def test_allowed_transitions(tmp_path: Path, path: list) -> None:
+    store = _store(tmp_path)
+    store.start_run("scope")
+    store.add_task("t", TASK)
+    for status in path:
+        store.mark_task("t", status)
+
+    assert _reloaded(store).tasks["t"]["status"] == path[-1]
+
+
+@pytest.mark.parametrize(
+    "path",
+    [[SUCCESS], [FAILURE], [IN_PROGRESS, PENDING], [IN_PROGRESS, SUCCESS, SUCCESS], [IN_PROGRESS, FAILURE, SUCCESS]],
+)
+def test_invalid_transitions_raise(tmp_path: Path, path: list) -> None:
+    store = _store(tmp_path)
+    store.start_run("scope")
+    store.add_task("t", TASK)
+    with pytest.raises(ValueError):
+        for status in path:
+            store.mark_task("t", status)
+
+
+def test_unknown_task_is_ignored(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.start_run("scope")
+    store.mark_task("missing", SUCCESS)
+
+    assert store.tasks == {}
+
+
+def test_checkpoints_are_rate_limited(tmp_path: Path) -> None:
+    store = _store(tmp_path, interval=3600)
+    store.start_run("scope")
+    store.add_task("t", TASK)
+
+    assert _reloaded(store).tasks == {}
+    store.mark_discovered()
+    assert _reloaded(store).tasks["t"]["status"] == PENDING
+
+
+def test_interrupted_run_resumes_unfinished_tasks(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.start_run("scope")
+    store.add_task("done", TASK)
+    store.add_task("open", TASK)
+    store.mark_discovered()
+    store.mark_task("done", IN_PROGRESS)
+    store.mark_task("done", SUCCESS)
+    store.checkpoint(force=True)
+
+    resumed = _reloaded(store)
+    assert resumed.run_status == RUN_ACTIVE
+    assert resumed.resumable("scope") and not resumed.resumable("other")
+    assert resumed.discovered
+    assert resumed.succeeded("done")
+    assert resumed.unfinished_tasks() == [TASK]
+
+
+def test_finished_run_carries_failed_tasks_into_the_next(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.start_run("scope")
+    store.add_task("done", TASK)
+    store.add_task("failed", TASK)
+    for key, status in (("done", SUCCESS), ("failed", FAILURE)):
+        store.mark_task(key, IN_PROGRESS)
+        store.mark_task(key, status)
+    store.finish_run()
+
+    store = _reloaded(store)
+    assert store.run_status == RUN_FINISHED
+    assert not store.resumable("scope")
+    assert store.start_run("scope", retry_unfinished=True) == 1
+    assert store.tasks["failed"]["status"] == PENDING
+    assert store.start_run("other", retry_unfinished=True) == 0
@@ -0,0 +1,42 @@
+"""Per-host AIMD limits fed by request outcomes."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from crawler.throttle import AdaptiveThrottle
+
+URL = "https://mooc2-ans.chaoxing.com/page"
+
+
+async def _request(throttle: AdaptiveThrottle, status: int, size: int = 1) -> None:
+    async with throttle.track(URL) as outcome:
+        outcome.record(status, size)
+
+
+def test_limit_starts_at_ceiling() -> None:
+    assert AdaptiveThrottle(6).limiter(URL).limit == 6
+    assert AdaptiveThrottle(6, initial=2).limiter(URL).limit == 2
+
+
+@pytest.mark.parametrize("status, size", [(429, 1), (503, 1), (200, 0)])
+def test_throttle_signal_cuts_limit(status: int, size: int) -> None:
+    throttle = AdaptiveThrottle(8)
+    asyncio.run(_request(throttle, status, size))
+
+    limiter = throttle.limiter(URL)
+    assert limiter.cuts == 1
+    assert limiter.limit < 8
+
+
+def test_healthy_responses_raise_limit_to_ceiling() -> None:
+    throttle = AdaptiveThrottle(4, initial=1)
+
+    async def run() -> None:
+        for _ in range(20):
+            await _request(throttle, 200)
+
+    asyncio.run(run())
+    assert throttle.limiter(URL).limit == 4
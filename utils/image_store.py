@@ -0,0 +1,113 @@
+import base64
+import binascii
+import hashlib
+import mimetypes
+import os
+import uuid
+from typing import Optional, Tuple
+
+# Crawler-wide stores sit beside the homework folders under HOMEWORK_ROOT;
+# their leading dots keep them out of my_lisdir.
+HOMEWORK_ROOT = "homework"
+DEFAULT_IMAGE_STORE = os.path.join(HOMEWORK_ROOT, ".images")
+DEFAULT_ATTACHMENT_STORE = os.path.join(HOMEWORK_ROOT, ".attachments")
+DEFAULT_ARCHIVE_DIR = os.path.join(HOMEWORK_ROOT, ".archive")
+
+
+class ContentStore:
+    """Content-addressed files, stored once by SHA-256 and found by reference."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def put(self, data: bytes, content_type: str = "") -> Tuple[str, bool]:
+        """Store bytes; return the content key and whether they were new."""
+        extension = mimetypes.guess_extension(content_type.split(";")[0].strip()) or ""
+        if extension == ".jpe":
+            extension = ".jpg"
+        key = hashlib.sha256(data).hexdigest() + extension
+        path = self._object_path(key)
+        if os.path.exists(path):
+            return key, False
+        self._write(path, data)
+        return key, True
+
+    def put_file(self, path: str, extension: str = "") -> Tuple[str, bool]:
+        """Move a finished file into the store; return the content key and whether it was new."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                digest.update(chunk)
+        key = digest.hexdigest() + extension
+        target = self._object_path(key)
+        if os.path.exists(target):
+            os.remove(path)
+            return key, False
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+        return key, True
+
+    def partial_path(self, reference: str) -> str:
+        """Return where an in-progress download of ``reference`` is kept between runs."""
+        digest = hashlib.sha256(reference.encode("utf-8")).hexdigest()
+        path = os.path.join(self.root, "partial", f"{digest}.part")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def link(self, reference: str, key: str) -> None:
+        """Record that ``reference`` resolves to the stored ``key``."""
+        self._write(self._ref_path(reference), key.encode("utf-8"))
+
+    def lookup(self, reference: str) -> Optional[str]:
+        """Return the stored file path of a reference, or None if it was never stored."""
+        try:
+            with open(self._ref_path(reference), "r", encoding="utf-8") as handle:
+                key = handle.read().strip()
+        except OSError:
+            return None
+        path = self._object_path(key)
+        return path if key and os.path.exists(path) else None
+
+    def read(self, reference: str) -> Optional[bytes]:
+        """Return the stored bytes of a reference, or None."""
+        path = self.lookup(reference)
+        if path is None:
+            return None
+        with open(path, "rb") as handle:
+            return handle.read()
+
+    def _object_path(self, key: str) -> str:
+        return os.path.join(self.root, "objects", key[:2], key)
+
+    def _ref_path(self, reference: str) -> str:
+        digest = hashlib.sha256(reference.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, "refs", digest[:2], digest)
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+
+
+class ImageStore(ContentStore):
+    """Answer images prefetched by the crawler, shared by every homework."""
+
+    def __init__(self, root: str = DEFAULT_IMAGE_STORE) -> None:
+        super().__init__(root)
+
+    @staticmethod
+    def decode_data_uri(reference: str) -> Optional[Tuple[bytes, str]]:
+        """Decode a base64 ``data:image/...`` URI into its bytes and content type."""
+        if not reference.startswith("data:image/"):
+            return None
+        header, _, payload = reference.partition(",")
+        if ";base64" not in header:
+            return None
+        try:
+            data = base64.b64decode(payload)
+        except (binascii.Error, ValueError):
+            return None
+        return data, header[len("data:"):].split(";")[0]
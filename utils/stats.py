@@ -0,0 +1,6 @@
+from typing import Any, Mapping
+
+
+def format_counters(counters: Mapping[str, Any]) -> str:
+    """Return counters as ``key=value`` pairs for a log line."""
+    return ", ".join(f"{key}={value}" for key, value in counters.items())
@@ -11,6 +11,8 @@ import re
 import logging
 from typing import List, Dict, Optional, Any
 
+from .image_store import ImageStore
+
 def my_lisdir(dir_path):
     dirlist = os.listdir(dir_path)
     dirlist_result = []
@@ -82,14 +84,18 @@ def download_image(url_or_base64):
             image_bytes = base64.b64decode(base64_data)
             image = Image.open(BytesIO(image_bytes))
         else:
-            # 下载图片
-            response = requests.get(url_or_base64, headers=headers, timeout=10)
-            if response.status_code == 200:
-                image_bytes = BytesIO(response.content).read()
-                image = Image.open(BytesIO(image_bytes))
+            # 优先使用爬取时已预取到本地图片库的图片，否则下载图片
+            stored_bytes = ImageStore().read(url_or_base64)
+            if stored_bytes is not None:
+                image = Image.open(BytesIO(stored_bytes))
             else:
-                logging.error(f"请求失败，状态码: {response.status_code}")
-                return None
+                response = requests.get(url_or_base64, headers=headers, timeout=10)
+                if response.status_code == 200:
+                    image_bytes = BytesIO(response.content).read()
+                    image = Image.open(BytesIO(image_bytes))
+                else:
+                    logging.error(f"请求失败，状态码: {response.status_code}")
+                    return None
 
         # 确保图片模式为 RGB（JPEG 不支持 RGBA 模式）
         if image.mode in ("RGBA", "P"):
@@ -214,12 +220,13 @@ def context_few_shot_learning_prompt(uncorrected_answers, corrected_answers, sys
     return context_prompt
 
 
-def convert_url(original_url, page_number=1):
+def convert_url(original_url, page_number=1, page_size=12):
     """
     将链接1的URL转换为链接2的格式，并支持指定翻页。
 
     :param original_url: 原始链接
     :param page_number: 页码，默认为1
+    :param page_size: 每页条数，默认为12
     :return: 转换后的链接
     """
     parsed_url = urlparse(original_url)
@@ -238,7 +245,7 @@ def convert_url(original_url, page_number=1):
         "pid": "0",
         "status": "-1",
         "pages": str(page_number),
-        "size": "12",
+        "size": str(page_size),
         "selectClassid": selectClassid,  # 使用从原URL提取的值
         "search": "",
         "v": "0",